@@ -1,11 +1,14 @@
 import logging
 
 from fastapi import APIRouter, Depends, Form, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database.connection import get_db
 from app.middleware.auth_dependency import get_current_user
-from app.services.ai_resume_service import tailor_resume
-from app.utils.constants import FEATURE_RESUME_TAILOR
+from app.services.ai_resume_service import tailor_resume, stream_tailored_resume
+from app.utils.constants import FEATURE_RESUME_TAILOR, SSE_HEADERS
+from app.utils.parse_pool import ParserError
+from app.utils.resume_parser import ResumeTooLargeError
 from app.utils.plan_usage import check_feature_access
 
 router = APIRouter()
@@ -19,6 +22,7 @@ async def tailor_resume_api(
     job_description: str = Form(...),
     skills: str = Form(...),  # Comma-separated list of skills
     user_resume: UploadFile = File(...),  # Uploaded resume file
+    bypass_cache: bool = Form(False),  # Force fresh suggestions instead of cached ones
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -27,7 +31,7 @@ async def tailor_resume_api(
         f"🔍 Checking access for user plan: user_id={current_user.id}, feature={FEATURE_RESUME_TAILOR}"
     )
     try:
-        check_feature_access(db, current_user.id, FEATURE_RESUME_TAILOR)
+        check_feature_access(db, current_user, FEATURE_RESUME_TAILOR)
     except Exception as e:
         logger.warning(
             f"⚠️ Feature access denied for user_id={current_user.id}: {str(e)}"
@@ -39,8 +43,14 @@ async def tailor_resume_api(
     )
 
     # ✅ Call AI resume tailoring service
-    tailored_response = tailor_resume(
-        db, current_user.id, job_title, job_description, skills, user_resume
+    tailored_response = await tailor_resume(
+        db,
+        current_user.id,
+        job_title,
+        job_description,
+        skills,
+        user_resume,
+        bypass_cache=bypass_cache,
     )
 
     if not tailored_response:
@@ -52,3 +62,42 @@ async def tailor_resume_api(
         f"✅ Tailored resume generated successfully for user_id={current_user.id}. Suggestions are: {tailored_response}"
     )
     return tailored_response
+
+
+@router.post("/tailor/stream")
+async def stream_tailor_resume_api(
+    job_title: str = Form(...),
+    job_description: str = Form(...),
+    skills: str = Form(...),  # Comma-separated list of skills
+    user_resume: UploadFile = File(...),  # Uploaded resume file
+    bypass_cache: bool = Form(False),  # Force fresh suggestions instead of cached ones
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """Streams tailoring suggestions as server-sent events as soon as each one is complete."""
+    logger.info(
+        f"🔍 Checking access for user plan: user_id={current_user.id}, feature={FEATURE_RESUME_TAILOR}"
+    )
+    check_feature_access(db, current_user, FEATURE_RESUME_TAILOR)
+
+    logger.info(
+        f"🧠 Streaming resume tailoring: user_id={current_user.id}, job_title='{job_title}'"
+    )
+    try:
+        events = await stream_tailored_resume(
+            current_user.id,
+            job_title,
+            job_description,
+            skills,
+            user_resume,
+            bypass_cache=bypass_cache,
+        )
+    except (ParserError, ResumeTooLargeError):
+        raise
+    except Exception as e:
+        logger.error(
+            f"❌ Failed to start tailoring stream: user_id={current_user.id}, error={str(e)}"
+        )
+        raise HTTPException(status_code=500, detail="Error generating tailored resume")
+
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
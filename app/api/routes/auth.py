@@ -23,7 +23,7 @@ async def sync_user(user_data: SyncUserRequest, db: Session = Depends(get_db)):
 
     # ✅ Sync user with the database
     try:
-        user = sync_user_service(db, user_data.access_token)
+        user = await sync_user_service(db, user_data.access_token)
         logger.info(
             f"User {user['user_id']} synced successfully with plan: {user['plan_code']}"
         )
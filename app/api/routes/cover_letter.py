@@ -1,9 +1,11 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database.connection import get_db
 from app.schemas.cover_letter import CoverLetterRequest, CoverLetterResponse
-from app.services.cover_letter_service import generate_cover_letter
+from app.services.cover_letter_service import generate_cover_letter, stream_cover_letter
+from app.utils.constants import SSE_HEADERS
 
 router = APIRouter()
 logger = logging.getLogger("app")
@@ -19,9 +21,22 @@ async def ai_generate_cover_letter(
     )
 
     try:
-        response = generate_cover_letter(db, request)
+        response = await generate_cover_letter(db, request)
         logger.info(f"Generated cover letter successfully for user: {request.user_id}")
         return response
     except Exception as e:
         logger.error(f"Error generating cover letter: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to generate cover letter")
+
+
+@router.post("/generate/stream")
+async def ai_stream_cover_letter(request: CoverLetterRequest):
+    """Streams a generated cover letter token by token as server-sent events."""
+    logger.info(
+        f"Received streaming cover letter request for: {request.job_title} at {request.company_name}"
+    )
+    return StreamingResponse(
+        stream_cover_letter(request),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,69 @@
+import logging
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.middleware.auth_dependency import require_metrics_token
+from app.utils import extraction_cache
+from app.utils.aws_utils import json_cache_stats
+from app.utils.io_executor import storage_executor
+from app.utils.llm_limiter import llm_admission
+from app.utils.llm_telemetry import llm_metrics
+from app.utils.parse_pool import parse_pool
+from app.utils.resume_prefetch import resume_prefetch
+
+# Internal stats; every endpoint needs the METRICS_TOKEN bearer token
+router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+logger = logging.getLogger("app")
+
+
+@router.get("/llm-admission")
+def get_llm_admission_stats():
+    """Reports LLM concurrency, remaining rate budgets and queue-wait time per priority lane."""
+    return llm_admission.stats()
+
+
+@router.get("/extraction-cache")
+def get_extraction_cache_stats():
+    """Hit/miss counters of the in-memory resume text extraction cache."""
+    return extraction_cache.stats()
+
+
+@router.get("/s3-json-cache")
+def get_s3_json_cache_stats():
+    """Entries of the S3 JSON artifact cache and how many reads S3 answered with 304."""
+    return json_cache_stats()
+
+
+@router.get("/parse-pool")
+def get_parse_pool_stats():
+    """Document parser processes: in-flight and queued parses, timeouts, crashes and rejections."""
+    return parse_pool.stats()
+
+
+@router.get("/storage-io")
+def get_storage_io_stats():
+    """Storage I/O threads: in-flight and queued calls, rejections, queue wait and duration per operation."""
+    return storage_executor.stats()
+
+
+@router.get("/resume-prefetch")
+def get_resume_prefetch_stats():
+    """Background pre-processing of staged resumes: in flight, skipped, failed and awaited."""
+    return resume_prefetch.stats()
+
+
+@router.get("/llm")
+def get_llm_call_metrics():
+    """Per feature/model call counts, tokens, estimated cost and latency/TTFT percentiles."""
+    return llm_metrics.snapshot()
+
+
+@router.get("/llm/prometheus", response_class=PlainTextResponse)
+def get_llm_call_metrics_prometheus():
+    """Same LLM call metrics as counters and histograms in Prometheus text format."""
+    return PlainTextResponse(
+        llm_metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
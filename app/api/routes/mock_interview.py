@@ -12,6 +12,8 @@ from app.services.mock_interview_service import (
     get_mock_interview_session_details,
     update_question_mapping_for_answer,
     process_mock_interview_worker,
+    issue_answer_upload_grant,
+    finalize_answer_upload,
 )
 from app.schemas.mock_interview import (
     MockInterviewQuestionResponse,
@@ -19,8 +21,12 @@ from app.schemas.mock_interview import (
     MockInterviewSessionDetails,
     ProcessingStartedResponse,
 )
-from app.utils.aws_utils import send_to_mock_interview_queue
+from app.schemas.upload import UploadGrantResponse
+from app.utils.aws_utils import send_to_mock_interview_queue_async
 from app.utils.constants import FEATURE_MOCK_INTERVIEW
+from app.utils.io_executor import IOBusyError
+from app.utils.parse_pool import ParserError
+from app.utils.resume_parser import ResumeTooLargeError
 from app.utils.plan_usage import check_feature_access
 
 router = APIRouter()
@@ -41,14 +47,18 @@ async def start_interview(
         logger.info(
             f"[MOCK_INTERVIEW_START] Checking access for user: {current_user.id}, job: {job_title}"
         )
-        check_feature_access(db, current_user.id, FEATURE_MOCK_INTERVIEW)
+        check_feature_access(db, current_user, FEATURE_MOCK_INTERVIEW)
 
         logger.info(
             f"[MOCK_INTERVIEW_START] Initiating mock interview for user: {current_user.id}"
         )
-        return start_mock_interview(
+        return await start_mock_interview(
             db, current_user.id, job_title, job_description, resume_temp_key
         )
+    except (ParserError, ResumeTooLargeError, IOBusyError):
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(
             f"[MOCK_INTERVIEW_START] Failed to start interview for user {current_user.id}: {e}"
@@ -88,7 +98,7 @@ async def process_interview(
                 "message": "Mock interview processed successfully.",
             }
         else:
-            send_to_mock_interview_queue(payload)
+            await send_to_mock_interview_queue_async(payload)
             logger.info(
                 f"[ROUTE] Session {session_id} queued successfully for processing"
             )
@@ -138,7 +148,7 @@ async def get_mock_interview_details(
         logger.info(
             f"[MOCK_SESSION_DETAIL] Fetching session: {session_id} for user: {current_user.id}"
         )
-        return get_mock_interview_session_details(db, session_id)
+        return await get_mock_interview_session_details(db, session_id)
     except Exception as e:
         logger.error(
             f"[MOCK_SESSION_DETAIL] Error fetching details for session {session_id}: {e}"
@@ -176,3 +186,58 @@ async def upload_answer(
             exc_info=True,
         )
         raise HTTPException(status_code=500, detail="Failed to upload answer")
+
+
+@router.post("/{session_id}/upload-answer/grant", response_model=UploadGrantResponse)
+async def grant_answer_upload(
+    session_id: str,
+    question_id: str = Form(...),
+    content_type: str = Form(...),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Issues a presigned POST for uploading an answer's audio straight to S3.
+    Upload with it, then call /upload-answer/finalize with the returned key.
+    """
+    try:
+        return issue_answer_upload_grant(
+            db, session_id, current_user.id, question_id, content_type
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        logger.error(
+            f"[ROUTE] Error issuing answer upload grant for session {session_id}: {exc}",
+            exc_info=True,
+        )
+        raise HTTPException(status_code=500, detail="Failed to issue upload grant")
+
+
+@router.post("/{session_id}/upload-answer/finalize", response_model=dict)
+async def finalize_answer(
+    session_id: str,
+    question_id: str = Form(...),
+    answer_audio_key: str = Form(...),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Validates answer audio uploaded with a grant and records its key in the
+    session's questions mapping file.
+    """
+    try:
+        logger.info(
+            f"[ROUTE] Finalizing answer upload for session {session_id}, question {question_id}, user {current_user.id}"
+        )
+        return await finalize_answer_upload(
+            db, session_id, current_user.id, question_id, answer_audio_key
+        )
+    except (HTTPException, IOBusyError):
+        raise
+    except Exception as exc:
+        logger.error(
+            f"[ROUTE] Error finalizing answer upload for session {session_id}: {exc}",
+            exc_info=True,
+        )
+        raise HTTPException(status_code=500, detail="Failed to record answer")
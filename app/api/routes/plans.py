@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Form
 from sqlalchemy.orm import Session
 from app.schemas.plan import PlanSchema, UserPlanUsageSchema
 from app.database.connection import get_db
-from app.database.plan import get_all_plans, get_user_plan, set_user_plan
+from app.database.plan import get_all_plans, set_user_plan
 from app.middleware.auth_dependency import get_current_user
 
 router = APIRouter()
@@ -28,7 +28,8 @@ def list_all_plans(db: Session = Depends(get_db)):
 def get_my_plan(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
     try:
         logger.info(f"[MY_PLAN] Fetching plan for user: {current_user.id}")
-        plan = get_user_plan(db, current_user.id)
+        # Plan is eager-loaded with the user by get_current_user
+        plan = current_user.user_plan
         if not plan:
             logger.warning(
                 f"[MY_PLAN] No active plan found for user: {current_user.id}"
@@ -4,14 +4,22 @@ from sqlalchemy.orm import Session
 from app.database.connection import get_db
 from app.middleware.auth_dependency import get_current_user
 from app.schemas.resume import ResumeResponse, TmpUploadResponse
+from app.schemas.upload import UploadGrantResponse
+from app.core.config import settings
 from app.services.resume_service import (
+    finalize_temp_resume_upload,
+    issue_temp_resume_upload_grant,
+    prefetch_temp_resume,
+    read_upload_bytes,
     handle_resume_upload,
     handle_delete_resume,
     get_resume_download_url,
     handle_resume_update,
 )
 from app.database.resume import get_resumes, get_resume
-from app.utils.aws_utils import upload_resume_to_tmp_s3
+from app.utils.aws_utils import upload_resume_to_tmp_s3_async
+from app.utils.io_executor import IOBusyError
+from app.utils.resume_prefetch import resume_prefetch
 
 router = APIRouter()
 logger = logging.getLogger("app")
@@ -27,12 +35,58 @@ async def upload_resume_temp(
     you will pass this key into your Start Interview call.
     """
     try:
-        tmp_key = upload_resume_to_tmp_s3(resume_file, current_user.id)
+        tmp_key = await upload_resume_to_tmp_s3_async(resume_file, current_user.id)
+        if settings.RESUME_PREFETCH_ENABLED and not settings.MOCK_DATA:
+            # Extract and segment while the user fills in the rest of the form
+            data = read_upload_bytes(resume_file)
+            if data is not None:
+                resume_prefetch.start(tmp_key, prefetch_temp_resume(tmp_key, data))
         return TmpUploadResponse(temp_key=tmp_key)
+    except IOBusyError:
+        raise
     except Exception as e:
         raise HTTPException(500, f"Failed to stage resume: {e}")
 
 
+@router.post("/upload-temp-resume/grant", response_model=UploadGrantResponse)
+async def grant_resume_temp_upload(
+    content_type: str = Form(...),
+    current_user=Depends(get_current_user),
+):
+    """
+    Issue a presigned POST for uploading a resume straight to S3 (tmp/).
+    Upload with it, then call /upload-temp-resume/finalize with the returned key.
+    """
+    try:
+        return issue_temp_resume_upload_grant(current_user.id, content_type)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception as e:
+        logger.error(f"[UPLOAD_GRANT] Failed for user {current_user.id}: {e}")
+        raise HTTPException(500, "Failed to issue upload grant")
+
+
+@router.post("/upload-temp-resume/finalize", response_model=TmpUploadResponse)
+async def finalize_resume_temp_upload(
+    temp_key: str = Form(...),
+    current_user=Depends(get_current_user),
+):
+    """
+    Validate a resume uploaded with a grant. Returns the staged S3 key (not the
+    grant's key); you will pass this key into your Start Interview call.
+    """
+    try:
+        tmp_key = await finalize_temp_resume_upload(current_user.id, temp_key)
+        return TmpUploadResponse(temp_key=tmp_key)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except IOBusyError:
+        raise
+    except Exception as e:
+        logger.error(f"[UPLOAD_FINALIZE] Failed for user {current_user.id}: {e}")
+        raise HTTPException(500, f"Failed to stage resume: {e}")
+
+
 @router.post("/", response_model=ResumeResponse)
 async def upload_resume(
     file: UploadFile = File(...),
@@ -45,11 +99,13 @@ async def upload_resume(
         logger.info(
             f"[RESUME_UPLOAD] Uploading resume for user: {current_user.id}, title: {title}"
         )
-        resume = handle_resume_upload(db, current_user.id, file, title)
+        resume = await handle_resume_upload(db, current_user.id, file, title)
         logger.info(
             f"[RESUME_UPLOAD] Successfully uploaded resume ID: {resume.id} for user: {current_user.id}"
         )
         return resume
+    except IOBusyError:
+        raise
     except Exception as e:
         logger.error(
             f"[RESUME_UPLOAD] Failed to upload resume for user: {current_user.id}: {str(e)}"
@@ -105,7 +161,7 @@ async def update_resume_details(
     logger.info(
         f"[RESUME_UPDATE] Updating resume ID: {resume_id} for user: {current_user.id}"
     )
-    updated_resume_record = handle_resume_update(
+    updated_resume_record = await handle_resume_update(
         db, resume_id, current_user.id, updated_resume, title, resume_data
     )
 
@@ -131,7 +187,7 @@ async def delete_resume_entry(
     logger.info(
         f"[RESUME_DELETE] Deleting resume ID: {resume_id} for user: {current_user.id}"
     )
-    resume = handle_delete_resume(db, resume_id)
+    resume = await handle_delete_resume(db, resume_id)
     if not resume:
         logger.warning(
             f"[RESUME_DELETE] Resume not found for deletion: {resume_id} for user: {current_user.id}"
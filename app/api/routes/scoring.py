@@ -1,12 +1,14 @@
 import logging
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from sqlalchemy.orm import Session
 from app.database.connection import get_db
 from app.middleware.auth_dependency import get_current_user
 from app.schemas.scoring import ResumeScoringResponse
 from app.services.scoring_service import score_resume
 from app.utils.constants import FEATURE_RESUME_EVAL
+from app.utils.parse_pool import ParserError
+from app.utils.resume_parser import ResumeTooLargeError
 from app.utils.plan_usage import check_feature_access
 
 router = APIRouter()
@@ -17,6 +19,7 @@ logger = logging.getLogger("app")
 @router.post("/", response_model=ResumeScoringResponse)
 async def ai_score_resume(
     resume_file: UploadFile = File(...),  # ✅ Accepts resume file upload
+    bypass_cache: bool = Form(False),  # Force a fresh AI evaluation
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -25,12 +28,12 @@ async def ai_score_resume(
         logger.info(
             f"[RESUME_SCORE] Checking feature access for user: {current_user.id}"
         )
-        check_feature_access(db, current_user.id, FEATURE_RESUME_EVAL)
+        check_feature_access(db, current_user, FEATURE_RESUME_EVAL)
 
         logger.info(
             f"[RESUME_SCORE] Scoring resume for user: {current_user.id}, filename: {resume_file.filename}"
         )
-        result = score_resume(resume_file)
+        result = await score_resume(resume_file, bypass_cache=bypass_cache)
 
         logger.info(
             f"[RESUME_SCORE] Successfully scored resume for user: {current_user.id}"
@@ -41,6 +44,8 @@ async def ai_score_resume(
             f"[RESUME_SCORE] Access denied for user: {current_user.id} - {e.detail}"
         )
         raise e
+    except (ParserError, ResumeTooLargeError):
+        raise
     except Exception as e:
         logger.error(
             f"[RESUME_SCORE] Unexpected error scoring resume for user: {current_user.id} - {str(e)}"
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -12,6 +13,32 @@ class Settings:
     MOCK_DATA: bool = os.getenv("MOCK_DATA", "True").lower() in ("true", "1", "yes")
     SEED_DB: bool = os.getenv("SEED_DB", "True").lower() in ("true", "1", "yes")
 
+    # Google auth: "tokeninfo" (remote validation) or "jwks" (local ID token verification)
+    GOOGLE_AUTH_MODE: str = os.getenv("GOOGLE_AUTH_MODE", "tokeninfo").lower()
+    GOOGLE_CLIENT_IDS: list = [
+        client_id.strip()
+        for client_id in os.getenv("GOOGLE_CLIENT_IDS", "").split(",")
+        if client_id.strip()
+    ]
+    GOOGLE_JWKS_URL: str = os.getenv("GOOGLE_JWKS_URL", "")
+
+    # Google token validation cache
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+    TOKEN_NEGATIVE_CACHE_TTL_SECONDS: int = int(
+        os.getenv("TOKEN_NEGATIVE_CACHE_TTL_SECONDS", "30")
+    )
+
+    # Shared outbound HTTP client (Google OAuth)
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(
+        os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "3")
+    )
+    HTTP_READ_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "5"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")
+    )
+
     # AWS Credentials (Ensure these are set in .env)
     AWS_ACCESS_KEY: str = os.getenv("AWS_ACCESS_KEY")
     AWS_SECRET_KEY: str = os.getenv("AWS_SECRET_KEY")
@@ -19,6 +46,21 @@ class Settings:
     S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "")
 
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
+    OPENAI_MODEL: str = os.getenv("OPENAI_MODEL", "gpt-4o")
+    # Alternative API endpoint, e.g. http://127.0.0.1:8001/v1 for the local stub (openai_stub.py)
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL")
+    # Smaller, faster model used as a primary for short tasks and as a latency fallback
+    OPENAI_FALLBACK_MODEL: str = os.getenv("OPENAI_FALLBACK_MODEL", "gpt-4o-mini")
+    OPENAI_TIMEOUT_SECONDS: float = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "120"))
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = float(
+        os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5")
+    )
+    # Retries are handled by app.utils.llm_resilience; keep SDK retries off by default
+    OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "0"))
+    OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20")
+    )
 
     # SMTP details
     SMTP_SERVER: str = os.getenv("SMTP_SERVER")
@@ -29,5 +71,149 @@ class Settings:
 
     SQS_MOCK_INTERVIEW_QUEUE_URL: str = os.getenv("SQS_MOCK_INTERVIEW_QUEUE_URL")
 
+    # Bearer token for the internal /metrics/* endpoints; unset disables them (404)
+    METRICS_TOKEN: str = os.getenv("METRICS_TOKEN")
+
+    # LLM admission control (per process: split provider limits across API workers + SQS worker)
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    LLM_REQUESTS_PER_MINUTE: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "400"))
+    LLM_TOKENS_PER_MINUTE: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+    LLM_ESTIMATED_COMPLETION_TOKENS: int = int(
+        os.getenv("LLM_ESTIMATED_COMPLETION_TOKENS", "1500")
+    )
+    LLM_QUEUE_WAIT_WARN_SECONDS: float = float(
+        os.getenv("LLM_QUEUE_WAIT_WARN_SECONDS", "2")
+    )
+
+    # Per-call-site overrides of llm_resilience.CallPolicy, e.g.
+    # {"resume_eval": {"deadline_seconds": 60, "max_retries": 3, "hedge": true}}
+    LLM_CALL_POLICIES: dict = json.loads(os.getenv("LLM_CALL_POLICIES", "{}"))
+
+    # Per-feature overrides of llm_routing.ModelRoute, e.g.
+    # {"mock_interview": {"primary_model": "gpt-4o", "primary_timeout_seconds": 30, "fallback_model": null}}
+    LLM_MODEL_ROUTES: dict = json.loads(os.getenv("LLM_MODEL_ROUTES", "{}"))
+
+    # Model prices in USD per 1M tokens for cost telemetry, e.g.
+    # {"gpt-4o": {"input": 2.5, "output": 10.0}}; merged over app.utils.llm_telemetry defaults
+    LLM_MODEL_PRICES: dict = json.loads(os.getenv("LLM_MODEL_PRICES", "{}"))
+
+    # LLM response cache ("memory" or "sqlite"); a TTL of 0 disables caching for a feature
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "True").lower() in (
+        "true",
+        "1",
+        "yes",
+    )
+    LLM_CACHE_BACKEND: str = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    LLM_CACHE_SQLITE_PATH: str = os.getenv("LLM_CACHE_SQLITE_PATH", "cache/llm_cache.sqlite3")
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+    LLM_CACHE_TTLS: dict = {
+        "resume_eval": int(os.getenv("LLM_CACHE_TTL_RESUME_EVAL", "86400")),
+        "resume_tailor": int(os.getenv("LLM_CACHE_TTL_RESUME_TAILOR", "21600")),
+    }
+
+    # Model calls allowed to fix a structured output that fails schema validation
+    LLM_STRUCTURED_OUTPUT_REPAIR_ATTEMPTS: int = int(
+        os.getenv("LLM_STRUCTURED_OUTPUT_REPAIR_ATTEMPTS", "1")
+    )
+
+    # Offline interview evaluation through a Batch API ("openai" or the file-based "local" stand-in)
+    INTERVIEW_EVAL_BATCH_MODE: bool = os.getenv(
+        "INTERVIEW_EVAL_BATCH_MODE", "False"
+    ).lower() in ("true", "1", "yes")
+    LLM_BATCH_BACKEND: str = os.getenv("LLM_BATCH_BACKEND", "openai").lower()
+    LLM_BATCH_STATE_DIR: str = os.getenv("LLM_BATCH_STATE_DIR", "cache/llm_batches")
+    LLM_BATCH_MAX_REQUESTS: int = int(os.getenv("LLM_BATCH_MAX_REQUESTS", "1000"))
+    LLM_BATCH_FLUSH_SECONDS: float = float(os.getenv("LLM_BATCH_FLUSH_SECONDS", "900"))
+    LLM_BATCH_POLL_SECONDS: float = float(os.getenv("LLM_BATCH_POLL_SECONDS", "60"))
+    LLM_BATCH_COMPLETION_WINDOW: str = os.getenv("LLM_BATCH_COMPLETION_WINDOW", "24h")
+    LLM_BATCH_LOCAL_DELAY_SECONDS: float = float(
+        os.getenv("LLM_BATCH_LOCAL_DELAY_SECONDS", "5")
+    )
+
+    # Local OpenAI stub (openai_stub.py). Latency specs are keyed by feature with a
+    # "default" entry, e.g. {"default": {"distribution": "lognormal", "median_seconds": 1.5, "sigma": 0.6}}
+    # ("fixed" takes "seconds", "uniform" takes "min_seconds" and "max_seconds")
+    OPENAI_STUB_PORT: int = int(os.getenv("OPENAI_STUB_PORT", "8001"))
+    OPENAI_STUB_LATENCY: dict = json.loads(
+        os.getenv(
+            "OPENAI_STUB_LATENCY",
+            '{"default": {"distribution": "lognormal", "median_seconds": 1.5, "sigma": 0.6}}',
+        )
+    )
+    OPENAI_STUB_TOKENS_PER_SECOND: float = float(
+        os.getenv("OPENAI_STUB_TOKENS_PER_SECOND", "60")
+    )
+    OPENAI_STUB_RATE_LIMIT_RATE: float = float(os.getenv("OPENAI_STUB_RATE_LIMIT_RATE", "0"))
+    OPENAI_STUB_SERVER_ERROR_RATE: float = float(
+        os.getenv("OPENAI_STUB_SERVER_ERROR_RATE", "0")
+    )
+    OPENAI_STUB_RETRY_AFTER_SECONDS: int = int(os.getenv("OPENAI_STUB_RETRY_AFTER_SECONDS", "1"))
+    # Simulated S3 upload time for answer audio when MOCK_DATA is on
+    MOCK_AUDIO_UPLOAD_DELAY_SECONDS: float = float(
+        os.getenv("MOCK_AUDIO_UPLOAD_DELAY_SECONDS", "10")
+    )
+
+    # Direct-to-S3 browser uploads (presigned POST grants)
+    UPLOAD_GRANT_EXPIRATION_SECONDS: int = int(os.getenv("UPLOAD_GRANT_EXPIRATION_SECONDS", "900"))
+    ANSWER_AUDIO_MAX_BYTES: int = int(os.getenv("ANSWER_AUDIO_MAX_BYTES", str(25 * 1024 * 1024)))
+
+    # Thread pool for blocking S3/SQS calls made from async code (see app.utils.io_executor)
+    STORAGE_IO_WORKERS: int = int(os.getenv("STORAGE_IO_WORKERS", "16"))
+    # Calls allowed to wait for a free thread before new ones are rejected
+    STORAGE_IO_MAX_QUEUE: int = int(os.getenv("STORAGE_IO_MAX_QUEUE", "256"))
+
+    # ETag-revalidated cache of JSON artifacts read from S3 (see load_json_from_s3)
+    S3_JSON_CACHE_MAX_ENTRIES: int = int(os.getenv("S3_JSON_CACHE_MAX_ENTRIES", "2000"))
+    S3_JSON_CACHE_TTL_SECONDS: int = int(os.getenv("S3_JSON_CACHE_TTL_SECONDS", "3600"))
+    S3_JSON_CACHE_MAX_OBJECT_BYTES: int = int(
+        os.getenv("S3_JSON_CACHE_MAX_OBJECT_BYTES", str(1024 * 1024))
+    )
+
+    # Process pool for CPU-bound PDF/DOCX parsing (see app.utils.parse_pool)
+    PARSE_POOL_WORKERS: int = int(
+        os.getenv("PARSE_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+    # Documents allowed to wait for a free worker before new ones are rejected
+    PARSE_POOL_MAX_QUEUE: int = int(os.getenv("PARSE_POOL_MAX_QUEUE", "32"))
+    PARSE_TIMEOUT_SECONDS: float = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+    # Workers are recycled after this many documents to cap memory growth
+    PARSE_POOL_MAX_TASKS_PER_CHILD: int = int(
+        os.getenv("PARSE_POOL_MAX_TASKS_PER_CHILD", "100")
+    )
+
+    # Resume extraction limits (see app.utils.resume_parser); larger files are rejected
+    RESUME_MAX_BYTES: int = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+    RESUME_MAX_PAGES: int = int(os.getenv("RESUME_MAX_PAGES", "50"))
+    # Roughly twice what the resume section of a prompt can hold (~4 chars per token)
+    RESUME_MAX_CHARS: int = int(os.getenv("RESUME_MAX_CHARS", "40000"))
+    # PDFs longer than this are parsed in page-range shards across parse workers
+    PDF_SHARD_PAGES: int = int(os.getenv("PDF_SHARD_PAGES", "20"))
+
+    # Background extraction/segmentation of staged resumes (see app.utils.resume_prefetch)
+    RESUME_PREFETCH_ENABLED: bool = os.getenv(
+        "RESUME_PREFETCH_ENABLED", "True"
+    ).lower() in ("true", "1", "yes")
+    RESUME_PREFETCH_MAX_IN_FLIGHT: int = int(os.getenv("RESUME_PREFETCH_MAX_IN_FLIGHT", "64"))
+    # How long starting an interview waits for a staged resume still being processed
+    RESUME_PREFETCH_WAIT_SECONDS: float = float(
+        os.getenv("RESUME_PREFETCH_WAIT_SECONDS", "30")
+    )
+
+    # Resume text extraction cache (see app.utils.extraction_cache)
+    EXTRACTION_CACHE_MAX_ENTRIES: int = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "1000"))
+    EXTRACTION_CACHE_TTL_SECONDS: int = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", "86400"))
+    EXTRACTION_SIDECAR_ENABLED: bool = os.getenv(
+        "EXTRACTION_SIDECAR_ENABLED", "True"
+    ).lower() in ("true", "1", "yes")
+
+    # Prompt token budgets (see app.utils.prompt_builder)
+    PROMPT_MAX_INPUT_TOKENS: int = int(os.getenv("PROMPT_MAX_INPUT_TOKENS", "12000"))
+    PROMPT_SECTION_BUDGETS: dict = {
+        "resume_text": int(os.getenv("PROMPT_BUDGET_RESUME_TOKENS", "5000")),
+        "job_description": int(os.getenv("PROMPT_BUDGET_JOB_DESCRIPTION_TOKENS", "2500")),
+        "skills": int(os.getenv("PROMPT_BUDGET_SKILLS_TOKENS", "400")),
+        "interview_log": int(os.getenv("PROMPT_BUDGET_INTERVIEW_LOG_TOKENS", "10000")),
+    }
+
 
 settings = Settings()
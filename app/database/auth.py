@@ -1,29 +1,50 @@
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.models.auth import User, Role
+from app.models.plan import UserPlanUsage
 import uuid
 
 logger = logging.getLogger("app")
 
 
-def get_user_by_email(db: Session, email: str, update_last_login: bool = False):
-    """Fetch a user by email"""
-    """Fetch a user by email, optionally updating last_login_at"""
+def get_user_by_email(
+    db: Session, email: str, update_last_login: bool = False, with_plan: bool = False
+):
+    """Fetch a user by email, optionally updating last_login_at.
+
+    With `with_plan=True` the user's plan usage and plan are eager-loaded in the
+    same query, so entitlement checks don't need further round-trips.
+    """
     logger.info(
-        f"[GET_USER_BY_EMAIL] Fetching user for email: {email} | update_last_login={update_last_login}"
+        f"[GET_USER_BY_EMAIL] Fetching user for email: {email} | update_last_login={update_last_login} | with_plan={with_plan}"
     )
     try:
-        user = db.query(User).filter(User.email == email).first()
-        if user:
-            logger.info(f"[GET_USER_BY_EMAIL] User found: {user.id}")
-            if update_last_login:
+        if update_last_login:
+            # Update before loading so the commit doesn't expire the loaded user
+            updated = (
+                db.query(User)
+                .filter(User.email == email)
+                .update(
+                    {User.last_login_at: datetime.now(timezone.utc)},
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            if updated:
                 logger.info(
-                    f"[GET_USER_BY_EMAIL] Updating last_login_at for user: {user.id}"
+                    f"[GET_USER_BY_EMAIL] Updated last_login_at for email: {email}"
                 )
-                user.last_login_at = datetime.now(timezone.utc)
-                db.commit()
+
+        query = db.query(User).filter(User.email == email)
+        if with_plan:
+            query = query.options(
+                joinedload(User.user_plan).joinedload(UserPlanUsage.plan)
+            )
+        user = query.first()
+        if user:
+            logger.info(f"[GET_USER_BY_EMAIL] User found: {user.id}")
         else:
             logger.warning(f"[GET_USER_BY_EMAIL] No user found for email: {email}")
         return user
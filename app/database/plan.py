@@ -1,6 +1,6 @@
 import logging
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from app.models.plan import Plan, UserPlanUsage
 from sqlalchemy.exc import NoResultFound
 from datetime import datetime, timedelta, timezone
@@ -25,7 +25,7 @@ def get_user_plan(db: Session, user_id: int) -> UserPlanUsage:
         plan = (
             db.query(UserPlanUsage)
             .filter(UserPlanUsage.user_id == user_id)
-            .join(UserPlanUsage.plan)
+            .options(joinedload(UserPlanUsage.plan))
             .first()
         )
         if not plan:
@@ -36,11 +36,15 @@ def get_user_plan(db: Session, user_id: int) -> UserPlanUsage:
         raise
 
 
-def increment_feature_usage(db: Session, user_id: int, feature_key: str) -> bool:
+def increment_feature_usage(
+    db: Session, user_id: int, feature_key: str, user_plan: UserPlanUsage = None
+) -> bool:
+    """Increments feature usage; pass a pre-loaded `user_plan` to skip the plan lookup."""
     logger.info(
         f"[PLAN_USAGE] Checking usage for feature '{feature_key}' for user: {user_id}"
     )
-    user_plan = get_user_plan(db, user_id)
+    if user_plan is None:
+        user_plan = get_user_plan(db, user_id)
     if not user_plan:
         logger.warning(f"[PLAN_USAGE] No active plan found for user: {user_id}")
         return False
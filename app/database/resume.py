@@ -11,7 +11,13 @@ from app.models.resume import Resume
 logger = logging.getLogger("app")
 
 
-def create_resume(db: Session, user_id: str, title: str, s3_url: str):
+def create_resume(
+    db: Session,
+    user_id: str,
+    title: str,
+    s3_url: str,
+    resume_metadata: Optional[dict] = None,
+):
     """Stores the resume metadata in the database."""
     resume_id = str(uuid.uuid4())
     logger.info(
@@ -22,6 +28,7 @@ def create_resume(db: Session, user_id: str, title: str, s3_url: str):
         user_id=user_id,
         title=title,
         s3_url=s3_url,
+        resume_metadata=resume_metadata or {},
     )
     try:
         db.add(new_resume)
@@ -86,6 +93,23 @@ def update_resume_file(db: Session, resume: Resume, new_s3_url: str):
         raise
 
 
+def update_resume_metadata(db: Session, resume: Resume, resume_metadata: dict):
+    """Merges `resume_metadata` (e.g. parsed sections) into the resume's JSONB metadata."""
+    logger.info(f"[RESUME] Updating parsed metadata for resume ID: {resume.id}")
+    try:
+        updated_metadata = dict(resume.resume_metadata or {})
+        updated_metadata.update(resume_metadata)
+        resume.resume_metadata = updated_metadata
+        flag_modified(resume, "resume_metadata")
+        db.commit()
+        logger.info(f"[RESUME] Parsed metadata updated for resume ID: {resume.id}")
+    except Exception as e:
+        logger.error(
+            f"[RESUME] Failed to update parsed metadata for resume ID: {resume.id}. Error: {str(e)}"
+        )
+        raise
+
+
 def update_resume_data(
     db: Session,
     resume: Resume,
@@ -1,10 +1,13 @@
 # /resume-builder-app
 import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 
 
 ## main.py - FastAPI Entry Point
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from app.api.routes import (
     auth,
     resume,
@@ -14,21 +17,79 @@ from app.api.routes import (
     scoring,
     mock_interview,
     plans,
+    metrics,
 )
 from app.database.connection import SessionLocal
 from app.database.seeder import initialize_db
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.utils.http_client import init_http_client, close_http_client
+from app.utils.openai_client import init_openai_client, close_openai_client
+from app.utils.io_executor import IOBusyError, storage_executor
+from app.utils.parse_pool import (
+    ParserBusyError,
+    ParserCrashError,
+    ParserTimeoutError,
+    parse_pool,
+)
+from app.utils.resume_parser import ResumeTooLargeError
+from app.utils.resume_prefetch import resume_prefetch
 
 setup_logging()  # Configure logging
 
 # Get a logger for the app
 logger = logging.getLogger("app")
 
-app = FastAPI(title="AI Resume Builder API", version="1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Creates shared clients on startup and closes them on shutdown."""
+    await init_http_client()
+    await init_openai_client()
+    await parse_pool.start()
+    yield
+    resume_prefetch.cancel_all()
+    parse_pool.shutdown()
+    storage_executor.shutdown()
+    await close_openai_client()
+    await close_http_client()
+
+
+app = FastAPI(title="AI Resume Builder API", version="1.0", lifespan=lifespan)
 logger.info(f"✅ Final ALLOW_ORIGINS: {settings.ALLOW_ORIGINS}")
 logger.info(f"✅ Final MOCK Data: {settings.MOCK_DATA}")
+
+
+@app.exception_handler(ParserBusyError)
+async def parser_busy_handler(request: Request, exc: ParserBusyError):
+    # Shed load instead of queueing uploads without bound
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "5"}
+    )
+
+
+@app.exception_handler(ParserTimeoutError)
+@app.exception_handler(ParserCrashError)
+async def parser_failed_handler(request: Request, exc: Exception):
+    # The document hung or crashed the parser: bad input, not a server fault
+    return JSONResponse(
+        status_code=422, content={"detail": f"Could not read this document: {str(exc)}"}
+    )
+
+
+@app.exception_handler(IOBusyError)
+async def io_busy_handler(request: Request, exc: IOBusyError):
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(ResumeTooLargeError)
+async def resume_too_large_handler(request: Request, exc: ResumeTooLargeError):
+    return JSONResponse(status_code=413, content={"detail": str(exc)})
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -51,6 +112,7 @@ app.include_router(
     mock_interview.router, prefix="/mock-interview", tags=["Mock Interviews"]
 )
 app.include_router(plans.router, prefix="/plans", tags=["Plans"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 
 # ✅ Run database seeder at startup only if SEED_DB is True
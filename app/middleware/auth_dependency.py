@@ -1,19 +1,126 @@
+import hashlib
+import hmac
 import logging
+import time
 from datetime import datetime, timezone, timedelta
 
 from fastapi import Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-import requests
+import httpx
 
+from app.core.config import settings
 from app.database.auth import get_user_by_email
 from app.database.connection import get_db
-from app.utils.constants import GOOGLE_TOKEN_INFO_URL
+from app.utils.cache import TTLCache
+from app.utils.constants import GOOGLE_TOKEN_INFO_URL, GOOGLE_AUTH_MODE_JWKS
+from app.utils.google_jwks import google_jwks_verifier
+from app.utils.http_client import get_http_client
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger("app")
 
+# Validated Google token info, keyed by SHA-256 of the access token
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    default_ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+# Tokens Google recently rejected, so retries of a bad token don't reach Google
+invalid_token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    default_ttl=settings.TOKEN_NEGATIVE_CACHE_TTL_SECONDS,
+)
+# Concurrent validations of the same token share one Google call
+token_validation_flight = SingleFlight("auth")
+
+
+def hash_token(access_token: str) -> str:
+    return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+
+def get_token_ttl(token_info: dict) -> float:
+    """Seconds until the token expires, based on Google's `exp` / `expires_in` fields."""
+    ttl = settings.TOKEN_CACHE_TTL_SECONDS
+    try:
+        if token_info.get("exp"):
+            ttl = min(ttl, int(token_info["exp"]) - time.time())
+        if token_info.get("expires_in"):
+            ttl = min(ttl, int(token_info["expires_in"]))
+    except (TypeError, ValueError):
+        logger.warning("[AUTH] Could not read token expiry; using default cache TTL")
+    return ttl
+
+
+async def validate_google_token(access_token: str) -> dict:
+    """Validates the access token with Google, reusing cached results until the token expires."""
+    token_key = hash_token(access_token)
+    google_user_data = token_cache.get(token_key)
+    if google_user_data:
+        logger.info("[AUTH] Token validation cache hit")
+        return google_user_data
+
+    if invalid_token_cache.get(token_key):
+        logger.warning("[AUTH] Token recently failed validation; rejecting from cache")
+        raise HTTPException(status_code=403, detail="Invalid token")
+
+    return await token_validation_flight.do(
+        token_key, lambda: fetch_google_token_info(access_token, token_key)
+    )
+
+
+async def fetch_google_token_info(access_token: str, token_key: str) -> dict:
+    """Calls Google's tokeninfo endpoint and records the outcome in the token caches."""
+    logger.info("[AUTH] Validating access token with Google...")
+    try:
+        google_response = await get_http_client().get(
+            GOOGLE_TOKEN_INFO_URL, params={"access_token": access_token}
+        )
+    except httpx.HTTPError as e:
+        logger.error(f"[AUTH] Error contacting Google token endpoint: {str(e)}")
+        raise HTTPException(status_code=502, detail="Failed to contact Google OAuth")
+
+    if google_response.status_code != 200:
+        logger.warning("[AUTH] Google token validation failed")
+        if 400 <= google_response.status_code < 500:
+            # Only cache definite rejections, not Google-side errors
+            invalid_token_cache.set(token_key, True)
+        raise HTTPException(status_code=403, detail="Invalid token")
+
+    google_user_data = google_response.json()
+    token_cache.set(token_key, google_user_data, ttl=get_token_ttl(google_user_data))
+    return google_user_data
+
+
+def load_authenticated_user(db: Session, user_email: str):
+    """Loads the user (with plan) and checks the login is recent. Blocking; run in the threadpool."""
+    user = get_user_by_email(db, user_email, with_plan=True)
+    if not user:
+        logger.warning(f"[AUTH] No user found with email: {user_email}")
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # ✅ Check if login is older than 24 hours
+    if user.last_login_at:
+        time_diff = datetime.now(timezone.utc) - user.last_login_at
+        if time_diff > timedelta(hours=24):
+            logger.warning(f"[AUTH] Session expired for user: {user.id}")
+            raise HTTPException(
+                status_code=401, detail="Session expired. Please log in again."
+            )
+        else:
+            logger.info(f"[AUTH] User {user.id} session is still valid")
+    return user
+
+
+async def get_current_user(request: Request, db: Session = Depends(get_db)):
+    """Validates the access token from NextAuth and retrieves the authenticated user.
+
+    The user is loaded together with its plan in one query and kept on
+    `request.state.current_user` for the rest of the request.
+    """
+    cached_user = getattr(request.state, "current_user", None)
+    if cached_user is not None:
+        return cached_user
 
-def get_current_user(request: Request, db: Session = Depends(get_db)):
-    """Validates the access token from NextAuth and retrieves the authenticated user."""
     auth_token = request.headers.get("authorization")
 
     if not auth_token or not auth_token.startswith("Bearer "):
@@ -25,39 +132,32 @@ def get_current_user(request: Request, db: Session = Depends(get_db)):
     access_token = auth_token.split("Bearer ")[1]
 
     try:
-        logger.info("[AUTH] Validating access token with Google...")
-        google_response = requests.get(
-            GOOGLE_TOKEN_INFO_URL, params={"access_token": access_token}
-        )
-
-        if google_response.status_code != 200:
-            logger.warning("[AUTH] Google token validation failed")
-            raise HTTPException(status_code=403, detail="Invalid token")
-
-        google_user_data = google_response.json()
+        if settings.GOOGLE_AUTH_MODE == GOOGLE_AUTH_MODE_JWKS:
+            # Bearer token is a Google ID token; verify it locally
+            google_user_data = await google_jwks_verifier.verify(access_token)
+        else:
+            google_user_data = await validate_google_token(access_token)
         user_email = google_user_data.get("email")
         logger.info(f"[AUTH] Google token valid. Email: {user_email}")
 
-        # ✅ Fetch user from PostgreSQL using email
-        user = get_user_by_email(db, user_email)
-        if not user:
-            logger.warning(f"[AUTH] No user found with email: {user_email}")
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # ✅ Check if login is older than 24 hours
-        if user.last_login_at:
-            time_diff = datetime.now(timezone.utc) - user.last_login_at
-            if time_diff > timedelta(hours=24):
-                logger.warning(f"[AUTH] Session expired for user: {user.id}")
-                raise HTTPException(
-                    status_code=401, detail="Session expired. Please log in again."
-                )
-            else:
-                logger.info(f"[AUTH] User {user.id} session is still valid")
+        # ✅ Fetch user from PostgreSQL using email (sync session: keep it off the event loop)
+        user = await run_in_threadpool(load_authenticated_user, db, user_email)
 
         logger.info(f"[AUTH] Authenticated user: {user.id}")
+        request.state.current_user = user
         return user
 
     except Exception as e:
         logger.error(f"[AUTH] Failed to get current user: {str(e)}", exc_info=True)
         raise HTTPException(status_code=401, detail="Token validation failed")
+
+
+async def require_metrics_token(request: Request):
+    """Guards the internal /metrics endpoints with the METRICS_TOKEN bearer token."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    auth_token = request.headers.get("authorization", "")
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not hmac.compare_digest(auth_token.encode("utf-8"), expected.encode("utf-8")):
+        logger.warning("[AUTH] Rejected metrics request without a valid token")
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
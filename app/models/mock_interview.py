@@ -20,4 +20,4 @@ class MockInterviewSession(Base):
     )
     status = Column(
         String, default="in_progress"
-    )  # "in_progress", "completed", "failed"
+    )  # "in_progress", "evaluating" (batch mode), "completed", "failed"
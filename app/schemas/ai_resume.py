@@ -0,0 +1,80 @@
+from pydantic import BaseModel
+from typing import List, Literal
+
+HighlightColor = Literal["green", "yellow", "blue"]
+
+
+class SuggestedEdit(BaseModel):
+    current_text: str
+    suggested_text: str
+    highlight_color: HighlightColor
+
+
+class MatchedPoint(BaseModel):
+    text: str
+    justification: str
+    highlight_color: HighlightColor
+
+
+class MissingPoint(BaseModel):
+    expected_topic: str
+    suggestion: str
+    highlight_color: HighlightColor
+
+
+class ExperienceSuggestion(BaseModel):
+    position: str
+    company: str
+    matched_points: List[MatchedPoint]
+    modified_points: List[SuggestedEdit]
+    missing_points: List[MissingPoint]
+
+
+class SkillMapping(BaseModel):
+    skill: str
+    currently_in_resume: bool
+    recommended_section: str
+    action: str
+
+
+class SkillsSummary(BaseModel):
+    used_well: List[str]
+    underutilized: List[str]
+    missing_keywords: List[str]
+    suggested_action: str
+
+
+class JDAlignmentSummary(BaseModel):
+    total_jd_points: int
+    matched: int
+    partially_matched: int
+    missing: int
+    match_score_percent: float
+
+
+class NewSection(BaseModel):
+    title: str
+    content: str
+    highlight_color: HighlightColor
+
+
+class SectionScores(BaseModel):
+    summary: float
+    experience: float
+    skills: float
+    projects: float
+    education: float
+
+
+class TailoringSuggestions(BaseModel):
+    """Structured output of the JD tailoring prompt."""
+
+    summary: SuggestedEdit
+    experience: List[ExperienceSuggestion]
+    user_skills_mapping: List[SkillMapping]
+    skills: SkillsSummary
+    jd_alignment_summary: JDAlignmentSummary
+    new_sections: List[NewSection]
+    recommendations: List[str]
+    final_notes: List[str]
+    section_scores: SectionScores
@@ -62,4 +62,41 @@ class MockInterviewSessionSummary(BaseModel):
     session_id: str
     job_title: str
     created_at: str
-    status: str  # "in_progress" or "completed"
+    status: str  # "in_progress", "evaluating", "completed" or "failed"
+
+
+class InterviewQuestionsOutput(BaseModel):
+    """Structured output of the interview question prompt."""
+
+    questions: List[str]
+
+
+class QuestionEvaluationOutput(BaseModel):
+    question_id: str
+    score: float
+    feedback: str
+    follow_up_question: str
+
+
+class SkillAssessmentOutput(BaseModel):
+    technical: float
+    problem_solving: float
+    communication: float
+    leadership: float
+    adaptability: float
+    behavioral_fit: float
+    confidence: float
+
+
+class FinalAssessmentOutput(BaseModel):
+    overall_score: float
+    key_strengths: List[str]
+    areas_for_growth: List[str]
+    skill_assessment: SkillAssessmentOutput
+
+
+class InterviewEvaluationOutput(BaseModel):
+    """Structured output of the interview evaluation prompt."""
+
+    question_evaluations: List[QuestionEvaluationOutput]
+    final_assessment: FinalAssessmentOutput
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Dict
+
+
+class UploadGrantResponse(BaseModel):
+    """Presigned POST for uploading one file directly to storage.
+
+    The browser POSTs `fields` plus the file (as the last form field) to `url`,
+    then calls the matching finalize endpoint with `key`.
+    """
+
+    key: str
+    url: str
+    fields: Dict[str, str]
+    max_bytes: int
+    expires_in: int
@@ -1,24 +1,30 @@
-import json
 import logging
+from typing import AsyncIterator
 
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.utils.ai_assistant import analyze_resume_with_ai
+from app.schemas.ai_resume import TailoringSuggestions
+from app.utils.ai_assistant import analyze_resume_with_ai, stream_resume_analysis
+from app.utils.constants import FEATURE_RESUME_TAILOR
+from app.utils.json_stream import JSONSectionStreamer, format_sse, iter_text_chunks
 from app.utils.mock_data import MOCK_TAILOR_RESPONSE
+from app.utils.resume_parser import extract_resume_async
+from app.utils.structured_output import StructuredOutputError, repair_structured_output
 from app.utils.utils import parse_ai_response
 
 logger = logging.getLogger("app")
 
 
-def tailor_resume(
+async def tailor_resume(
     db: Session,
     user_id: str,
     job_title: str,
     job_description: str,
     skills: str,
     user_resume: UploadFile,
+    bypass_cache: bool = False,
 ):
     """Sends the uploaded resume file as an attachment to AI for analysis and improvement recommendations."""
     logger.info(
@@ -27,28 +33,20 @@ def tailor_resume(
 
     if settings.MOCK_DATA:
         logger.info("[TAILOR_RESUME] Using MOCK data for resume tailoring.")
-        ai_response = MOCK_TAILOR_RESPONSE
+        review_suggestions = parse_ai_response(MOCK_TAILOR_RESPONSE)
     else:
         logger.info("[TAILOR_RESUME] Calling AI assistant to analyze resume...")
-        ai_response = analyze_resume_with_ai(
-            job_title, job_description, skills, user_resume
-        )
-
-    try:
-        review_suggestions = parse_ai_response(ai_response)
-        logger.info("[TAILOR_RESUME] AI response parsed successfully.")
-    except json.JSONDecodeError as e:
-        logger.error(
-            f"[TAILOR_RESUME] JSON decode error while parsing AI response: {str(e)}",
-            exc_info=True,
-        )
-        review_suggestions = {}
-    except Exception as e:
-        logger.error(
-            f"[TAILOR_RESUME] Unexpected error in tailoring: {str(e)}",
-            exc_info=True,
-        )
-        review_suggestions = {}
+        try:
+            review_suggestions = await analyze_resume_with_ai(
+                job_title, job_description, skills, user_resume, bypass_cache=bypass_cache
+            )
+            logger.info("[TAILOR_RESUME] AI response validated successfully.")
+        except StructuredOutputError as e:
+            logger.error(
+                f"[TAILOR_RESUME] AI response failed validation: {str(e)}",
+                exc_info=True,
+            )
+            review_suggestions = {}
 
     # try:
     #     logger.info("[TAILOR_RESUME] Uploading tailored resume to S3")
@@ -63,3 +61,54 @@ def tailor_resume(
 
     logger.info(f"[TAILOR_RESUME] Tailoring complete for user: {user_id}")
     return {"review_suggestions": review_suggestions}
+
+
+async def stream_tailored_resume(
+    user_id: str,
+    job_title: str,
+    job_description: str,
+    skills: str,
+    user_resume: UploadFile,
+    bypass_cache: bool = False,
+) -> AsyncIterator[str]:
+    """Extracts the resume up front and returns an SSE stream of tailoring suggestions.
+
+    Each completed suggestion section is sent as a `suggestion` event while the
+    model is still generating; a final `done` event carries the full result.
+    """
+    logger.info(
+        f"[TAILOR_RESUME_STREAM] Start streaming suggestions for user: {user_id}, job: {job_title}"
+    )
+    if settings.MOCK_DATA:
+        logger.info("[TAILOR_RESUME_STREAM] Using MOCK data for resume tailoring.")
+        source = iter_text_chunks(MOCK_TAILOR_RESPONSE)
+    else:
+        # Read the upload now; it is closed once the streaming response starts
+        resume_content = (await extract_resume_async(user_resume)).text
+        source = stream_resume_analysis(
+            job_title, job_description, skills, resume_content, bypass_cache=bypass_cache
+        )
+    return _tailoring_events(user_id, source)
+
+
+async def _tailoring_events(user_id: str, source: AsyncIterator[str]):
+    streamer = JSONSectionStreamer()
+    try:
+        async for chunk in source:
+            for section, data in streamer.feed(chunk):
+                yield format_sse({"section": section, "data": data}, event="suggestion")
+
+        # Validate (and repair once if needed) before sending the final result
+        review_suggestions = (
+            await repair_structured_output(
+                streamer.text, TailoringSuggestions, feature=FEATURE_RESUME_TAILOR
+            )
+        ).model_dump()
+        logger.info(f"[TAILOR_RESUME_STREAM] Streaming complete for user: {user_id}")
+        yield format_sse({"review_suggestions": review_suggestions}, event="done")
+    except Exception as e:
+        logger.error(
+            f"[TAILOR_RESUME_STREAM] Streaming failed for user: {user_id}: {str(e)}",
+            exc_info=True,
+        )
+        yield format_sse({"detail": "Error generating tailored resume"}, event="error")
@@ -1,22 +1,24 @@
 import logging
 
-import requests
+import httpx
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database.auth import get_user_by_email, create_user
 from app.database.plan import set_free_plan
 from app.utils.constants import GOOGLE_USER_INFO_URL
+from app.utils.http_client import get_http_client
 
 logger = logging.getLogger("app")
 
 
-def sync_user_service(db: Session, access_token: str):
+async def sync_user_service(db: Session, access_token: str):
     """Fetches user from Google and syncs with PostgreSQL."""
     logger.info("[AUTH] Starting user sync from Google.")
 
     try:
         # ✅ Step 1: Get user info from Google
-        user_info = fetch_google_user(access_token)
+        user_info = await fetch_google_user(access_token)
         email = user_info.get("email")
 
         if not email:
@@ -27,22 +29,8 @@ def sync_user_service(db: Session, access_token: str):
 
         logger.info(f"[AUTH] Fetched Google user profile for email: {email}")
 
-        # ✅ Step 2: Sync user in DB
-        user = get_user_by_email(db, email, update_last_login=True)
-        if user:
-            logger.info(f"[AUTH] Existing user found: {user.id}. Last login updated.")
-        else:
-            logger.info(f"[AUTH] No user found. Creating new user for email: {email}")
-            user = create_user(db, user_info["name"], email, user_info.get("picture"))
-            logger.info(f"[AUTH] New user created: {user.id}. Assigning free plan.")
-            set_free_plan(db, user.id)
-            logger.info(f"[AUTH] Free plan assigned to user: {user.id}")
-
-        return {
-            "user_id": user.id,
-            "plan_code": user.user_plan.plan.code,
-            "is_premium": user.has_premium_access(),
-        }
+        # ✅ Step 2: Sync user in DB (sync session: keep it off the event loop)
+        return await run_in_threadpool(sync_user_in_db, db, user_info)
 
     except HTTPException as e:
         logger.error(f"[AUTH] HTTP error while syncing user: {e.detail}")
@@ -52,12 +40,32 @@ def sync_user_service(db: Session, access_token: str):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-def fetch_google_user(access_token: str):
+def sync_user_in_db(db: Session, user_info: dict) -> dict:
+    """Updates or creates the user for a Google profile. Blocking; run in the threadpool."""
+    email = user_info["email"]
+    user = get_user_by_email(db, email, update_last_login=True, with_plan=True)
+    if user:
+        logger.info(f"[AUTH] Existing user found: {user.id}. Last login updated.")
+    else:
+        logger.info(f"[AUTH] No user found. Creating new user for email: {email}")
+        user = create_user(db, user_info["name"], email, user_info.get("picture"))
+        logger.info(f"[AUTH] New user created: {user.id}. Assigning free plan.")
+        set_free_plan(db, user.id)
+        logger.info(f"[AUTH] Free plan assigned to user: {user.id}")
+
+    return {
+        "user_id": user.id,
+        "plan_code": user.user_plan.plan.code,
+        "is_premium": user.has_premium_access(),
+    }
+
+
+async def fetch_google_user(access_token: str):
     """Fetch user details from Google using access token."""
     logger.info("[AUTH] Validating Google access token.")
 
     try:
-        response = requests.get(
+        response = await get_http_client().get(
             GOOGLE_USER_INFO_URL, params={"access_token": access_token}
         )
 
@@ -68,7 +76,7 @@ def fetch_google_user(access_token: str):
         logger.info("[AUTH] Google access token validated successfully.")
         return response.json()
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.exception(
             f"[AUTH] Error while contacting Google OAuth endpoint: {str(e)}"
         )
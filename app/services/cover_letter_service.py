@@ -1,29 +1,56 @@
 import logging
+from typing import AsyncIterator
 
-from app.utils.openai_client import call_openai
+from app.core.config import settings
+from app.utils.json_stream import format_sse
+from app.utils.openai_client import call_openai_async, stream_openai
 from sqlalchemy.orm import Session
 from app.schemas.cover_letter import CoverLetterRequest, CoverLetterResponse
-from app.utils.prompts import COVER_LETTER_PROMPT
+from app.utils.constants import FEATURE_COVER_LETTER
+from app.utils.prompt_builder import ChatPrompt, PromptSection, build_prompt
+from app.utils.prompts import COVER_LETTER_SYSTEM_PROMPT, COVER_LETTER_USER_PROMPT
 
 logger = logging.getLogger("app")
 
 
-def generate_cover_letter(db: Session, request: CoverLetterRequest):
+def build_cover_letter_prompt(request: CoverLetterRequest) -> ChatPrompt:
+    budgets = settings.PROMPT_SECTION_BUDGETS
+    return build_prompt(
+        COVER_LETTER_SYSTEM_PROMPT,
+        COVER_LETTER_USER_PROMPT,
+        feature=FEATURE_COVER_LETTER,
+        sections=[
+            PromptSection(
+                "user_resume",
+                request.user_resume or "No resume provided.",
+                budgets["resume_text"],
+            ),
+            PromptSection(
+                "job_description",
+                request.job_description or "No detailed JD provided.",
+                budgets["job_description"],
+                priority=1,
+                min_tokens=500,
+            ),
+        ],
+        job_title=request.job_title,
+        company_name=request.company_name,
+    )
+
+
+async def generate_cover_letter(db: Session, request: CoverLetterRequest):
     """Generates an AI-powered cover letter."""
     logger.info(
         f"[COVER_LETTER] Generating cover letter for job: {request.job_title} at company: {request.company_name}"
     )
 
     try:
-        prompt = COVER_LETTER_PROMPT.format(
-            job_title=request.job_title,
-            company_name=request.company_name,
-            job_description=request.job_description or "No detailed JD provided.",
-            user_resume=request.user_resume or "No resume provided.",
-        )
+        prompt = build_cover_letter_prompt(request)
 
         logger.info("[COVER_LETTER] Calling OpenAI API with generated prompt.")
-        generated_cover_letter = call_openai({"prompt": prompt})
+        generated_cover_letter = await call_openai_async(
+            prompt, feature=FEATURE_COVER_LETTER
+        )
         logger.info("[COVER_LETTER] Successfully generated cover letter.")
 
         return CoverLetterResponse(generated_cover_letter=generated_cover_letter)
@@ -31,3 +58,23 @@ def generate_cover_letter(db: Session, request: CoverLetterRequest):
     except Exception as e:
         logger.exception(f"[COVER_LETTER] Failed to generate cover letter: {str(e)}")
         raise
+
+
+async def stream_cover_letter(request: CoverLetterRequest) -> AsyncIterator[str]:
+    """Streams the cover letter as SSE `token` events, ending with a `done` event."""
+    logger.info(
+        f"[COVER_LETTER_STREAM] Streaming cover letter for job: {request.job_title} at company: {request.company_name}"
+    )
+    chunks = []
+    try:
+        async for delta in stream_openai(
+            build_cover_letter_prompt(request), feature=FEATURE_COVER_LETTER
+        ):
+            chunks.append(delta)
+            yield format_sse({"token": delta}, event="token")
+
+        logger.info("[COVER_LETTER_STREAM] Finished streaming cover letter.")
+        yield format_sse({"generated_cover_letter": "".join(chunks)}, event="done")
+    except Exception as e:
+        logger.exception(f"[COVER_LETTER_STREAM] Failed to stream cover letter: {str(e)}")
+        yield format_sse({"detail": "Failed to generate cover letter"}, event="error")
@@ -1,4 +1,3 @@
-import time
 import uuid
 
 from sqlalchemy.orm import Session
@@ -6,13 +5,18 @@ from fastapi import UploadFile, HTTPException
 import logging
 
 from app.core.config import settings
+from app.schemas.mock_interview import InterviewEvaluationOutput, InterviewQuestionsOutput
 from app.utils.constants import (
+    ANSWER_AUDIO_CONTENT_TYPES,
+    FEATURE_INTERVIEW_EVAL,
+    FEATURE_MOCK_INTERVIEW,
     MAX_QUESTIONS_PER_SESSION,
     INTRO_QUESTION,
     MOCK_INTERVIEW_PREV_Q_FILE,
     MOCK_INTERVIEW_PREV_JD_FILE,
     MOCK_INTERVIEW_AI_FEEDBACK_FILE,
     MOCK_INTERVIEW_LOG_FILE,
+    MOCK_INTERVIEW_PENDING_LOG_FILE,
 )
 from app.utils.mock_data import (
     MOCK_INTERVIEW_QUESTIONS_RESPONSE,
@@ -26,20 +30,33 @@ from app.utils.mock_data import (
 from app.utils.mock_interview_utils import (
     format_skipped_question,
     get_openai_interview_evaluation,
+    parse_batch_custom_id,
     process_ai_response,
+    queue_interview_evaluation,
     send_interview_result_email,
 )
-from app.utils.openai_client import call_openai
-from app.utils.prompts import INTERVIEW_QUESTION_PROMPT
+from app.utils.extraction_cache import move_sidecar
+from app.utils.llm_batch import BatchResult
+from app.utils.llm_limiter import PRIORITY_BACKGROUND
+from app.utils.prompt_builder import PromptSection, build_prompt
+from app.utils.prompts import (
+    INTERVIEW_QUESTION_SYSTEM_PROMPT,
+    INTERVIEW_QUESTION_USER_PROMPT,
+)
 from app.utils.aws_utils import (
-    upload_resume_to_s3,
-    transcribe_audio,
-    upload_audio_to_s3_sync,
+    transcribe_audio_async,
+    upload_audio_to_s3_async,
     generate_presigned_url,
-    upload_mock_interview_data,
-    load_json_from_s3,
-    move_s3_object,
+    generate_upload_grant,
+    get_answer_audio_key,
+    get_mock_interview_data_key,
+    is_tmp_resume_key,
+    validate_uploaded_object_async,
+    upload_mock_interview_data_async,
+    load_json_from_s3_async,
+    move_s3_object_async,
 )
+from app.utils.io_executor import storage_executor
 from app.database.mock_interview import (
     create_mock_interview_session,
     get_mock_interview_session,
@@ -47,33 +64,50 @@ from app.database.mock_interview import (
     get_mock_interview_sessions_by_user,
 )
 
-from app.utils.resume_parser import get_resume_text_from_s3_key
+from app.utils.resume_parser import get_resume_from_s3_key_async
+from app.utils.resume_prefetch import resume_prefetch
+from app.utils.resume_sections import (
+    SECTION_EDUCATION,
+    SECTION_EXPERIENCE,
+    SECTION_OTHER,
+    SECTION_PROJECTS,
+    SECTION_SKILLS,
+    SECTION_SUMMARY,
+    load_sections_for_s3_key_async,
+    move_sections,
+    select_sections,
+)
+from app.utils.structured_output import call_openai_structured, repair_structured_output
 from app.utils.utils import (
     generate_question_id,
     parse_ai_response,
     get_file_extension_from_s3_key,
 )
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
-
-executor = ThreadPoolExecutor(max_workers=10)  # Match max_concurrency
 
 queue_logger = logging.getLogger("sqs")  # This logger writes to logs/sqs.log
 logger = logging.getLogger("app")
 
-
-async def upload_audio_to_s3_async(*args, **kwargs):
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        executor, upload_audio_to_s3_sync, *args, **kwargs
-    )
+# Contact details are irrelevant to question generation
+INTERVIEW_RESUME_SECTIONS = (
+    SECTION_SUMMARY,
+    SECTION_EXPERIENCE,
+    SECTION_PROJECTS,
+    SECTION_SKILLS,
+    SECTION_EDUCATION,
+    SECTION_OTHER,
+)
 
 
-def move_resume_to_session_folder(temp_key: str, user_id: str, session_id: str) -> str:
+async def move_resume_to_session_folder(temp_key: str, user_id: str, session_id: str) -> str:
     ext = get_file_extension_from_s3_key(temp_key)
     resume_key = f"{user_id}/mock_interviews/{session_id}/data/resume.{ext}"
     try:
-        move_s3_object(temp_key, resume_key)
+        await asyncio.gather(
+            move_s3_object_async(temp_key, resume_key),
+            storage_executor.run(move_sidecar, temp_key, resume_key),
+            storage_executor.run(move_sections, temp_key, resume_key),
+        )
         logger.info(f"[S3_MOVE] {temp_key} → {resume_key}")
         return resume_key
     except Exception as e:
@@ -81,7 +115,7 @@ def move_resume_to_session_folder(temp_key: str, user_id: str, session_id: str)
         raise
 
 
-def start_mock_interview(
+async def start_mock_interview(
     db: Session,
     user_id: str,
     job_title: str,
@@ -96,18 +130,42 @@ def start_mock_interview(
     try:
         if settings.MOCK_DATA:
             logger.info("Using mock data for questions.")
-            ai_response = MOCK_INTERVIEW_QUESTIONS_RESPONSE
+            generated_questions = parse_ai_response(MOCK_INTERVIEW_QUESTIONS_RESPONSE)[
+                "questions"
+            ]
         else:
-            resume_text = get_resume_text_from_s3_key(resume_temp_key)
-            prompt = INTERVIEW_QUESTION_PROMPT.format(
-                max_questions=MAX_QUESTIONS_PER_SESSION,
-                resume_text=resume_text,
+            # Raw grant uploads are rejected here; only finalize turns them into tmp keys
+            if not is_tmp_resume_key(resume_temp_key, user_id):
+                raise ValueError("Unknown resume key")
+            # Reuse the extraction started when the resume was staged
+            await resume_prefetch.wait(resume_temp_key, settings.RESUME_PREFETCH_WAIT_SECONDS)
+            sections = await load_sections_for_s3_key_async(resume_temp_key)
+            resume_text = select_sections(sections or {}, INTERVIEW_RESUME_SECTIONS)
+            if not resume_text:
+                resume_text = (await get_resume_from_s3_key_async(resume_temp_key)).text
+            budgets = settings.PROMPT_SECTION_BUDGETS
+            prompt = build_prompt(
+                INTERVIEW_QUESTION_SYSTEM_PROMPT,
+                INTERVIEW_QUESTION_USER_PROMPT,
+                feature=FEATURE_MOCK_INTERVIEW,
+                sections=[
+                    PromptSection("resume_text", resume_text, budgets["resume_text"]),
+                    PromptSection(
+                        "job_description",
+                        job_description,
+                        budgets["job_description"],
+                        priority=1,
+                        min_tokens=500,
+                    ),
+                ],
                 job_title=job_title,
-                job_description=job_description,
             )
-            ai_response = call_openai(prompt)
+            generated_questions = (
+                await call_openai_structured(
+                    prompt, InterviewQuestionsOutput, feature=FEATURE_MOCK_INTERVIEW
+                )
+            ).questions
 
-        generated_questions = parse_ai_response(ai_response)["questions"]
         all_questions = [INTRO_QUESTION] + generated_questions[
             :MAX_QUESTIONS_PER_SESSION
         ]
@@ -124,18 +182,20 @@ def start_mock_interview(
             jd_storage_key = MOCK_JD_STORAGE_KEY
             question_map_storage_key = MOCK_QUES_MAP_STORAGE_KEY
         else:
-            question_map_storage_key = upload_mock_interview_data(
-                user_id, session_id, MOCK_INTERVIEW_PREV_Q_FILE, questions_with_ids
-            )
-            # Move resume from temp → final S3 path
-            resume_storage_key = move_resume_to_session_folder(
-                temp_key=resume_temp_key,
-                user_id=user_id,
-                session_id=session_id
-            )
             jd_json = {"jd": job_description}
-            jd_storage_key = upload_mock_interview_data(
-                user_id, session_id, MOCK_INTERVIEW_PREV_JD_FILE, jd_json
+            # Independent S3 writes, including moving the resume from temp → final path
+            question_map_storage_key, resume_storage_key, jd_storage_key = await asyncio.gather(
+                upload_mock_interview_data_async(
+                    user_id, session_id, MOCK_INTERVIEW_PREV_Q_FILE, questions_with_ids
+                ),
+                move_resume_to_session_folder(
+                    temp_key=resume_temp_key,
+                    user_id=user_id,
+                    session_id=session_id,
+                ),
+                upload_mock_interview_data_async(
+                    user_id, session_id, MOCK_INTERVIEW_PREV_JD_FILE, jd_json
+                ),
             )
 
         create_mock_interview_session(
@@ -182,7 +242,9 @@ async def process_mock_interview_worker(
             mapping_from_storage = MOCK_QUES_MAPPING
             mapping_from_storage[0]["question_id"] = generate_question_id(user_id, session_id, 1)
         else:
-            mapping_from_storage = load_json_from_s3(session.questions_mapping_storage_key)
+            mapping_from_storage = await load_json_from_s3_async(
+                session.questions_mapping_storage_key
+            )
 
         if not mapping_from_storage:
             queue_logger.error(f"[JOB] Questions mapping file missing for session {session_id}")
@@ -208,7 +270,7 @@ async def process_mock_interview_worker(
                 transcription_text = MOCK_AUDIO_TRANSCRIPTION_TEXT
             else:
                 queue_logger.info(f"Transcribing audio: {answer_audio_key}")
-                transcription_text = transcribe_audio(answer_audio_key)
+                transcription_text = await transcribe_audio_async(answer_audio_key)
 
             interview_log.append(
                 {
@@ -221,24 +283,26 @@ async def process_mock_interview_worker(
 
         if settings.MOCK_DATA:
             ai_response_json = MOCK_INTERVIEW_EVALUATION_RESPONSE
+        elif settings.INTERVIEW_EVAL_BATCH_MODE:
+            # Evaluated later by the batch poller (complete_batched_interview_evaluation)
+            await queue_interview_evaluation(
+                user_id, session_id, session.job_title, interview_log
+            )
+            session_status = "evaluating"
+            return
         else:
             # ✅ Step 2: Call OpenAI once for **all** questions
-            ai_response_json = get_openai_interview_evaluation(
+            ai_response_json = await get_openai_interview_evaluation(
                 session.job_title, interview_log
             )
 
         # ✅ Step 3: Process AI response
-        evaluation_results, final_evaluation = process_ai_response(
-            ai_response_json, interview_log
-        )
-        queue_logger.info("[JOB] Processed AI evaluation response.")
-
-        # Re-upload evaluation results and AI feedback as JSON to storage.
-        interview_log_storage_key = upload_mock_interview_data(
-            user_id, session_id, MOCK_INTERVIEW_LOG_FILE, evaluation_results
-        )
-        ai_feedback_storage_key = upload_mock_interview_data(
-            user_id, session_id, MOCK_INTERVIEW_AI_FEEDBACK_FILE, final_evaluation
+        (
+            interview_log_storage_key,
+            ai_feedback_storage_key,
+            final_evaluation,
+        ) = await store_interview_evaluation(
+            user_id, session_id, ai_response_json, interview_log
         )
         session_status = "completed"
         queue_logger.info(
@@ -263,6 +327,87 @@ async def process_mock_interview_worker(
         )
 
 
+async def store_interview_evaluation(
+    user_id: str, session_id: str, ai_response_json: str, interview_log: list[dict]
+):
+    """Maps the AI evaluation onto the interview log and uploads results and feedback."""
+    evaluation_results, final_evaluation = process_ai_response(
+        ai_response_json, interview_log
+    )
+    queue_logger.info("[JOB] Processed AI evaluation response.")
+
+    # Re-upload evaluation results and AI feedback as JSON to storage.
+    interview_log_storage_key, ai_feedback_storage_key = await asyncio.gather(
+        upload_mock_interview_data_async(
+            user_id, session_id, MOCK_INTERVIEW_LOG_FILE, evaluation_results
+        ),
+        upload_mock_interview_data_async(
+            user_id, session_id, MOCK_INTERVIEW_AI_FEEDBACK_FILE, final_evaluation
+        ),
+    )
+    return interview_log_storage_key, ai_feedback_storage_key, final_evaluation
+
+
+async def complete_batched_interview_evaluation(db: Session, result: BatchResult):
+    """Finishes a session whose evaluation came back from a batch job."""
+    user_id, session_id = parse_batch_custom_id(result.custom_id)
+    queue_logger.info(f"[BATCH_JOB] Completing evaluation for session {session_id}")
+    session = get_mock_interview_session(db, session_id)
+    if not session:
+        queue_logger.warning(f"[BATCH_JOB] Session {session_id} not found")
+        return
+    if session.status != "evaluating":
+        # Already finished by an earlier, interrupted pass over the same batch
+        queue_logger.info(f"[BATCH_JOB] Session {session_id} is {session.status}; skipping")
+        return
+
+    session_status = "failed"
+    interview_log_storage_key = ""
+    ai_feedback_storage_key = ""
+    try:
+        if result.error:
+            raise Exception(f"Batch evaluation failed: {result.error}")
+        evaluation = await repair_structured_output(
+            result.content,
+            InterviewEvaluationOutput,
+            feature=FEATURE_INTERVIEW_EVAL,
+            priority=PRIORITY_BACKGROUND,
+        )
+        interview_log = await load_json_from_s3_async(
+            get_mock_interview_data_key(
+                user_id, session_id, MOCK_INTERVIEW_PENDING_LOG_FILE
+            )
+        )
+        if not interview_log:
+            raise Exception("Pending interview log missing")
+
+        (
+            interview_log_storage_key,
+            ai_feedback_storage_key,
+            final_evaluation,
+        ) = await store_interview_evaluation(
+            user_id, session_id, evaluation.model_dump_json(), interview_log
+        )
+        session_status = "completed"
+    except Exception as e:
+        queue_logger.error(
+            f"[BATCH_JOB] Error completing session {session_id}: {e}", exc_info=True
+        )
+    finally:
+        save_interview_results(
+            db,
+            session,
+            interview_log_storage_key,
+            ai_feedback_storage_key,
+            session_status,
+        )
+
+    # Only after the status is saved, so a replayed batch never emails twice
+    if session_status == "completed":
+        await send_interview_result_email(db, user_id, session, final_evaluation)
+        queue_logger.info(f"[BATCH_JOB] Finished processing session {session_id}")
+
+
 def get_mock_interview_sessions_for_user(db: Session, user_id: str):
     """Fetches all mock interview sessions for a given user."""
     logger.info(f"📥 Fetching all sessions for user: {user_id}")
@@ -279,7 +424,7 @@ def get_mock_interview_sessions_for_user(db: Session, user_id: str):
     ]
 
 
-def get_mock_interview_session_details(db: Session, session_id: str):
+async def get_mock_interview_session_details(db: Session, session_id: str):
     """Fetches detailed information about a specific mock interview session."""
     logger.info(f"📥 Fetching session details for session: {session_id}")
     session = get_mock_interview_session(db, session_id)
@@ -287,7 +432,10 @@ def get_mock_interview_session_details(db: Session, session_id: str):
         logger.error(f"❌ Session {session_id} not found")
         raise Exception(f"Session {session_id} not found")
 
-    interview_log = load_json_from_s3(session.interview_log_storage_key)
+    interview_log, ai_feedback = await asyncio.gather(
+        load_json_from_s3_async(session.interview_log_storage_key),
+        load_json_from_s3_async(session.ai_feedback_storage_key),
+    )
     evaluation_results = [
         {
             "question_id": entry.get("question_id"),
@@ -302,7 +450,6 @@ def get_mock_interview_session_details(db: Session, session_id: str):
         for entry in interview_log
     ]
 
-    ai_feedback = load_json_from_s3(session.ai_feedback_storage_key)
     return {
         "session_id": session.id,
         "job_title": session.job_title,
@@ -332,7 +479,7 @@ async def update_question_mapping_for_answer(
         storage_file_key = (
             f"{user_id}/mock_interviews/{session_id}/audio/mock_audio.mp3"
         )
-        time.sleep(10)
+        await asyncio.sleep(settings.MOCK_AUDIO_UPLOAD_DELAY_SECONDS)
     else:
         try:
             content = await answer_audio.read()
@@ -353,62 +500,134 @@ async def update_question_mapping_for_answer(
             )
             raise HTTPException(status_code=500, detail="Audio upload failed") from exc
 
-        # --- Step 2. Retrieve the session and load the questions mapping file ---
-        session_obj = get_mock_interview_session(db, session_id)
-        try:
-            questions_mapping = load_json_from_s3(
-                session_obj.questions_mapping_storage_key
-            )
-            logger.info(
-                f"[SERVICE] Fetched questions mapping file for session {session_id}"
-            )
-        except Exception as exc:
-            logger.error(
-                f"[SERVICE] Error fetching questions mapping for session {session_id}: {exc}",
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=500, detail="Failed to fetch questions mapping"
-            ) from exc
-
-        # --- Step 3. Update the question mapping ---
-        updated = False
-        for item in questions_mapping:
-            if item.get("question_id") == question_id:
-                item["answer_audio"] = storage_file_key
-                updated = True
-                logger.info(
-                    f"[SERVICE] Updated question {question_id} with new answer audio file key."
-                )
-                break
+        await record_answer_audio(db, session_id, user_id, question_id, storage_file_key)
 
-        if not updated:
-            logger.error(
-                f"[SERVICE] Question ID {question_id} not found in mapping file for session {session_id}"
-            )
-            raise HTTPException(
-                status_code=400, detail="Question ID not found in mapping"
-            )
+    return {"status": "success", "answer_audio_key": storage_file_key}
 
-        # --- Step 4. Re-upload the updated questions mapping file ---
-        try:
-            new_prev_q_key = upload_mock_interview_data(
-                user_id, session_id, MOCK_INTERVIEW_PREV_Q_FILE, questions_mapping
-            )
+
+async def record_answer_audio(
+    db: Session,
+    session_id: str,
+    user_id: str,
+    question_id: str,
+    storage_file_key: str,
+) -> None:
+    """Points the question's answer_audio at `storage_file_key` in the S3-stored questions mapping."""
+    # --- Step 2. Retrieve the session and load the questions mapping file ---
+    session_obj = get_mock_interview_session(db, session_id)
+    try:
+        questions_mapping = await load_json_from_s3_async(
+            session_obj.questions_mapping_storage_key
+        )
+        logger.info(
+            f"[SERVICE] Fetched questions mapping file for session {session_id}"
+        )
+    except Exception as exc:
+        logger.error(
+            f"[SERVICE] Error fetching questions mapping for session {session_id}: {exc}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=500, detail="Failed to fetch questions mapping"
+        ) from exc
+
+    # --- Step 3. Update the question mapping ---
+    updated = False
+    for item in questions_mapping:
+        if item.get("question_id") == question_id:
+            item["answer_audio"] = storage_file_key
+            updated = True
             logger.info(
-                f"[SERVICE] Re-uploaded questions mapping file for session {session_id}; new file key: {new_prev_q_key}"
-            )
-            # Update the session record (if needed)
-            session_obj.questions_mapping_storage_key = new_prev_q_key
-            db.commit()
-            db.refresh(session_obj)
-        except Exception as exc:
-            logger.error(
-                f"[SERVICE] Failed to update questions mapping file for session {session_id}: {exc}",
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=500, detail="Failed to update questions mapping"
+                f"[SERVICE] Updated question {question_id} with new answer audio file key."
             )
+            break
 
-    return {"status": "success", "answer_audio_key": storage_file_key}
+    if not updated:
+        logger.error(
+            f"[SERVICE] Question ID {question_id} not found in mapping file for session {session_id}"
+        )
+        raise HTTPException(
+            status_code=400, detail="Question ID not found in mapping"
+        )
+
+    # --- Step 4. Re-upload the updated questions mapping file ---
+    try:
+        new_prev_q_key = await upload_mock_interview_data_async(
+            user_id, session_id, MOCK_INTERVIEW_PREV_Q_FILE, questions_mapping
+        )
+        logger.info(
+            f"[SERVICE] Re-uploaded questions mapping file for session {session_id}; new file key: {new_prev_q_key}"
+        )
+        # Update the session record (if needed)
+        session_obj.questions_mapping_storage_key = new_prev_q_key
+        db.commit()
+        db.refresh(session_obj)
+    except Exception as exc:
+        logger.error(
+            f"[SERVICE] Failed to update questions mapping file for session {session_id}: {exc}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=500, detail="Failed to update questions mapping"
+        )
+
+
+def _get_user_session(db: Session, session_id: str, user_id: str):
+    session = get_mock_interview_session(db, session_id)
+    if not session or session.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+
+def _answer_audio_key_prefix(user_id: str, session_id: str, question_id: str) -> str:
+    return get_answer_audio_key(user_id, session_id, f"{question_id}_")
+
+
+def issue_answer_upload_grant(
+    db: Session, session_id: str, user_id: str, question_id: str, content_type: str
+) -> dict:
+    """Presigned POST for uploading an answer's audio straight to S3."""
+    _get_user_session(db, session_id, user_id)
+    ext = ANSWER_AUDIO_CONTENT_TYPES.get(content_type)
+    if ext is None:
+        raise HTTPException(status_code=400, detail=f"Unsupported audio type: {content_type}")
+    if "/" in question_id:
+        raise HTTPException(status_code=400, detail="Invalid question ID")
+
+    key = f"{_answer_audio_key_prefix(user_id, session_id, question_id)}{uuid.uuid4().hex}.{ext}"
+    grant = generate_upload_grant(
+        key,
+        content_type,
+        settings.ANSWER_AUDIO_MAX_BYTES,
+        settings.UPLOAD_GRANT_EXPIRATION_SECONDS,
+    )
+    logger.info(f"[UPLOAD_GRANT] Answer audio grant for session {session_id}, question {question_id}")
+    return {
+        "key": key,
+        "url": grant["url"],
+        "fields": grant["fields"],
+        "max_bytes": settings.ANSWER_AUDIO_MAX_BYTES,
+        "expires_in": settings.UPLOAD_GRANT_EXPIRATION_SECONDS,
+    }
+
+
+async def finalize_answer_upload(
+    db: Session, session_id: str, user_id: str, question_id: str, answer_audio_key: str
+) -> dict:
+    """Validates answer audio uploaded with a grant and records it in the questions mapping."""
+    _get_user_session(db, session_id, user_id)
+    prefix = _answer_audio_key_prefix(user_id, session_id, question_id)
+    if not answer_audio_key.startswith(prefix) or "/" in answer_audio_key[len(prefix):]:
+        raise HTTPException(status_code=400, detail="Unknown upload key")
+    try:
+        await validate_uploaded_object_async(
+            answer_audio_key, ANSWER_AUDIO_CONTENT_TYPES, settings.ANSWER_AUDIO_MAX_BYTES
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    await record_answer_audio(db, session_id, user_id, question_id, answer_audio_key)
+    logger.info(
+        f"[UPLOAD_FINALIZE] Recorded answer audio for session {session_id}, question {question_id}"
+    )
+    return {"status": "success", "answer_audio_key": answer_audio_key}
@@ -1,25 +1,135 @@
+import asyncio
 import logging
+from typing import Optional
+
+from botocore.exceptions import ClientError
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
 
+from app.core.config import settings
+
 from app.database.resume import (
     create_resume,
     get_resume,
     delete_resume,
     update_resume_file,
     update_resume_data,
+    update_resume_metadata,
     get_resume_by_id,
 )
 from app.utils.aws_utils import (
-    upload_resume_to_s3,
-    delete_resume_from_s3,
+    upload_resume_to_s3_async,
+    delete_resume_from_s3_async,
+    download_resume_from_s3_key_async,
     generate_presigned_url,
+    generate_upload_grant,
+    get_tmp_resume_key,
+    get_upload_grant_key,
+    is_upload_grant_key,
+    move_s3_object_async,
+    validate_uploaded_object_async,
 )
+from app.utils.constants import RESUME_UPLOAD_CONTENT_TYPES
+from app.utils.io_executor import storage_executor
+from app.utils.resume_prefetch import resume_prefetch
+from app.utils.resume_parser import extract_resume_for_s3_key_async
+from app.utils.resume_sections import segment_resume_async, store_sections_for_s3_key
 
 logger = logging.getLogger("app")
 
+SEGMENTED_EXTENSIONS = ("pdf", "docx", "txt")
+
+
+def read_upload_bytes(file: UploadFile) -> Optional[bytes]:
+    """Returns the upload's bytes for parsing, or None if it is not a parseable resume."""
+    file_extension = file.filename.split(".")[-1].lower()
+    if file_extension not in SEGMENTED_EXTENSIONS:
+        return None
+    file.file.seek(0)
+    data = file.file.read(settings.RESUME_MAX_BYTES + 1)
+    file.file.seek(0)
+    if len(data) > settings.RESUME_MAX_BYTES:
+        return None
+    return data
+
+
+async def parse_resume_metadata(file: UploadFile) -> dict:
+    """Segments an uploaded resume into sections for its JSONB metadata ({} if not possible)."""
+    data = read_upload_bytes(file)
+    if data is None:
+        return {}
+    file_extension = file.filename.split(".")[-1].lower()
+    return await segment_resume_async(data, file_extension) or {}
+
+
+async def prefetch_temp_resume(tmp_key: str, data: bytes) -> None:
+    """Extracts and segments a staged resume so starting the interview finds both cached."""
+    extension = tmp_key.rsplit(".", 1)[-1]
+    resume_metadata, extraction = await asyncio.gather(
+        segment_resume_async(data, extension),
+        extract_resume_for_s3_key_async(tmp_key, data),
+        return_exceptions=True,
+    )
+    if resume_metadata:
+        await storage_executor.run(store_sections_for_s3_key, tmp_key, resume_metadata)
+    if isinstance(extraction, Exception):
+        # Starting the interview extracts on demand instead
+        raise extraction
+    logger.info(f"[RESUME_PREFETCH] Pre-processed staged resume: {tmp_key}")
+
+
+async def prefetch_uploaded_resume(tmp_key: str) -> None:
+    """`prefetch_temp_resume` for a resume the browser uploaded straight to S3."""
+    resume_file = await download_resume_from_s3_key_async(tmp_key)
+    await prefetch_temp_resume(tmp_key, resume_file.getvalue())
+
 
-def handle_resume_upload(db: Session, user_id: str, file: UploadFile, title: str):
+def issue_temp_resume_upload_grant(user_id: str, content_type: str) -> dict:
+    """Presigned POST for staging a resume in tmp/ without streaming it through the API."""
+    ext = RESUME_UPLOAD_CONTENT_TYPES.get(content_type)
+    if ext is None:
+        raise ValueError("Unsupported file format. Only PDF, DOCX, and TXT are allowed.")
+
+    key = get_upload_grant_key(user_id, ext)
+    grant = generate_upload_grant(
+        key, content_type, settings.RESUME_MAX_BYTES, settings.UPLOAD_GRANT_EXPIRATION_SECONDS
+    )
+    logger.info(f"[UPLOAD_GRANT] Resume grant for user: {user_id}, key: {key}")
+    return {
+        "key": key,
+        "url": grant["url"],
+        "fields": grant["fields"],
+        "max_bytes": settings.RESUME_MAX_BYTES,
+        "expires_in": settings.UPLOAD_GRANT_EXPIRATION_SECONDS,
+    }
+
+
+async def finalize_temp_resume_upload(user_id: str, upload_key: str) -> str:
+    """Validates a directly uploaded resume and starts pre-processing it; returns the temp key.
+
+    The grant stays usable until it expires, so the validated version (pinned
+    by its ETag) is moved to a tmp key no grant covers. Overwriting the upload
+    key afterwards cannot change what the interview or the caches see.
+    """
+    if not is_upload_grant_key(upload_key, user_id):
+        raise ValueError("Unknown upload key")
+    head = await validate_uploaded_object_async(
+        upload_key, RESUME_UPLOAD_CONTENT_TYPES, settings.RESUME_MAX_BYTES
+    )
+    temp_key = get_tmp_resume_key(user_id, upload_key.rsplit(".", 1)[-1])
+    try:
+        await move_s3_object_async(upload_key, temp_key, if_match=head["ETag"])
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("PreconditionFailed", "412"):
+            raise ValueError("The upload changed while it was being validated")
+        raise
+    if settings.RESUME_PREFETCH_ENABLED:
+        resume_prefetch.start(temp_key, prefetch_uploaded_resume(temp_key))
+    logger.info(f"[UPLOAD_FINALIZE] Staged resume for user: {user_id}, key: {temp_key}")
+    return temp_key
+
+
+async def handle_resume_upload(db: Session, user_id: str, file: UploadFile, title: str):
     """Handles resume upload and database storage."""
     logger.info(f"[UPLOAD_RESUME] Initiated for user: {user_id}, title: {title}")
 
@@ -31,8 +141,9 @@ def handle_resume_upload(db: Session, user_id: str, file: UploadFile, title: str
                 "Invalid file format. Only PDF, DOCX, DOC, and TXT are allowed."
             )
 
-        s3_url = upload_resume_to_s3(file, user_id)
-        resume = create_resume(db, user_id, title, s3_url)
+        resume_metadata = await parse_resume_metadata(file)
+        s3_url = await upload_resume_to_s3_async(file, user_id)
+        resume = create_resume(db, user_id, title, s3_url, resume_metadata)
 
         logger.info(
             f"[UPLOAD_RESUME] Completed for user: {user_id}, resume_id: {resume.id}"
@@ -46,7 +157,7 @@ def handle_resume_upload(db: Session, user_id: str, file: UploadFile, title: str
         raise
 
 
-def handle_delete_resume(db: Session, resume_id: str):
+async def handle_delete_resume(db: Session, resume_id: str):
     """Handles deleting a resume from both DB and S3."""
     logger.info(f"[DELETE_RESUME] Initiated for resume_id: {resume_id}")
 
@@ -56,7 +167,7 @@ def handle_delete_resume(db: Session, resume_id: str):
             logger.warning(f"[DELETE_RESUME] Resume not found: {resume_id}")
             raise ValueError("Resume not found")
 
-        delete_resume_from_s3(resume.s3_url)
+        await delete_resume_from_s3_async(resume.s3_url)
         delete_resume(db, resume_id)
 
         logger.info(f"[DELETE_RESUME] Successfully deleted resume_id: {resume_id}")
@@ -96,7 +207,7 @@ def get_resume_download_url(db: Session, user_id: str, resume_id: str):
         return None
 
 
-def handle_resume_update(
+async def handle_resume_update(
     db: Session,
     resume_id: str,
     user_id: str,
@@ -115,8 +226,13 @@ def handle_resume_update(
 
         if updated_resume:
             logger.info(f"[UPDATE_RESUME] Uploading new resume file for: {resume_id}")
-            new_s3_url = upload_resume_to_s3(updated_resume, user_id)
+            resume_metadata = await parse_resume_metadata(updated_resume)
+            new_s3_url = await upload_resume_to_s3_async(updated_resume, user_id)
             update_resume_file(db, resume, new_s3_url)
+            # The old file's sections no longer apply, even if the new one can't be segmented
+            update_resume_metadata(
+                db, resume, resume_metadata or {"sections_version": None, "sections": None}
+            )
 
         if title or resume_data:
             logger.info(f"[UPDATE_RESUME] Updating metadata for resume_id: {resume_id}")
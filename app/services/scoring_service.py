@@ -1,4 +1,3 @@
-import json
 import logging
 
 from fastapi import UploadFile
@@ -6,49 +5,53 @@ from fastapi import UploadFile
 from app.core.config import settings
 from app.schemas.scoring import ResumeScoringResponse
 from app.utils.mock_data import MOCK_SCORE
-from app.utils.prompts import RESUME_SCORING_PROMPT
-from app.utils.resume_parser import extract_resume_text
+from app.utils.constants import FEATURE_RESUME_EVAL
+from app.utils.prompt_builder import PromptSection, build_prompt
+from app.utils.prompts import (
+    RESUME_SCORING_PROMPT_VERSION,
+    RESUME_SCORING_SYSTEM_PROMPT,
+    RESUME_SCORING_USER_PROMPT,
+)
+from app.utils.resume_parser import extract_resume_async
+from app.utils.structured_output import call_openai_structured
 from app.utils.utils import parse_ai_response
-from app.utils.openai_client import call_openai
 
 logger = logging.getLogger("app")
 
 
-def score_resume(resume_file: UploadFile):
-    """Analyzes and scores a resume."""
+async def score_resume(resume_file: UploadFile, bypass_cache: bool = False):
+    """Analyzes and scores a resume. Identical resumes are served from the LLM cache."""
     logger.info(
         f"[RESUME_SCORING] Starting resume scoring for uploaded file: {resume_file.filename}"
     )
     try:
         if settings.MOCK_DATA:
             logger.info("[RESUME_SCORING] Using mock data for scoring.")
-            ai_response = MOCK_SCORE
-        else:
-            resume_text = extract_resume_text(resume_file)
-            logger.info("[RESUME_SCORING] Extracted resume text. Generating AI prompt.")
-            prompt = RESUME_SCORING_PROMPT.format(resume_text=resume_text)
-            logger.info("[RESUME_SCORING] Sending prompt to OpenAI for scoring.")
-            ai_response = call_openai(prompt)
+            return ResumeScoringResponse(**parse_ai_response(MOCK_SCORE))
 
-        try:
-            parsed = parse_ai_response(
-                ai_response
-            )  # Convert AI response to a dictionary
-            logger.info("[RESUME_SCORING] Successfully parsed AI response.")
-        except json.JSONDecodeError as e:
-            logger.error(
-                f"[RESUME_SCORING] Failed to decode AI response: {str(e)}",
-                exc_info=True,
-            )
-            parsed = {}  # Default empty dict if parsing fails
-        except Exception as e:
-            logger.error(
-                f"[RESUME_SCORING] Unexpected error while parsing AI response: {str(e)}",
-                exc_info=True,
-            )
-            parsed = {}
-
-        return ResumeScoringResponse(**parsed)
+        resume_text = (await extract_resume_async(resume_file)).text
+        logger.info("[RESUME_SCORING] Extracted resume text. Generating AI prompt.")
+        prompt = build_prompt(
+            RESUME_SCORING_SYSTEM_PROMPT,
+            RESUME_SCORING_USER_PROMPT,
+            feature=FEATURE_RESUME_EVAL,
+            sections=[
+                PromptSection(
+                    "resume_text",
+                    resume_text,
+                    settings.PROMPT_SECTION_BUDGETS["resume_text"],
+                )
+            ],
+        )
+        logger.info("[RESUME_SCORING] Sending prompt to OpenAI for scoring.")
+        # Schema-constrained and validated (with one repair attempt) before returning
+        return await call_openai_structured(
+            prompt,
+            ResumeScoringResponse,
+            feature=FEATURE_RESUME_EVAL,
+            template_version=RESUME_SCORING_PROMPT_VERSION,
+            bypass_cache=bypass_cache,
+        )
     except Exception as e:
         logger.error(
             f"[RESUME_SCORING] Scoring failed for file {resume_file.filename}: {str(e)}",
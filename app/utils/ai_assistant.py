@@ -1,33 +1,80 @@
 import logging
+from typing import AsyncIterator
 
-from app.utils.openai_client import call_openai
-from app.utils.prompts import JD_TAILORING_PROMPT
-from app.utils.resume_parser import extract_resume_text
+from app.core.config import settings
+from app.schemas.ai_resume import TailoringSuggestions
+from app.utils.constants import FEATURE_RESUME_TAILOR
+from app.utils.json_stream import iter_text_chunks
+from app.utils.llm_cache import get_cached_response, store_cached_response
+from app.utils.openai_client import stream_openai
+from app.utils.prompt_builder import ChatPrompt, PromptSection, build_prompt
+from app.utils.prompts import (
+    JD_TAILORING_PROMPT_VERSION,
+    JD_TAILORING_SYSTEM_PROMPT,
+    JD_TAILORING_USER_PROMPT,
+)
+from app.utils.resume_parser import extract_resume_async
+from app.utils.structured_output import (
+    call_openai_structured,
+    is_valid_output,
+    json_schema_format,
+)
 
 logger = logging.getLogger("app")
 
 
-def analyze_resume_with_ai(
-    job_title: str, job_description: str, skills: str, resume_file
+def build_tailoring_prompt(
+    job_title: str, job_description: str, skills: str, resume_content: str
+) -> ChatPrompt:
+    budgets = settings.PROMPT_SECTION_BUDGETS
+    # Under pressure the job description is trimmed before the resume
+    return build_prompt(
+        JD_TAILORING_SYSTEM_PROMPT,
+        JD_TAILORING_USER_PROMPT,
+        feature=FEATURE_RESUME_TAILOR,
+        sections=[
+            PromptSection("resume_content", resume_content, budgets["resume_text"], priority=0),
+            PromptSection("skills", skills, budgets["skills"], priority=1),
+            PromptSection(
+                "job_description",
+                job_description,
+                budgets["job_description"],
+                priority=2,
+                min_tokens=500,
+            ),
+        ],
+        job_title=job_title,
+    )
+
+
+async def analyze_resume_with_ai(
+    job_title: str,
+    job_description: str,
+    skills: str,
+    resume_file,
+    bypass_cache: bool = False,
 ):
-    """Sends resume as an attachment to AI and retrieves structured review suggestions."""
+    """Sends resume as an attachment to AI and retrieves validated review suggestions."""
     logger.info(f"[RESUME_ANALYSIS] Analyzing resume for job: '{job_title}'")
     try:
-        resume_content = extract_resume_text(resume_file)
+        resume_content = (await extract_resume_async(resume_file)).text
         logger.info("[RESUME_ANALYSIS] Resume content successfully extracted")
 
-        prompt = JD_TAILORING_PROMPT.format(
-            job_description=job_description,
-            job_title=job_title,
-            resume_content=resume_content,
-            skills=skills,
+        prompt = build_tailoring_prompt(
+            job_title, job_description, skills, resume_content
         )
 
         logger.info("[RESUME_ANALYSIS] Sending data to OpenAI for tailoring response")
-        content = call_openai(prompt)
+        suggestions = await call_openai_structured(
+            prompt,
+            TailoringSuggestions,
+            feature=FEATURE_RESUME_TAILOR,
+            template_version=JD_TAILORING_PROMPT_VERSION,
+            bypass_cache=bypass_cache,
+        )
 
         logger.info("[RESUME_ANALYSIS] Successfully received response from OpenAI")
-        return content
+        return suggestions.model_dump()
 
     except Exception as e:
         logger.error(
@@ -35,3 +82,40 @@ def analyze_resume_with_ai(
             exc_info=True,
         )
         raise
+
+
+async def stream_resume_analysis(
+    job_title: str,
+    job_description: str,
+    skills: str,
+    resume_content: str,
+    bypass_cache: bool = False,
+) -> AsyncIterator[str]:
+    """Streams the raw tailoring completion, replaying it from the LLM cache when possible."""
+    prompt = build_tailoring_prompt(job_title, job_description, skills, resume_content)
+    if not bypass_cache:
+        cached = await get_cached_response(
+            prompt, FEATURE_RESUME_TAILOR, JD_TAILORING_PROMPT_VERSION
+        )
+        if cached is not None:
+            async for chunk in iter_text_chunks(cached):
+                yield chunk
+            return
+
+    logger.info("[RESUME_ANALYSIS] Streaming tailoring response from OpenAI")
+    chunks = []
+    served_models = []
+    async for delta in stream_openai(
+        prompt,
+        feature=FEATURE_RESUME_TAILOR,
+        response_format=json_schema_format(TailoringSuggestions),
+        on_model=served_models.append,
+    ):
+        chunks.append(delta)
+        yield delta
+
+    content = "".join(chunks)
+    if is_valid_output(TailoringSuggestions, content):
+        await store_cached_response(
+            prompt, FEATURE_RESUME_TAILOR, JD_TAILORING_PROMPT_VERSION, content, served_models[0]
+        )
@@ -1,3 +1,4 @@
+import asyncio
 import io
 import json
 import logging
@@ -6,8 +7,11 @@ import time
 
 from fastapi import UploadFile
 import boto3
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError, ClientError, BotoCoreError
 from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.io_executor import storage_executor
 from boto3.s3.transfer import TransferConfig
 
 logger = logging.getLogger("app")
@@ -24,6 +28,10 @@ s3_client = boto3.client(
     aws_access_key_id=settings.AWS_ACCESS_KEY,
     aws_secret_access_key=settings.AWS_SECRET_KEY,
     region_name=settings.AWS_REGION_NAME,
+    # Room for every storage I/O thread plus multipart transfer threads
+    config=Config(
+        max_pool_connections=settings.STORAGE_IO_WORKERS + transfer_config.max_request_concurrency
+    ),
 )
 
 transcribe_client = boto3.client(
@@ -42,8 +50,47 @@ sqs_client = boto3.client(
 )
 
 S3_TMP_PREFIX = "tmp"
+# Browser uploads land here first; only finalize moves them to a usable tmp key
+S3_UPLOAD_GRANT_DIR = "uploads"
+# ClientError codes meaning the object does not exist
+S3_NOT_FOUND_CODES = ("404", "NoSuchKey", "NotFound")
 bucket_name = settings.S3_BUCKET_NAME
 
+# S3 key -> (ETag, JSON text). Every read is still a (conditional) GET, so
+# entries are only served once S3 confirms they are current.
+json_cache = TTLCache(
+    max_size=settings.S3_JSON_CACHE_MAX_ENTRIES,
+    default_ttl=settings.S3_JSON_CACHE_TTL_SECONDS,
+)
+json_cache_not_modified = 0
+
+
+def _cache_json(file_key: str, etag: str | None, body: str) -> None:
+    if etag and len(body) <= settings.S3_JSON_CACHE_MAX_OBJECT_BYTES:
+        json_cache.set(file_key, (etag, body))
+    else:
+        json_cache.delete(file_key)
+
+
+def get_tmp_resume_key(user_id: str, ext: str) -> str:
+    return f"{S3_TMP_PREFIX}/{user_id}/{uuid.uuid4().hex}.{ext}"
+
+
+def is_tmp_resume_key(key: str, user_id: str) -> bool:
+    """True if `key` is a staged resume of `user_id` (as built by get_tmp_resume_key)."""
+    prefix = f"{S3_TMP_PREFIX}/{user_id}/"
+    return key.startswith(prefix) and "/" not in key[len(prefix):] and ".." not in key
+
+
+def get_upload_grant_key(user_id: str, ext: str) -> str:
+    return f"{S3_TMP_PREFIX}/{user_id}/{S3_UPLOAD_GRANT_DIR}/{uuid.uuid4().hex}.{ext}"
+
+
+def is_upload_grant_key(key: str, user_id: str) -> bool:
+    """True if `key` is a browser upload of `user_id` (as built by get_upload_grant_key)."""
+    prefix = f"{S3_TMP_PREFIX}/{user_id}/{S3_UPLOAD_GRANT_DIR}/"
+    return key.startswith(prefix) and "/" not in key[len(prefix):] and ".." not in key
+
 
 def upload_resume_to_tmp_s3(file: UploadFile, user_id: str) -> str:
     """Upload to a tmp folder and return the key."""
@@ -51,8 +98,7 @@ def upload_resume_to_tmp_s3(file: UploadFile, user_id: str) -> str:
         key = f"{S3_TMP_PREFIX}/{user_id}/mock_resume.pdf"
     else:
         ext = file.filename.split(".")[-1].lower()
-        tmp_id = uuid.uuid4().hex
-        key = f"{S3_TMP_PREFIX}/{user_id}/{tmp_id}.{ext}"
+        key = get_tmp_resume_key(user_id, ext)
         try:
             file.file.seek(0)
             s3_client.upload_fileobj(
@@ -71,16 +117,23 @@ def upload_resume_to_tmp_s3(file: UploadFile, user_id: str) -> str:
     return key
 
 
-def move_s3_object(src_key: str, dst_key: str) -> None:
-    """Copy src_key → dst_key then delete src_key."""
+def move_s3_object(src_key: str, dst_key: str, if_match: str | None = None) -> None:
+    """Copy src_key → dst_key then delete src_key.
+
+    With `if_match`, the copy fails with a PreconditionFailed ClientError unless
+    src_key still has that ETag.
+    """
     try:
         logger.info(f"[S3_MOVE] Copying {src_key} → {dst_key}")
+        extra_args = {"CopySourceIfMatch": if_match} if if_match else {}
         s3_client.copy_object(
             Bucket=bucket_name,
             CopySource={"Bucket": bucket_name, "Key": src_key},
             Key=dst_key,
+            **extra_args,
         )
         s3_client.delete_object(Bucket=bucket_name, Key=src_key)
+        json_cache.delete(src_key)
         logger.info(f"[S3_MOVE] Move complete")
     except ClientError as e:
         logger.error(f"[S3_MOVE] ClientError: {e}", exc_info=True)
@@ -152,6 +205,76 @@ def generate_presigned_url(file_key: str, expiration: int = 3600) -> str:
         raise
 
 
+def generate_upload_grant(
+    file_key: str, content_type: str, max_bytes: int, expiration: int
+) -> dict:
+    """
+    Presigned POST that lets a browser upload one object straight to S3.
+
+    S3 itself rejects uploads to another key, with another Content-Type or
+    larger than `max_bytes`.
+    """
+    try:
+        grant = s3_client.generate_presigned_post(
+            Bucket=bucket_name,
+            Key=file_key,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, max_bytes],
+            ],
+            ExpiresIn=expiration,
+        )
+        logger.info(f"[UPLOAD_GRANT] Issued upload grant for key: {file_key}")
+        return grant
+    except ClientError as e:
+        logger.error(f"[UPLOAD_GRANT] Failed for key {file_key}: {e}", exc_info=True)
+        raise
+
+
+def head_s3_object(file_key: str) -> dict | None:
+    """Returns the object's metadata, or None if it does not exist."""
+    try:
+        return s3_client.head_object(Bucket=bucket_name, Key=file_key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in S3_NOT_FOUND_CODES:
+            return None
+        logger.error(f"[S3_HEAD] Client error for key {file_key}: {e}", exc_info=True)
+        raise
+
+
+def validate_uploaded_object(
+    file_key: str, content_types: dict[str, str], max_bytes: int
+) -> dict:
+    """
+    Checks a directly uploaded object and returns its metadata.
+
+    `content_types` maps each accepted Content-Type to the extension the key
+    must have. An object that fails the checks is deleted.
+
+    Raises:
+        ValueError: If the object is missing, too large or of the wrong type.
+    """
+    head = head_s3_object(file_key)
+    if head is None:
+        raise ValueError("Uploaded file not found")
+
+    content_type = head.get("ContentType", "")
+    size = head.get("ContentLength", 0)
+    problem = None
+    if content_types.get(content_type) != file_key.rsplit(".", 1)[-1]:
+        problem = f"Unsupported content type: {content_type}"
+    elif not 0 < size <= max_bytes:
+        problem = f"File is {size} bytes; the limit is {max_bytes} bytes"
+
+    if problem:
+        logger.warning(f"[UPLOAD_VALIDATE] Rejected {file_key}: {problem}")
+        s3_client.delete_object(Bucket=bucket_name, Key=file_key)
+        raise ValueError(problem)
+    logger.info(f"[UPLOAD_VALIDATE] Accepted {file_key} ({size} bytes, {content_type})")
+    return head
+
+
 def delete_resume_from_s3(s3_url: str):
     """Deletes a resume from S3 given its URL."""
     try:
@@ -194,64 +317,78 @@ def download_resume_from_s3_key(s3_key: str):
         raise
 
 
+TRANSCRIBE_POLL_SECONDS = 5
+
+
+def start_transcription_job(file_key: str) -> str:
+    """Starts an AWS Transcribe job for an audio file in S3 and returns the job name."""
+    job_name = f"transcription-{uuid.uuid4().hex}"  # Unique job name
+    media_format = file_key.split(".")[-1].lower()  # Extract file format (mp3, wav, etc.)
+
+    queue_logger.info(
+        f"[TRANSCRIBE] Starting job: {job_name}, format: {media_format}"
+    )
+    s3_uri = f"s3://{bucket_name}/{file_key}"
+    queue_logger.info(f"Media format: {media_format} from s3 url: {s3_uri}")
+
+    transcribe_client.start_transcription_job(
+        TranscriptionJobName=job_name,
+        Media={"MediaFileUri": s3_uri},
+        MediaFormat=media_format,
+        LanguageCode="en-US",
+        OutputBucketName=bucket_name,  # Store result in S3
+    )
+    return job_name
+
+
+def get_transcription_job_status(job_name: str) -> str:
+    response = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)
+    return response["TranscriptionJob"]["TranscriptionJobStatus"]
+
+
+def fetch_transcript(job_name: str, status: str) -> str:
+    """Reads a finished job's transcript and cleans up the job and its output."""
+    if status != "COMPLETED":
+        queue_logger.warning("[TRANSCRIBE] Transcription failed or incomplete")
+        return ""
+
+    # ✅ Get transcription file from S3
+    transcript_data = s3_client.get_object(
+        Bucket=bucket_name, Key=f"{job_name}.json"
+    )
+    transcript_text = json.loads(
+        transcript_data["Body"].read().decode("utf-8")
+    )["results"]["transcripts"][0]["transcript"]
+
+    # delete the original file if you don't need it anymore:
+    s3_client.delete_object(Bucket=bucket_name, Key=f"{job_name}.json")
+    # ✅ Delete the transcription job from AWS Transcribe
+    transcribe_client.delete_transcription_job(TranscriptionJobName=job_name)
+    queue_logger.info(f"[TRANSCRIBE] Transcription complete: {transcript_text}")
+    return transcript_text
+
+
 def transcribe_audio(file_key: str) -> str:
     """
     Transcribes an audio file stored in S3 using AWS Transcribe.
 
     Args:
-        s3_url (str): The public S3 URL of the audio file.
+        file_key (str): The S3 key of the audio file.
 
     Returns:
         str: Transcription text from AWS Transcribe.
     """
     try:
-        job_name = f"transcription-{int(time.time())}"  # Unique job name
-        media_format = file_key.split(".")[-1].lower()  # Extract file format (mp3, wav, etc.)
-        
-        queue_logger.info(
-            f"[TRANSCRIBE] Starting job: {job_name}, format: {media_format}"
-        )
-        s3_uri = f"s3://{bucket_name}/{file_key}"
-        queue_logger.info(f"Media format: {media_format} from s3 url: {s3_uri}")
-
-        # Start transcription job
-        transcribe_client.start_transcription_job(
-            TranscriptionJobName=job_name,
-            Media={"MediaFileUri": s3_uri},
-            MediaFormat=media_format,
-            LanguageCode="en-US",
-            OutputBucketName=bucket_name,  # Store result in S3
-        )
+        job_name = start_transcription_job(file_key)
 
         # Wait for the transcription job to complete
         while True:
-            response = transcribe_client.get_transcription_job(
-                TranscriptionJobName=job_name
-            )
-            status = response["TranscriptionJob"]["TranscriptionJobStatus"]
-
+            status = get_transcription_job_status(job_name)
             if status in ["COMPLETED", "FAILED"]:
                 break
-            time.sleep(5)  # Poll every 5 seconds
-
-        if status == "COMPLETED":
-            # ✅ Get transcription file from S3
-            transcript_data = s3_client.get_object(
-                Bucket=bucket_name, Key=f"{job_name}.json"
-            )
-            transcript_text = json.loads(
-                transcript_data["Body"].read().decode("utf-8")
-            )["results"]["transcripts"][0]["transcript"]
+            time.sleep(TRANSCRIBE_POLL_SECONDS)
 
-            # delete the original file if you don't need it anymore:
-            s3_client.delete_object(Bucket=bucket_name, Key=f"{job_name}.json")
-            # ✅ Delete the transcription job from AWS Transcribe
-            transcribe_client.delete_transcription_job(TranscriptionJobName=job_name)
-            queue_logger.info(f"[TRANSCRIBE] Transcription complete: {transcript_text}")
-            return transcript_text
-
-        queue_logger.warning("[TRANSCRIBE] Transcription failed or incomplete")
-        return ""
+        return fetch_transcript(job_name, status)
     except Exception as e:
         queue_logger.error(f"[TRANSCRIBE] error: {str(e)}. Returning empty transcription", exc_info=True)
         return ""
@@ -270,6 +407,10 @@ def send_to_mock_interview_queue(payload: dict):
         raise
 
 
+def get_answer_audio_key(user_id: str, session_id: str, filename: str) -> str:
+    return f"{user_id}/mock_interviews/{session_id}/audio/audio_{filename}"
+
+
 def upload_audio_to_s3_sync(
     content: bytes,
     user_id: str,
@@ -277,7 +418,7 @@ def upload_audio_to_s3_sync(
     filename: str,
     content_type: str = "audio/mpeg",
 ) -> str:
-    file_key = f"{user_id}/mock_interviews/{session_id}/audio/audio_{filename}"
+    file_key = get_answer_audio_key(user_id, session_id, filename)
 
     try:
         s3_client.upload_fileobj(
@@ -297,17 +438,24 @@ def upload_audio_to_s3_sync(
         raise
 
 
+def get_mock_interview_data_key(user_id: str, session_id: str, filename: str) -> str:
+    return f"{user_id}/mock_interviews/{session_id}/data/{filename}"
+
+
 def upload_mock_interview_data(
     user_id: str, session_id: str, filename: str, data: dict | list
 ) -> str:
-    file_key = f"{user_id}/mock_interviews/{session_id}/data/{filename}"
+    file_key = get_mock_interview_data_key(user_id, session_id, filename)
     try:
-        s3_client.put_object(
+        body = json.dumps(data)
+        response = s3_client.put_object(
             Bucket=bucket_name,
             Key=file_key,
-            Body=json.dumps(data),
+            Body=body,
             ContentType="application/json",
         )
+        # Write-through: the next read revalidates against the new ETag
+        _cache_json(file_key, response.get("ETag"), body)
         logger.info(f"[MOCK_DATA_UPLOAD] Uploaded mock data: {file_key}")
         return file_key
     except NoCredentialsError:
@@ -318,33 +466,149 @@ def upload_mock_interview_data(
         raise
 
 
+def upload_json_to_s3(file_key: str, data: dict | list) -> str:
+    """Stores `data` as a JSON object at `file_key`."""
+    try:
+        body = json.dumps(data)
+        response = s3_client.put_object(
+            Bucket=bucket_name,
+            Key=file_key,
+            Body=body,
+            ContentType="application/json",
+        )
+        _cache_json(file_key, response.get("ETag"), body)
+        logger.info(f"[S3_JSON_UPLOAD] Uploaded: {file_key}")
+        return file_key
+    except NoCredentialsError:
+        logger.error("[S3_JSON_UPLOAD] AWS credentials not found")
+        raise
+    except Exception as e:
+        logger.error(f"[S3_JSON_UPLOAD] Failed to upload: {e}", exc_info=True)
+        raise
+
+
 def load_json_from_s3(file_key: str) -> dict | list:
     """
-    Downloads and parses a JSON object from an S3 URL.
+    Downloads and parses a JSON object from S3 in a single (conditional) GET.
+
+    A cached copy is revalidated with If-None-Match and reused when S3 answers
+    304 Not Modified. A missing object yields {}; other S3 errors are raised.
 
     Args:
-        s3_url (str): Full S3 URL (e.g., https://bucket-name.s3.amazonaws.com/path/to/file.json)
+        file_key (str): The S3 key of the JSON object.
 
     Returns:
         dict | list: Parsed JSON content.
     """
+    global json_cache_not_modified
 
     if not file_key:
         logger.warning("[LOAD_JSON_S3] Empty file key provided")
         return {}
 
+    cached = json_cache.get(file_key)
+    params = {"Bucket": bucket_name, "Key": file_key}
+    if cached is not None:
+        params["IfNoneMatch"] = cached[0]
+
     try:
-        # ✅ Check if object exists using the file key
         try:
-            s3_client.head_object(Bucket=bucket_name, Key=file_key)
-        except ClientError:
+            obj = s3_client.get_object(**params)
+        except ClientError as e:
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if cached is not None and (status == 304 or e.response["Error"]["Code"] == "304"):
+                json_cache_not_modified += 1
+                logger.info(f"[LOAD_JSON_S3] Not modified, served from cache: {file_key}")
+                return json.loads(cached[1])
+            if e.response["Error"]["Code"] not in S3_NOT_FOUND_CODES:
+                raise  # Throttling, access and server errors are not "missing"
+            json_cache.delete(file_key)
             logger.warning(f"[LOAD_JSON_S3] File not found for key: {file_key}")
             return {}
 
-        obj = s3_client.get_object(Bucket=bucket_name, Key=file_key)
         content = obj["Body"].read().decode("utf-8")
+        _cache_json(file_key, obj.get("ETag"), content)
         logger.info(f"[LOAD_JSON_S3] Successfully fetched: {file_key}")
         return json.loads(content)
     except Exception as e:
         logger.error(f"[LOAD_JSON_S3] Failed to fetch or parse: {e}", exc_info=True)
         raise
+
+
+def json_cache_stats() -> dict:
+    return {**json_cache.stats(), "not_modified": json_cache_not_modified}
+
+
+# Async variants for request handlers and the worker: the blocking boto3 calls
+# run on the bounded storage I/O executor instead of the event loop.
+
+
+async def upload_resume_to_tmp_s3_async(file: UploadFile, user_id: str) -> str:
+    return await storage_executor.run(upload_resume_to_tmp_s3, file, user_id)
+
+
+async def move_s3_object_async(src_key: str, dst_key: str, if_match: str | None = None) -> None:
+    await storage_executor.run(move_s3_object, src_key, dst_key, if_match)
+
+
+async def upload_resume_to_s3_async(file: UploadFile, user_id: str, session_id: str = None):
+    return await storage_executor.run(upload_resume_to_s3, file, user_id, session_id)
+
+
+async def delete_resume_from_s3_async(s3_url: str):
+    await storage_executor.run(delete_resume_from_s3, s3_url)
+
+
+async def download_resume_from_s3_key_async(s3_key: str):
+    return await storage_executor.run(download_resume_from_s3_key, s3_key)
+
+
+async def transcribe_audio_async(file_key: str) -> str:
+    """`transcribe_audio` that polls with asyncio.sleep instead of holding a thread."""
+    try:
+        job_name = await storage_executor.run(start_transcription_job, file_key)
+        while True:
+            status = await storage_executor.run(get_transcription_job_status, job_name)
+            if status in ["COMPLETED", "FAILED"]:
+                break
+            await asyncio.sleep(TRANSCRIBE_POLL_SECONDS)
+        return await storage_executor.run(fetch_transcript, job_name, status)
+    except Exception as e:
+        queue_logger.error(f"[TRANSCRIBE] error: {str(e)}. Returning empty transcription", exc_info=True)
+        return ""
+
+
+async def send_to_mock_interview_queue_async(payload: dict):
+    return await storage_executor.run(send_to_mock_interview_queue, payload)
+
+
+async def upload_audio_to_s3_async(
+    content: bytes,
+    user_id: str,
+    session_id: str,
+    filename: str,
+    content_type: str = "audio/mpeg",
+) -> str:
+    return await storage_executor.run(
+        upload_audio_to_s3_sync, content, user_id, session_id, filename, content_type
+    )
+
+
+async def upload_mock_interview_data_async(
+    user_id: str, session_id: str, filename: str, data: dict | list
+) -> str:
+    return await storage_executor.run(upload_mock_interview_data, user_id, session_id, filename, data)
+
+
+async def upload_json_to_s3_async(file_key: str, data: dict | list) -> str:
+    return await storage_executor.run(upload_json_to_s3, file_key, data)
+
+
+async def load_json_from_s3_async(file_key: str) -> dict | list:
+    return await storage_executor.run(load_json_from_s3, file_key)
+
+
+async def validate_uploaded_object_async(
+    file_key: str, content_types: dict[str, str], max_bytes: int
+) -> dict:
+    return await storage_executor.run(validate_uploaded_object, file_key, content_types, max_bytes)
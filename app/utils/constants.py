@@ -2,17 +2,45 @@ MAX_QUESTIONS_PER_SESSION = 9
 INTRO_QUESTION = "Hello and welcome! It's great to have you here today. I'm Alex, and I'm looking forward to our conversation. To start things off, could you please introduce yourself and share a bit about your career journey? Feel free to include any experiences or achievements that you believe would be important for us to know as we begin the interview."
 GOOGLE_USER_INFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 GOOGLE_TOKEN_INFO_URL = "https://www.googleapis.com/oauth2/v3/tokeninfo"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ID_TOKEN_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+GOOGLE_AUTH_MODE_JWKS = "jwks"
 
 FEATURE_MOCK_INTERVIEW = "mock_interview"
 FEATURE_RESUME_EVAL = "resume_eval"
 FEATURE_RESUME_TAILOR = "resume_tailor"
+# LLM call sites that are not plan-gated features
+FEATURE_INTERVIEW_EVAL = "interview_eval"
+FEATURE_COVER_LETTER = "cover_letter"
 
 FREE_PLAN_CODE = "free"
 
+# Headers for server-sent event responses (disable proxy buffering)
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 MOCK_INTERVIEW_PREV_Q_FILE = "previous_questions.json"
 MOCK_INTERVIEW_PREV_JD_FILE = "job_description.json"
 MOCK_INTERVIEW_LOG_FILE = "interview_log.json"
 MOCK_INTERVIEW_AI_FEEDBACK_FILE = "ai_feedback.json"
+# Interview log awaiting an offline (batch) evaluation
+MOCK_INTERVIEW_PENDING_LOG_FILE = "pending_interview_log.json"
+
+# Content types accepted for direct-to-S3 uploads -> file extension
+RESUME_UPLOAD_CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+    "text/plain": "txt",
+}
+# Extensions must be media formats AWS Transcribe accepts
+ANSWER_AUDIO_CONTENT_TYPES = {
+    "audio/mpeg": "mp3",
+    "audio/mp4": "mp4",
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+    "audio/webm": "webm",
+    "audio/ogg": "ogg",
+    "audio/flac": "flac",
+}
 
 EMAIL_SUB = "📢 Your Mock Interview Results Are Available!"
 EMAIL_BODY = """
@@ -0,0 +1,88 @@
+import hashlib
+import logging
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.aws_utils import load_json_from_s3, move_s3_object, upload_json_to_s3
+from app.utils.cache import TTLCache
+
+logger = logging.getLogger("app")
+
+SIDECAR_SUFFIX = ".extracted.json"
+
+# (sha256, parser version) -> extraction result; ("s3", key, parser version) -> sha256
+_memory = TTLCache(
+    max_size=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+    default_ttl=settings.EXTRACTION_CACHE_TTL_SECONDS,
+)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_sidecar_key(s3_key: str) -> str:
+    """The sidecar lives next to the document, so it shares its lifecycle (e.g. tmp/ expiry)."""
+    return f"{s3_key}{SIDECAR_SUFFIX}"
+
+
+def get_cached(digest: str, parser_version: str) -> Optional[dict]:
+    return _memory.get((digest, parser_version))
+
+
+def store_cached(digest: str, parser_version: str, result: dict) -> None:
+    _memory.set((digest, parser_version), result)
+
+
+def get_cached_for_s3_key(s3_key: str, parser_version: str) -> Optional[dict]:
+    """Looks up the extraction of an S3 document without downloading it: memory, then its sidecar."""
+    digest = _memory.get(("s3", s3_key, parser_version))
+    if digest is not None:
+        result = get_cached(digest, parser_version)
+        if result is not None:
+            logger.info(f"[EXTRACTION_CACHE] Memory hit for {s3_key}")
+            return result
+
+    if not settings.EXTRACTION_SIDECAR_ENABLED:
+        return None
+    try:
+        sidecar = load_json_from_s3(get_sidecar_key(s3_key))
+    except Exception as e:
+        logger.warning(f"[EXTRACTION_CACHE] Could not read sidecar for {s3_key}: {e}")
+        return None
+    if not sidecar or sidecar.get("parser_version") != parser_version:
+        return None
+
+    logger.info(f"[EXTRACTION_CACHE] Sidecar hit for {s3_key}")
+    store_cached(sidecar["sha256"], parser_version, sidecar["result"])
+    _memory.set(("s3", s3_key, parser_version), sidecar["sha256"])
+    return sidecar["result"]
+
+
+def store_for_s3_key(s3_key: str, digest: str, parser_version: str, result: dict) -> None:
+    """Caches the result in memory and writes the sidecar; sidecar failures are only logged."""
+    store_cached(digest, parser_version, result)
+    _memory.set(("s3", s3_key, parser_version), digest)
+    if not settings.EXTRACTION_SIDECAR_ENABLED:
+        return
+    try:
+        upload_json_to_s3(
+            get_sidecar_key(s3_key),
+            {"sha256": digest, "parser_version": parser_version, "result": result},
+        )
+    except Exception as e:
+        logger.warning(f"[EXTRACTION_CACHE] Could not write sidecar for {s3_key}: {e}")
+
+
+def move_sidecar(src_key: str, dst_key: str) -> None:
+    """Moves a document's sidecar along with it (best effort)."""
+    if not settings.EXTRACTION_SIDECAR_ENABLED:
+        return
+    try:
+        move_s3_object(get_sidecar_key(src_key), get_sidecar_key(dst_key))
+    except Exception as e:
+        logger.warning(f"[EXTRACTION_CACHE] Could not move sidecar {src_key} → {dst_key}: {e}")
+
+
+def stats() -> dict:
+    return _memory.stats()
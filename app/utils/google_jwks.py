@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Optional
+
+import httpx
+import jwt
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.utils.constants import (
+    GOOGLE_ID_TOKEN_ISSUERS,
+    GOOGLE_JWKS_URL,
+)
+from app.utils.http_client import get_http_client
+
+logger = logging.getLogger("app")
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+DEFAULT_JWKS_MAX_AGE = 3600
+# Minimum gap between forced refreshes triggered by an unknown `kid`
+MIN_REFRESH_INTERVAL = 60
+
+
+def parse_max_age(cache_control: Optional[str]) -> int:
+    """Extracts max-age (seconds) from a Cache-Control header."""
+    if cache_control:
+        match = MAX_AGE_PATTERN.search(cache_control)
+        if match:
+            return int(match.group(1))
+    return DEFAULT_JWKS_MAX_AGE
+
+
+class GoogleJWKSVerifier:
+    """Verifies Google-signed ID tokens locally against a cached JWKS."""
+
+    def __init__(
+        self,
+        jwks_url: str = GOOGLE_JWKS_URL,
+        audiences: Optional[list[str]] = None,
+        issuers: Optional[list[str]] = None,
+    ):
+        self.jwks_url = jwks_url
+        self.audiences = audiences or []
+        self.issuers = issuers or GOOGLE_ID_TOKEN_ISSUERS
+        self._keys: dict[str, jwt.PyJWK] = {}
+        self._expires_at = 0.0
+        self._last_refresh = 0.0
+        self._lock = asyncio.Lock()
+
+    def load_jwks(self, jwks: dict, max_age: int = DEFAULT_JWKS_MAX_AGE) -> None:
+        """Installs a key set directly (also used to seed locally generated keys)."""
+        key_set = jwt.PyJWKSet.from_dict(jwks)
+        self._keys = {key.key_id: key for key in key_set.keys if key.key_id}
+        now = time.monotonic()
+        self._expires_at = now + max_age
+        self._last_refresh = now
+        logger.info(
+            f"[JWKS] Loaded {len(self._keys)} signing keys (max_age={max_age}s)"
+        )
+
+    async def refresh(self, force: bool = False) -> None:
+        """Fetches the key set if it is stale, honouring Cache-Control max-age."""
+        async with self._lock:
+            now = time.monotonic()
+            if not force and now < self._expires_at:
+                return
+            if force and now - self._last_refresh < MIN_REFRESH_INTERVAL:
+                return
+
+            logger.info(f"[JWKS] Fetching signing keys from {self.jwks_url}")
+            try:
+                response = await get_http_client().get(self.jwks_url)
+                response.raise_for_status()
+            except httpx.HTTPError as e:
+                logger.error(f"[JWKS] Failed to fetch signing keys: {str(e)}")
+                if self._keys:
+                    # Keep serving the previous keys rather than failing every request
+                    return
+                raise HTTPException(
+                    status_code=502, detail="Failed to fetch Google signing keys"
+                )
+
+            self.load_jwks(
+                response.json(), parse_max_age(response.headers.get("cache-control"))
+            )
+
+    async def get_signing_key(self, kid: str) -> jwt.PyJWK:
+        await self.refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            # Google may have rotated keys before our cached copy expired
+            await self.refresh(force=True)
+            key = self._keys.get(kid)
+        if key is None:
+            logger.warning(f"[JWKS] Unknown signing key id: {kid}")
+            raise HTTPException(status_code=403, detail="Invalid token")
+        return key
+
+    async def verify(self, id_token: str) -> dict:
+        """Checks signature, audience, issuer and expiry; returns the token claims."""
+        try:
+            header = jwt.get_unverified_header(id_token)
+        except jwt.PyJWTError as e:
+            logger.warning(f"[JWKS] Malformed ID token: {str(e)}")
+            raise HTTPException(status_code=403, detail="Invalid token")
+
+        signing_key = await self.get_signing_key(header.get("kid"))
+        try:
+            return jwt.decode(
+                id_token,
+                key=signing_key.key,
+                algorithms=["RS256"],
+                audience=self.audiences,
+                issuer=self.issuers,
+                options={"require": ["exp", "iat", "iss", "aud"]},
+            )
+        except jwt.PyJWTError as e:
+            logger.warning(f"[JWKS] ID token verification failed: {str(e)}")
+            raise HTTPException(status_code=403, detail="Invalid token")
+
+
+google_jwks_verifier = GoogleJWKSVerifier(
+    jwks_url=settings.GOOGLE_JWKS_URL or GOOGLE_JWKS_URL,
+    audiences=settings.GOOGLE_CLIENT_IDS,
+)
@@ -0,0 +1,51 @@
+import logging
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            settings.HTTP_READ_TIMEOUT_SECONDS,
+            connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+async def init_http_client() -> httpx.AsyncClient:
+    """Creates the shared keep-alive HTTP client. Called from the app lifespan."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+        logger.info(
+            f"[HTTP_CLIENT] Started shared HTTP client (max_connections={settings.HTTP_MAX_CONNECTIONS})"
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+        logger.info("[HTTP_CLIENT] Closed shared HTTP client")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared HTTP client, creating it lazily outside the app lifespan."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        logger.warning("[HTTP_CLIENT] Shared client not initialised; creating lazily")
+        _http_client = _build_http_client()
+    return _http_client
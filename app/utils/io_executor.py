@@ -0,0 +1,113 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+from app.utils.llm_telemetry import Histogram
+
+logger = logging.getLogger("app")
+
+T = TypeVar("T")
+
+IO_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+
+
+class IOBusyError(Exception):
+    """Raised when the I/O queue is full; callers should shed the request."""
+
+
+class IOExecutor:
+    """Dedicated thread pool for blocking SDK calls (boto3) made from async code.
+
+    At most `max_workers` calls run at once and at most `max_queue` wait;
+    beyond that `run` fails fast with IOBusyError instead of growing an
+    unbounded backlog. Queue wait and call duration are recorded per operation.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_workers)
+        self._pending = 0
+        self.rejected = 0
+        self._operations: dict[str, dict] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f"{self.name}-io"
+            )
+        return self._executor
+
+    def _get_operation(self, operation: str) -> dict:
+        if operation not in self._operations:
+            self._operations[operation] = {
+                "calls": 0,
+                "errors": 0,
+                "queue_wait_seconds": Histogram(IO_BUCKETS),
+                "duration_seconds": Histogram(IO_BUCKETS),
+            }
+        return self._operations[operation]
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Runs the blocking `fn(*args, **kwargs)` on the pool and returns its result."""
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise IOBusyError(f"{self.name} I/O is at capacity; try again shortly")
+
+        stats = self._get_operation(fn.__name__)
+        loop = asyncio.get_running_loop()
+        queued_at = time.perf_counter()
+        self._pending += 1
+        try:
+            async with self._slots:
+                started_at = time.perf_counter()
+                stats["queue_wait_seconds"].observe(started_at - queued_at)
+                stats["calls"] += 1
+                try:
+                    return await loop.run_in_executor(
+                        self._get_executor(), functools.partial(fn, *args, **kwargs)
+                    )
+                except Exception:
+                    stats["errors"] += 1
+                    raise
+                finally:
+                    stats["duration_seconds"].observe(time.perf_counter() - started_at)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            logger.info(f"[IO_EXECUTOR] Shut down {self.name} I/O threads")
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "in_flight": min(self._pending, self.max_workers),
+            "queued": max(self._pending - self.max_workers, 0),
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "operations": {
+                operation: {
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "queue_wait_seconds": stats["queue_wait_seconds"].snapshot(),
+                    "duration_seconds": stats["duration_seconds"].snapshot(),
+                }
+                for operation, stats in sorted(self._operations.items())
+            },
+        }
+
+
+storage_executor = IOExecutor(
+    "storage",
+    max_workers=settings.STORAGE_IO_WORKERS,
+    max_queue=settings.STORAGE_IO_MAX_QUEUE,
+)
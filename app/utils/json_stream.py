@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Optional
+
+logger = logging.getLogger("app")
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Formats a payload as a server-sent event frame."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data)}\n\n"
+
+
+class JSONSectionStreamer:
+    """Incrementally parses a streamed JSON object and emits sections as soon as they complete.
+
+    Each value of the root object is emitted as `(key, value)` once it closes.
+    Root-level arrays are emitted element by element as `(key, element)`, so a
+    long list of suggestions starts arriving before the array is finished.
+    Leading text such as markdown fences is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._expecting: Optional[str] = None  # "key" | "value" | "element"
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._value_depth = 0
+        self._value_kind: Optional[str] = None  # "string" | "container" | "scalar"
+        self.done = False
+
+    def _in_root_array(self) -> bool:
+        return len(self._stack) == 2 and self._stack[1] == "["
+
+    def _expects_tracked_value(self) -> bool:
+        depth = len(self._stack)
+        return (depth == 1 and self._expecting == "value") or (
+            self._in_root_array() and self._expecting == "element"
+        )
+
+    def _start_value(self, index: int, kind: str) -> None:
+        self._value_start = index
+        self._value_depth = len(self._stack)
+        self._value_kind = kind
+        self._expecting = None
+
+    def _finish_value(self, end: int, events: list) -> None:
+        raw = self._buffer[self._value_start : end].strip()
+        self._value_start = None
+        self._value_kind = None
+        try:
+            events.append((self._key, json.loads(raw)))
+        except json.JSONDecodeError:
+            logger.warning(f"[JSON_STREAM] Skipping unparsable section: {self._key}")
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Consumes a chunk of text and returns the sections completed by it."""
+        events: list[tuple[str, Any]] = []
+        self._buffer += chunk
+
+        while self._pos < len(self._buffer) and not self.done:
+            index = self._pos
+            char = self._buffer[index]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        self._key = json.loads(self._buffer[self._string_start : index + 1])
+                    elif (
+                        self._value_kind == "string"
+                        and self._value_depth == len(self._stack)
+                    ):
+                        self._finish_value(index + 1, events)
+                continue
+
+            if not self._stack:
+                if char == "{":
+                    self._stack.append(char)
+                    self._expecting = "key"
+                continue
+
+            if char.isspace():
+                continue
+
+            if (
+                self._value_kind == "scalar"
+                and char in ",}]"
+                and self._value_depth == len(self._stack)
+            ):
+                self._finish_value(index, events)
+
+            depth = len(self._stack)
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+                self._string_is_key = depth == 1 and self._expecting == "key"
+                if self._string_is_key:
+                    self._expecting = None
+                elif self._expects_tracked_value():
+                    self._start_value(index, "string")
+            elif char in "{[":
+                if depth == 1 and self._expecting == "value" and char == "[":
+                    # Root-level array: emit its elements individually
+                    self._stack.append(char)
+                    self._expecting = "element"
+                    continue
+                if self._expects_tracked_value():
+                    self._start_value(index, "container")
+                self._stack.append(char)
+            elif char in "}]":
+                self._stack.pop()
+                if (
+                    self._value_kind == "container"
+                    and self._value_depth == len(self._stack)
+                ):
+                    self._finish_value(index + 1, events)
+                if not self._stack:
+                    self.done = True
+            elif char == ":":
+                if depth == 1:
+                    self._expecting = "value"
+            elif char == ",":
+                if depth == 1:
+                    self._expecting = "key"
+                elif self._in_root_array():
+                    self._expecting = "element"
+            elif self._expects_tracked_value():
+                self._start_value(index, "scalar")
+
+        return events
+
+    @property
+    def text(self) -> str:
+        """Everything received so far."""
+        return self._buffer
+
+
+async def iter_text_chunks(text: str, chunk_size: int = 64) -> AsyncIterator[str]:
+    """Replays a complete text as a stream (used for cached and mock responses)."""
+    for start in range(0, len(text), chunk_size):
+        yield text[start : start + chunk_size]
+        await asyncio.sleep(0)
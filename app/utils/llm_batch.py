@@ -0,0 +1,292 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import settings
+from app.utils.io_executor import storage_executor
+from app.utils.openai_client import get_async_openai_client
+from app.utils.prompt_builder import Prompt, to_messages
+
+logger = logging.getLogger("sqs")
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_BATCH_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchResult:
+    custom_id: str
+    content: Optional[str] = None
+    error: Optional[str] = None
+
+
+def _write_text(path: str, text: str) -> None:
+    # Write-then-rename so a crash never leaves a half-written file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: str, data) -> None:
+    _write_text(path, json.dumps(data))
+
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def _read_jsonl(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _to_jsonl(lines: list[dict]) -> str:
+    return "\n".join(json.dumps(line) for line in lines) + "\n"
+
+
+class OpenAIBatchBackend:
+    """Submits JSONL request files to the OpenAI Batch API."""
+
+    async def submit(self, lines: list[dict]) -> str:
+        client = get_async_openai_client()
+        input_file = await client.files.create(
+            file=("batch_input.jsonl", _to_jsonl(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=settings.LLM_BATCH_COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    async def retrieve(self, batch_id: str) -> tuple[str, Optional[list[dict]]]:
+        """Returns the batch status and, once terminal, its output/error lines."""
+        client = get_async_openai_client()
+        batch = await client.batches.retrieve(batch_id)
+        if batch.status not in TERMINAL_BATCH_STATUSES:
+            return batch.status, None
+
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await client.files.content(file_id)
+                lines.extend(_read_jsonl(content.text))
+        return batch.status, lines
+
+
+class LocalBatchBackend:
+    """File-based stand-in for the Batch API.
+
+    Input and output files use the Batch API's JSONL formats. A batch is
+    completed on the first poll after `delay_seconds` by sending each request
+    through the regular chat completions client (point OPENAI_BASE_URL at a
+    stub to keep it fully offline).
+    """
+
+    def __init__(self, directory: str, delay_seconds: float):
+        self.directory = directory
+        self.delay_seconds = delay_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, batch_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{batch_id}.{suffix}")
+
+    def _write_batch(self, batch_id: str, lines: list[dict]) -> None:
+        _write_text(self._path(batch_id, "input.jsonl"), _to_jsonl(lines))
+        _write_json(
+            self._path(batch_id, "meta.json"),
+            {"status": "in_progress", "created_at": time.time()},
+        )
+
+    async def submit(self, lines: list[dict]) -> str:
+        batch_id = f"local_batch_{uuid.uuid4().hex}"
+        await storage_executor.run(self._write_batch, batch_id, lines)
+        return batch_id
+
+    async def _run(self, batch_id: str) -> list[dict]:
+        requests = _read_jsonl(
+            await storage_executor.run(_read_text, self._path(batch_id, "input.jsonl"))
+        )
+
+        client = get_async_openai_client()
+        outputs = []
+        for index, request in enumerate(requests):
+            line = {"id": f"batch_req_{index}", "custom_id": request["custom_id"]}
+            try:
+                completion = await client.chat.completions.create(**request["body"])
+                line.update(
+                    response={"status_code": 200, "body": completion.model_dump()},
+                    error=None,
+                )
+            except Exception as e:
+                line.update(response=None, error={"code": "request_failed", "message": str(e)})
+            outputs.append(line)
+        return outputs
+
+    async def retrieve(self, batch_id: str) -> tuple[str, Optional[list[dict]]]:
+        meta_path = self._path(batch_id, "meta.json")
+        output_path = self._path(batch_id, "output.jsonl")
+        meta = json.loads(await storage_executor.run(_read_text, meta_path))
+
+        if meta["status"] != "completed":
+            if time.time() - meta["created_at"] < self.delay_seconds:
+                return meta["status"], None
+            outputs = await self._run(batch_id)
+            await storage_executor.run(_write_text, output_path, _to_jsonl(outputs))
+            meta["status"] = "completed"
+            await storage_executor.run(_write_json, meta_path, meta)
+            return "completed", outputs
+
+        return "completed", _read_jsonl(await storage_executor.run(_read_text, output_path))
+
+
+def _parse_output_line(line: dict) -> BatchResult:
+    custom_id = line.get("custom_id", "")
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code") != 200:
+        error = line.get("error") or (response.get("body") or {}).get("error") or {}
+        message = error.get("message") if isinstance(error, dict) else str(error)
+        return BatchResult(custom_id, error=message or "Batch request failed")
+    try:
+        content = response["body"]["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        return BatchResult(custom_id, error="Malformed batch response body")
+    return BatchResult(custom_id, content=content)
+
+
+class LLMBatchQueue:
+    """Accumulates chat completion requests and runs them as batch jobs.
+
+    Pending requests and in-flight batch ids are kept in a JSON state file so a
+    worker restart neither drops queued prompts nor loses track of submitted
+    batches. Meant to be driven from a single event loop (the SQS worker).
+    """
+
+    def __init__(self, backend, state_path: str, max_requests: int, flush_seconds: float):
+        self.backend = backend
+        self.state_path = state_path
+        self.max_requests = max_requests
+        self.flush_seconds = flush_seconds
+        directory = os.path.dirname(state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._state = {"pending": [], "oldest_pending_at": None, "submitted": {}}
+        if os.path.exists(state_path):
+            self._state.update(json.loads(_read_text(state_path)))
+        self._save_lock = asyncio.Lock()
+
+    async def _save(self) -> None:
+        # Snapshot on the loop so the writer thread never sees a dict being mutated;
+        # the lock keeps writes in snapshot order
+        text = json.dumps(self._state)
+        async with self._save_lock:
+            await storage_executor.run(_write_text, self.state_path, text)
+
+    async def enqueue(
+        self,
+        custom_id: str,
+        prompt: Prompt,
+        model: str,
+        response_format: Optional[dict] = None,
+    ) -> None:
+        body = {
+            "model": model,
+            "messages": to_messages(prompt),
+        }
+        if response_format:
+            body["response_format"] = response_format
+        self._state["pending"].append(
+            {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+        )
+        if self._state["oldest_pending_at"] is None:
+            self._state["oldest_pending_at"] = time.time()
+        await self._save()
+        logger.info(
+            f"[LLM_BATCH] Queued {custom_id} ({len(self._state['pending'])} pending)"
+        )
+
+    async def flush(self, force: bool = False) -> Optional[str]:
+        """Submits pending requests once the batch is full or the oldest has waited long enough."""
+        pending = self._state["pending"]
+        if not pending:
+            return None
+        waited = time.time() - (self._state["oldest_pending_at"] or time.time())
+        if not force and len(pending) < self.max_requests and waited < self.flush_seconds:
+            return None
+
+        lines = pending[: self.max_requests]
+        batch_id = await self.backend.submit(lines)
+        self._state["submitted"][batch_id] = {
+            "custom_ids": [line["custom_id"] for line in lines],
+            "submitted_at": time.time(),
+        }
+        self._state["pending"] = pending[len(lines) :]
+        self._state["oldest_pending_at"] = time.time() if self._state["pending"] else None
+        await self._save()
+        logger.info(f"[LLM_BATCH] Submitted batch {batch_id} with {len(lines)} requests")
+        return batch_id
+
+    async def poll(self, handler: Callable[[BatchResult], Awaitable[None]]) -> int:
+        """Hands every result of finished batches to `handler`; returns how many were handled.
+
+        A batch is forgotten only after all of its results were handled, so a
+        crash mid-way replays it on the next poll.
+        """
+        handled = 0
+        for batch_id, info in list(self._state["submitted"].items()):
+            status, lines = await self.backend.retrieve(batch_id)
+            if lines is None:
+                logger.debug(f"[LLM_BATCH] Batch {batch_id} is {status}")
+                continue
+
+            results = {line.get("custom_id"): _parse_output_line(line) for line in lines}
+            logger.info(
+                f"[LLM_BATCH] Batch {batch_id} {status}: {len(results)}/{len(info['custom_ids'])} results"
+            )
+            for custom_id in info["custom_ids"]:
+                result = results.get(custom_id) or BatchResult(
+                    custom_id, error=f"No result (batch {status})"
+                )
+                await handler(result)
+                handled += 1
+
+            del self._state["submitted"][batch_id]
+            await self._save()
+        return handled
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._state["pending"]),
+            "submitted_batches": len(self._state["submitted"]),
+        }
+
+
+_interview_eval_batch: Optional[LLMBatchQueue] = None
+
+
+def get_interview_eval_batch() -> LLMBatchQueue:
+    """Returns the batch queue used for offline interview evaluation."""
+    global _interview_eval_batch
+    if _interview_eval_batch is None:
+        if settings.LLM_BATCH_BACKEND == "local":
+            backend = LocalBatchBackend(
+                os.path.join(settings.LLM_BATCH_STATE_DIR, "local"),
+                settings.LLM_BATCH_LOCAL_DELAY_SECONDS,
+            )
+        else:
+            backend = OpenAIBatchBackend()
+        logger.info(f"[LLM_BATCH] Using {settings.LLM_BATCH_BACKEND} batch backend")
+        _interview_eval_batch = LLMBatchQueue(
+            backend,
+            os.path.join(settings.LLM_BATCH_STATE_DIR, "interview_eval_state.json"),
+            max_requests=settings.LLM_BATCH_MAX_REQUESTS,
+            flush_seconds=settings.LLM_BATCH_FLUSH_SECONDS,
+        )
+    return _interview_eval_batch
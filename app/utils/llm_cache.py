@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from app.core.config import settings
+from app.utils.cache import TTLCache
+from app.utils.io_executor import storage_executor
+from app.utils.llm_routing import get_model_route
+from app.utils.openai_client import call_openai_async
+from app.utils.prompt_builder import Prompt
+
+logger = logging.getLogger("app")
+
+
+def build_cache_key(model: str, template_version: str, prompt: Prompt) -> str:
+    """Content address of an LLM request: hash of model, prompt template version and rendered prompt."""
+    payload = json.dumps(
+        {"model": model, "template_version": template_version, "prompt": str(prompt)},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryLLMCache:
+    """In-process LRU backend."""
+
+    # Cheap enough to call on the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int):
+        self._cache = TTLCache(max_size=max_entries, default_ttl=float("inf"))
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class SQLiteLLMCache:
+    """On-disk backend shared by every process on the host (API workers and SQS worker).
+
+    Calls block (file locks, commits), so async code runs them on the storage
+    I/O executor. Reads never write: LRU access times are collected in memory
+    and written in one batch with the next store, or every TOUCH_BATCH_SIZE hits.
+    """
+
+    blocking = True
+    TOUCH_BATCH_SIZE = 256
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: dict[str, float] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)"
+        )
+        self._conn.commit()
+
+    def _flush_touched(self) -> None:
+        # Caller holds the lock and commits
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                # Expired rows are purged by the next set()
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[key] = now
+            if len(self._touched) >= self.TOUCH_BATCH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._flush_touched()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            # Evict least recently used rows beyond the size bound
+            self._conn.execute(
+                """
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "max_size": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+def _build_backend():
+    if settings.LLM_CACHE_BACKEND == "sqlite":
+        logger.info(f"[LLM_CACHE] Using SQLite backend at {settings.LLM_CACHE_SQLITE_PATH}")
+        return SQLiteLLMCache(settings.LLM_CACHE_SQLITE_PATH, settings.LLM_CACHE_MAX_ENTRIES)
+    logger.info("[LLM_CACHE] Using in-memory backend")
+    return MemoryLLMCache(settings.LLM_CACHE_MAX_ENTRIES)
+
+
+llm_cache = _build_backend()
+
+
+def is_cache_enabled(feature: str) -> bool:
+    return settings.LLM_CACHE_ENABLED and settings.LLM_CACHE_TTLS.get(feature, 0) > 0
+
+
+async def _run_backend(fn: Callable, *args):
+    if llm_cache.blocking:
+        return await storage_executor.run(fn, *args)
+    return fn(*args)
+
+
+async def get_cached_response(
+    prompt: Prompt, feature: str, template_version: str
+) -> Optional[str]:
+    """Looks up a cached completion; returns None on a miss or when caching is off."""
+    if not is_cache_enabled(feature):
+        return None
+    model = get_model_route(feature).primary_model
+    cached = await _run_backend(llm_cache.get, build_cache_key(model, template_version, prompt))
+    logger.info(
+        f"[LLM_CACHE] Cache {'hit' if cached is not None else 'miss'} for feature: {feature}"
+    )
+    return cached
+
+
+async def store_cached_response(
+    prompt: Prompt, feature: str, template_version: str, response: str, model: str
+) -> None:
+    """Caches a completion under the model that produced it.
+
+    Lookups only ever ask for the primary model, so fallback responses are not
+    stored: a weaker model's answer must not be replayed as the primary's.
+    """
+    if not is_cache_enabled(feature) or not response:
+        return
+    if model != get_model_route(feature).primary_model:
+        logger.info(f"[LLM_CACHE] Not caching {feature} response served by fallback {model}")
+        return
+    await _run_backend(
+        llm_cache.set,
+        build_cache_key(model, template_version, prompt),
+        response,
+        settings.LLM_CACHE_TTLS[feature],
+    )
+
+
+async def cached_call_openai(
+    prompt: Prompt,
+    feature: str,
+    template_version: str,
+    bypass_cache: bool = False,
+    is_cacheable: Optional[Callable[[str], bool]] = None,
+    response_format: Optional[dict] = None,
+    on_model: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Returns a cached completion for an identical request, calling OpenAI on a miss.
+
+    `bypass_cache` forces a fresh completion (which still refreshes the cache);
+    `is_cacheable` lets callers refuse to store unusable responses. `on_model`
+    is told which model the returned completion came from.
+    """
+    if bypass_cache:
+        logger.info(f"[LLM_CACHE] Cache bypassed for feature: {feature}")
+    else:
+        cached = await get_cached_response(prompt, feature, template_version)
+        if cached is not None:
+            if on_model:
+                on_model(get_model_route(feature).primary_model)
+            return cached
+
+    served_models = []
+    response = await call_openai_async(
+        prompt, feature=feature, response_format=response_format, on_model=served_models.append
+    )
+    if on_model:
+        on_model(served_models[0])
+    if is_cacheable is None or is_cacheable(response):
+        await store_cached_response(
+            prompt, feature, template_version, response, served_models[0]
+        )
+    return response
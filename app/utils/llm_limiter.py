@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.prompt_builder import Prompt, count_tokens
+
+logger = logging.getLogger("app")
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+PRIORITY_LANES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+
+def estimate_tokens(prompt: Prompt) -> int:
+    """Request size used for admission: prompt tokens (prefix included) plus expected completion."""
+    return count_tokens(str(prompt)) + settings.LLM_ESTIMATED_COMPLETION_TOKENS
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `per_minute` units."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Corrects a previous estimate; positive delta consumes more."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+@dataclass
+class AdmissionTicket:
+    priority: int
+    estimated_tokens: int
+    queue_wait: float = 0.0
+    actual_tokens: Optional[int] = None
+
+
+class LLMAdmissionController:
+    """Admits LLM calls under request/token-per-minute budgets and a concurrency cap.
+
+    Waiting calls are served strictly by priority lane, then arrival order, so
+    interactive requests overtake queued background evaluations.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int, tokens_per_minute: int):
+        self.max_concurrency = max_concurrency
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._in_flight = 0
+        self._waiters: list[tuple[int, int, AdmissionTicket, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lane_stats = {
+            lane: {"admitted": 0, "total_wait": 0.0, "max_wait": 0.0, "last_wait": 0.0}
+            for lane in PRIORITY_LANES.values()
+        }
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while self._waiters and self._in_flight < self.max_concurrency:
+            _, _, ticket, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            delay = max(
+                self._requests.time_until(1),
+                self._tokens.time_until(ticket.estimated_tokens),
+            )
+            if delay > 0:
+                # Head of the queue waits for budget; later arrivals don't jump it
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self._requests.consume(1)
+            self._tokens.consume(ticket.estimated_tokens)
+            self._in_flight += 1
+            future.set_result(None)
+
+    def _record_wait(self, ticket: AdmissionTicket) -> None:
+        lane = self._lane_stats[PRIORITY_LANES.get(ticket.priority, "background")]
+        lane["admitted"] += 1
+        lane["total_wait"] += ticket.queue_wait
+        lane["max_wait"] = max(lane["max_wait"], ticket.queue_wait)
+        lane["last_wait"] = ticket.queue_wait
+        if ticket.queue_wait >= settings.LLM_QUEUE_WAIT_WARN_SECONDS:
+            logger.warning(
+                f"[LLM_ADMISSION] Saturated: waited {ticket.queue_wait:.2f}s in "
+                f"{PRIORITY_LANES.get(ticket.priority)} lane (in_flight={self._in_flight}, queued={len(self._waiters)})"
+            )
+
+    async def _acquire(self, ticket: AdmissionTicket) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (ticket.priority, next(self._sequence), ticket, future))
+        started = time.monotonic()
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller gave up; hand the slot back
+                self._release(ticket)
+            raise
+        ticket.queue_wait = time.monotonic() - started
+        self._record_wait(ticket)
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        self._in_flight -= 1
+        if ticket.actual_tokens is not None:
+            self._tokens.adjust(ticket.actual_tokens - ticket.estimated_tokens)
+        if self._timer is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def admit(self, priority: int = PRIORITY_INTERACTIVE, estimated_tokens: int = 0):
+        """Waits for a slot and budget; set `ticket.actual_tokens` to reconcile the estimate."""
+        ticket = AdmissionTicket(priority=priority, estimated_tokens=estimated_tokens)
+        await self._acquire(ticket)
+        try:
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def has_spare_capacity(self) -> bool:
+        """True when nothing is queued and a concurrency slot is free."""
+        return self._in_flight < self.max_concurrency and not any(
+            not future.done() for _, _, _, future in self._waiters
+        )
+
+    def stats(self) -> dict:
+        """Current saturation and per-lane queue-wait figures."""
+        queued = {lane: 0 for lane in PRIORITY_LANES.values()}
+        for priority, _, _, future in self._waiters:
+            if not future.done():
+                queued[PRIORITY_LANES.get(priority, "background")] += 1
+        lanes = {}
+        for lane, values in self._lane_stats.items():
+            admitted = values["admitted"]
+            lanes[lane] = {
+                "queued": queued[lane],
+                "admitted": admitted,
+                "avg_wait_seconds": round(values["total_wait"] / admitted, 4) if admitted else 0.0,
+                "max_wait_seconds": round(values["max_wait"], 4),
+                "last_wait_seconds": round(values["last_wait"], 4),
+            }
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "requests_available": round(self._requests.tokens, 2),
+            "tokens_available": round(self._tokens.tokens, 2),
+            "lanes": lanes,
+        }
+
+
+llm_admission = LLMAdmissionController(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+)
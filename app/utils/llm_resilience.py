@@ -0,0 +1,225 @@
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from app.core.config import settings
+from app.utils.constants import (
+    FEATURE_COVER_LETTER,
+    FEATURE_INTERVIEW_EVAL,
+    FEATURE_MOCK_INTERVIEW,
+    FEATURE_RESUME_EVAL,
+    FEATURE_RESUME_TAILOR,
+)
+
+logger = logging.getLogger("app")
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# Samples needed before the observed p95 is trusted as the hedge delay
+MIN_LATENCY_SAMPLES = 20
+
+
+class LLMDeadlineExceeded(Exception):
+    """Raised when a call (including retries) runs past its feature deadline."""
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    deadline_seconds: float = 120.0
+    max_retries: int = 2
+    base_backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 20.0
+    hedge: bool = False
+    hedge_min_delay_seconds: float = 3.0
+
+
+DEFAULT_CALL_POLICY = CallPolicy()
+CALL_POLICIES = {
+    FEATURE_RESUME_EVAL: CallPolicy(deadline_seconds=90.0),
+    FEATURE_RESUME_TAILOR: CallPolicy(deadline_seconds=120.0),
+    FEATURE_MOCK_INTERVIEW: CallPolicy(deadline_seconds=60.0, hedge=True),
+    FEATURE_COVER_LETTER: CallPolicy(deadline_seconds=60.0),
+    # Background work: generous deadline, more patient retries
+    FEATURE_INTERVIEW_EVAL: CallPolicy(
+        deadline_seconds=300.0, max_retries=4, max_backoff_seconds=60.0
+    ),
+}
+
+
+def get_call_policy(feature: Optional[str]) -> CallPolicy:
+    """Returns the policy for a call site, with LLM_CALL_POLICIES overrides applied."""
+    policy = CALL_POLICIES.get(feature, DEFAULT_CALL_POLICY)
+    overrides = settings.LLM_CALL_POLICIES.get(feature)
+    if overrides:
+        policy = replace(policy, **overrides)
+    return policy
+
+
+class LatencyTracker:
+    """Keeps recent successful latencies per feature to derive hedge delays."""
+
+    def __init__(self, window: int = 200):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, feature: Optional[str], seconds: float) -> None:
+        self._samples[feature].append(seconds)
+
+    def p95(self, feature: Optional[str]) -> Optional[float]:
+        samples = self._samples.get(feature)
+        if not samples or len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+
+latency_tracker = LatencyTracker()
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """Reads Retry-After (seconds or HTTP date) / retry-after-ms from an API error."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def get_backoff_delay(error: Exception, attempt: int, policy: CallPolicy) -> float:
+    """Server-provided Retry-After if present, else exponential backoff with full jitter."""
+    retry_after = get_retry_after(error)
+    if retry_after is not None:
+        return min(retry_after, policy.max_backoff_seconds)
+    ceiling = min(policy.max_backoff_seconds, policy.base_backoff_seconds * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+async def _run_hedged(
+    feature: Optional[str],
+    attempt_fn: Callable[[], Awaitable[T]],
+    policy: CallPolicy,
+    can_hedge: Callable[[], bool],
+    on_hedge: Optional[Callable[[], None]] = None,
+    on_discard: Optional[Callable[[Optional[T]], None]] = None,
+) -> T:
+    """Runs one attempt, firing a duplicate after the p95 delay; the first success wins.
+
+    Once an attempt has won, `on_discard` gets each losing attempt's result, or
+    None for one cancelled before it returned. Attempts cancelled without a
+    winner (e.g. by the outer deadline) are not discards.
+    """
+    started = time.monotonic()
+    primary = asyncio.ensure_future(attempt_fn())
+    tasks = {primary}
+    winner = None
+    try:
+        if policy.hedge:
+            delay = max(latency_tracker.p95(feature) or 0.0, policy.hedge_min_delay_seconds)
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and can_hedge():
+                logger.info(f"[LLM_RESILIENCE] Hedging {feature} call after {delay:.2f}s")
+                tasks.add(asyncio.ensure_future(attempt_fn()))
+                if on_hedge:
+                    on_hedge()
+
+        last_error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            succeeded = [task for task in done if task.exception() is None]
+            if succeeded:
+                latency_tracker.record(feature, time.monotonic() - started)
+                # Both attempts may finish together; the other one was still paid for
+                winner = succeeded[0]
+                for task in succeeded[1:]:
+                    if on_discard:
+                        on_discard(task.result())
+                return winner.result()
+            last_error = done.pop().exception()
+        raise last_error
+    finally:
+        for task in tasks:
+            task.cancel()
+            if winner is not None and on_discard:
+                on_discard(None)
+
+
+async def run_with_resilience(
+    feature: Optional[str],
+    attempt_fn: Callable[[], Awaitable[T]],
+    allow_hedge: bool = True,
+    can_hedge: Callable[[], bool] = lambda: True,
+    on_retry: Optional[Callable[[int, Exception], None]] = None,
+    on_hedge: Optional[Callable[[], None]] = None,
+    on_discard: Optional[Callable[[Optional[T]], None]] = None,
+    deadline: Optional[float] = None,
+) -> T:
+    """Runs `attempt_fn` under the feature's deadline, retrying transient failures.
+
+    Retries back off exponentially with jitter and honour Retry-After. Hedging
+    (if enabled for the feature) applies per attempt and only when `can_hedge()`.
+    `on_retry` / `on_hedge` / `on_discard` let callers count retries, hedges
+    and losing hedged attempts for telemetry.
+    `deadline` (a `time.monotonic()` instant) replaces the policy's own, e.g.
+    when a model fallback shares one budget (see app.utils.llm_routing).
+    """
+    policy = get_call_policy(feature)
+    if not allow_hedge:
+        policy = replace(policy, hedge=False)
+    started = time.monotonic()
+    if deadline is None:
+        deadline = started + policy.deadline_seconds
+    budget = deadline - started
+    attempt = 0
+
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            return await asyncio.wait_for(
+                _run_hedged(feature, attempt_fn, policy, can_hedge, on_hedge, on_discard),
+                timeout=remaining,
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"[LLM_RESILIENCE] {feature} call exceeded its {budget:.1f}s deadline")
+            raise LLMDeadlineExceeded(f"{feature} call exceeded {budget:.1f}s deadline")
+        except Exception as e:
+            if not is_retryable(e) or attempt >= policy.max_retries:
+                raise
+            delay = get_backoff_delay(e, attempt, policy)
+            if time.monotonic() + delay >= deadline:
+                logger.warning(
+                    f"[LLM_RESILIENCE] Not retrying {feature}: backoff would pass the deadline"
+                )
+                raise
+            attempt += 1
+            if on_retry:
+                on_retry(attempt, e)
+            logger.warning(
+                f"[LLM_RESILIENCE] Retry {attempt}/{policy.max_retries} for {feature} in {delay:.2f}s after: {str(e)}"
+            )
+            await asyncio.sleep(delay)
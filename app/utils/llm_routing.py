@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from app.core.config import settings
+from app.utils.constants import (
+    FEATURE_COVER_LETTER,
+    FEATURE_INTERVIEW_EVAL,
+    FEATURE_MOCK_INTERVIEW,
+    FEATURE_RESUME_EVAL,
+    FEATURE_RESUME_TAILOR,
+)
+from app.utils.llm_resilience import LLMDeadlineExceeded, get_call_policy
+
+logger = logging.getLogger("app")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Primary model for a call site, plus the model used when it errors or runs past its budget."""
+
+    primary_model: str
+    primary_timeout_seconds: Optional[float] = None
+    fallback_model: Optional[str] = None
+    fallback_timeout_seconds: Optional[float] = None
+
+
+DEFAULT_MODEL_ROUTE = ModelRoute(primary_model=settings.OPENAI_MODEL)
+MODEL_ROUTES = {
+    FEATURE_RESUME_EVAL: ModelRoute(
+        primary_model=settings.OPENAI_MODEL,
+        primary_timeout_seconds=60.0,
+        fallback_model=settings.OPENAI_FALLBACK_MODEL,
+        fallback_timeout_seconds=45.0,
+    ),
+    FEATURE_RESUME_TAILOR: ModelRoute(
+        primary_model=settings.OPENAI_MODEL,
+        primary_timeout_seconds=90.0,
+        fallback_model=settings.OPENAI_FALLBACK_MODEL,
+        fallback_timeout_seconds=60.0,
+    ),
+    # Short structured task: the small model is fast enough, the large one backs it up
+    FEATURE_MOCK_INTERVIEW: ModelRoute(
+        primary_model=settings.OPENAI_FALLBACK_MODEL,
+        primary_timeout_seconds=20.0,
+        fallback_model=settings.OPENAI_MODEL,
+        fallback_timeout_seconds=40.0,
+    ),
+    FEATURE_COVER_LETTER: ModelRoute(
+        primary_model=settings.OPENAI_MODEL,
+        primary_timeout_seconds=45.0,
+        fallback_model=settings.OPENAI_FALLBACK_MODEL,
+        fallback_timeout_seconds=30.0,
+    ),
+    # Background evaluation favours quality over latency; no fallback
+    FEATURE_INTERVIEW_EVAL: ModelRoute(primary_model=settings.OPENAI_MODEL),
+}
+
+
+def get_model_route(feature: Optional[str]) -> ModelRoute:
+    """Returns the route for a call site, with LLM_MODEL_ROUTES overrides applied."""
+    route = MODEL_ROUTES.get(feature, DEFAULT_MODEL_ROUTE)
+    overrides = settings.LLM_MODEL_ROUTES.get(feature)
+    if overrides:
+        route = replace(route, **overrides)
+    return route
+
+
+def should_fall_back(error: Exception) -> bool:
+    """Timeouts, rate limits and server errors; a 4xx would fail the same way on any model."""
+    if isinstance(error, (LLMDeadlineExceeded, asyncio.TimeoutError, openai.APITimeoutError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _budget(deadline: float, timeout: Optional[float]) -> float:
+    return deadline if timeout is None else min(deadline, time.monotonic() + timeout)
+
+
+async def run_with_fallback(
+    feature: Optional[str], call_fn: Callable[[str, float], Awaitable[T]]
+) -> tuple[T, str]:
+    """Runs `call_fn(model, deadline)` on the primary model, then on the fallback if that fails or is too slow.
+
+    The feature's call deadline bounds both models together: the primary gets
+    at most `primary_timeout_seconds` of it and the fallback only what is left.
+    `deadline` is a `time.monotonic()` instant for `run_with_resilience`.
+    Returns the result together with the model that served it.
+    """
+    route = get_model_route(feature)
+    deadline = time.monotonic() + get_call_policy(feature).deadline_seconds
+    try:
+        result = await call_fn(route.primary_model, _budget(deadline, route.primary_timeout_seconds))
+        return result, route.primary_model
+    except Exception as e:
+        remaining = deadline - time.monotonic()
+        if not route.fallback_model or not should_fall_back(e) or remaining <= 0:
+            raise
+        logger.warning(
+            f"[LLM_ROUTING] {feature} primary model {route.primary_model} failed: {str(e)}; "
+            f"falling back to {route.fallback_model} with {remaining:.1f}s left"
+        )
+
+    result = await call_fn(route.fallback_model, _budget(deadline, route.fallback_timeout_seconds))
+    return result, route.fallback_model
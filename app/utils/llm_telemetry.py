@@ -0,0 +1,297 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+# USD per 1M tokens; LLM_MODEL_PRICES overrides or extends these.
+# "cached_input" applies to prompt tokens served from the provider's prefix cache.
+DEFAULT_MODEL_PRICES = {
+    "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4o": {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4.1-mini": {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+    "gpt-4.1": {"input": 2.00, "cached_input": 0.50, "output": 8.00},
+}
+
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+TTFT_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+
+def get_model_price(model: str) -> Optional[dict]:
+    """Looks up a price by exact name, then by longest prefix (dated snapshots like gpt-4o-2024-08-06)."""
+    prices = {**DEFAULT_MODEL_PRICES, **settings.LLM_MODEL_PRICES}
+    if model in prices:
+        return prices[model]
+    matches = [name for name in prices if model.startswith(name)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> float:
+    price = get_model_price(model or "")
+    if price is None:
+        return 0.0
+    cached_price = price.get("cached_input", price["input"])
+    return (
+        (prompt_tokens - cached_tokens) * price["input"]
+        + cached_tokens * cached_price
+        + completion_tokens * price["output"]
+    ) / 1_000_000
+
+
+@dataclass
+class LLMCallRecord:
+    """What happened during one LLM call; filled in by the caller as it goes."""
+
+    feature: str
+    model: str
+    streaming: bool = False
+    status: str = "ok"
+    error_type: Optional[str] = None
+    wall_seconds: float = 0.0
+    ttft_seconds: Optional[float] = None
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    retries: int = 0
+    hedged: bool = False
+    fallback: bool = False
+    # Losing hedged attempts; tokens only when the provider returned usage before cancellation
+    discarded_attempts: int = 0
+    discarded_prompt_tokens: int = 0
+    discarded_completion_tokens: int = 0
+    discarded_cost_usd: float = 0.0
+    cost_usd: float = 0.0
+    started: float = field(default_factory=time.monotonic, repr=False)
+
+    def mark_first_token(self) -> None:
+        if self.ttft_seconds is None:
+            self.ttft_seconds = time.monotonic() - self.started
+
+    def count_retry(self) -> None:
+        self.retries += 1
+
+    def mark_hedged(self) -> None:
+        self.hedged = True
+
+    def add_discarded(self, model: str, usage=None) -> None:
+        self.discarded_attempts += 1
+        if usage is not None:
+            prompt_tokens = usage.prompt_tokens or 0
+            completion_tokens = usage.completion_tokens or 0
+            self.discarded_prompt_tokens += prompt_tokens
+            self.discarded_completion_tokens += completion_tokens
+            self.discarded_cost_usd += estimate_cost(model, prompt_tokens, completion_tokens)
+
+    def set_usage(self, usage) -> None:
+        if usage is not None:
+            self.prompt_tokens = usage.prompt_tokens or 0
+            self.completion_tokens = usage.completion_tokens or 0
+            # Prompt tokens the provider served from its prefix cache
+            details = getattr(usage, "prompt_tokens_details", None)
+            self.cached_tokens = getattr(details, "cached_tokens", None) or 0
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None above the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            total += count
+            rows.append((str(bound), total))
+        return rows
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+COUNTERS = (
+    "calls",
+    "errors",
+    "retries",
+    "hedged",
+    "fallbacks",
+    "prompt_tokens",
+    "cached_tokens",
+    "completion_tokens",
+    "discarded_attempts",
+    "discarded_prompt_tokens",
+    "discarded_completion_tokens",
+    "discarded_cost_usd",
+    "cost_usd",
+)
+HISTOGRAMS = {
+    "latency_seconds": LATENCY_BUCKETS,
+    "ttft_seconds": TTFT_BUCKETS,
+    "prompt_tokens": TOKEN_BUCKETS,
+    "completion_tokens": TOKEN_BUCKETS,
+}
+
+
+def _ratio(part: float, total: float) -> float:
+    return round(part / total, 4) if total else 0.0
+
+
+class LLMMetrics:
+    """Per (feature, serving model) counters and histograms for LLM calls in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], dict] = {}
+
+    def _get_series(self, feature: str, model: str) -> dict:
+        key = (feature, model)
+        if key not in self._series:
+            self._series[key] = {
+                "counters": {name: 0 for name in COUNTERS},
+                "histograms": {name: Histogram(buckets) for name, buckets in HISTOGRAMS.items()},
+            }
+        return self._series[key]
+
+    def record(self, record: LLMCallRecord) -> None:
+        with self._lock:
+            series = self._get_series(record.feature, record.model)
+            counters = series["counters"]
+            counters["calls"] += 1
+            counters["errors"] += record.status != "ok"
+            counters["retries"] += record.retries
+            counters["hedged"] += record.hedged
+            counters["fallbacks"] += record.fallback
+            counters["prompt_tokens"] += record.prompt_tokens
+            counters["cached_tokens"] += record.cached_tokens
+            counters["completion_tokens"] += record.completion_tokens
+            counters["discarded_attempts"] += record.discarded_attempts
+            counters["discarded_prompt_tokens"] += record.discarded_prompt_tokens
+            counters["discarded_completion_tokens"] += record.discarded_completion_tokens
+            counters["discarded_cost_usd"] += record.discarded_cost_usd
+            counters["cost_usd"] += record.cost_usd
+
+            histograms = series["histograms"]
+            histograms["latency_seconds"].observe(record.wall_seconds)
+            if record.ttft_seconds is not None:
+                histograms["ttft_seconds"].observe(record.ttft_seconds)
+            if record.status == "ok":
+                histograms["prompt_tokens"].observe(record.prompt_tokens)
+                histograms["completion_tokens"].observe(record.completion_tokens)
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    "feature": feature,
+                    "model": model,
+                    **{
+                        name: round(value, 6) if name.endswith("cost_usd") else value
+                        for name, value in series["counters"].items()
+                    },
+                    "prompt_cache_ratio": _ratio(
+                        series["counters"]["cached_tokens"], series["counters"]["prompt_tokens"]
+                    ),
+                    **{
+                        name: histogram.snapshot()
+                        for name, histogram in series["histograms"].items()
+                    },
+                }
+                for (feature, model), series in sorted(self._series.items())
+            ]
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for name in COUNTERS:
+                metric = f"llm_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for (feature, model), series in sorted(self._series.items()):
+                    value = series["counters"][name]
+                    lines.append(f'{metric}{{feature="{feature}",model="{model}"}} {value}')
+            for name in HISTOGRAMS:
+                metric = f"llm_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (feature, model), series in sorted(self._series.items()):
+                    histogram = series["histograms"][name]
+                    labels = f'feature="{feature}",model="{model}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+llm_metrics = LLMMetrics()
+
+
+def record_llm_call(record: LLMCallRecord) -> None:
+    """Prices the call, adds it to the metrics and emits a structured log line.
+
+    `cost_usd` includes what losing hedged attempts are known to have cost.
+    """
+    record.cost_usd = record.discarded_cost_usd + estimate_cost(
+        record.model, record.prompt_tokens, record.completion_tokens, record.cached_tokens
+    )
+    llm_metrics.record(record)
+
+    fields = {key: value for key, value in asdict(record).items() if key != "started"}
+    message = " ".join(
+        f"{key}={round(value, 4) if isinstance(value, float) else value}"
+        for key, value in fields.items()
+        if value is not None
+    )
+    # `llm_call` carries the same fields for JSON log formatters
+    logger.info(f"[LLM_CALL] {message}", extra={"llm_call": fields})
+
+
+@contextmanager
+def track_llm_call(feature: Optional[str], model: str, streaming: bool = False):
+    """Times the enclosed call and records it on exit (errors and cancellations included)."""
+    record = LLMCallRecord(feature=feature or "unknown", model=model, streaming=streaming)
+    try:
+        yield record
+    except BaseException as e:
+        cancelled = isinstance(e, (GeneratorExit, asyncio.CancelledError))
+        record.status = "cancelled" if cancelled else "error"
+        record.error_type = type(e).__name__
+        raise
+    finally:
+        record.wall_seconds = time.monotonic() - record.started
+        record_llm_call(record)
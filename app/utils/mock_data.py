@@ -445,3 +445,15 @@ MOCK_SESSION_DETAILS = """
     ]
 }
 """
+
+MOCK_COVER_LETTER_RESPONSE = """Dear Hiring Manager,
+
+I am writing to express my interest in the Senior Cloud Engineer position. With more than 15 years of experience across Cloud, DataOps, DevOps and MLOps, I have led infrastructure migrations to Google Cloud and AWS, built reliable ETL pipelines in Python, and mentored engineering teams through large platform changes.
+
+In my most recent role I designed a multi-region deployment that cut infrastructure costs by 30% while improving availability, and introduced CI/CD practices that reduced release times from days to hours. I enjoy translating business goals into resilient, well-automated systems, and I would welcome the opportunity to bring that experience to your team.
+
+Thank you for your time and consideration. I look forward to discussing how I can contribute to your organization.
+
+Sincerely,
+Alex Morgan
+"""
@@ -1,14 +1,27 @@
-import json
 import logging
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.schemas.mock_interview import InterviewEvaluationOutput
 from app.database.auth import get_user_by_id
-from app.utils.aws_utils import generate_presigned_url
-from app.utils.constants import EMAIL_SUB, EMAIL_BODY
+from app.utils.aws_utils import generate_presigned_url, upload_mock_interview_data_async
+from app.utils.constants import (
+    EMAIL_SUB,
+    EMAIL_BODY,
+    FEATURE_INTERVIEW_EVAL,
+    MOCK_INTERVIEW_PENDING_LOG_FILE,
+)
 from app.utils.email_utils import send_email
-from app.utils.openai_client import call_openai
-from app.utils.prompts import INTERVIEW_EVALUATION_PROMPT
+from app.utils.llm_batch import get_interview_eval_batch
+from app.utils.llm_limiter import PRIORITY_BACKGROUND
+from app.utils.llm_routing import get_model_route
+from app.utils.prompt_builder import ChatPrompt, build_prompt, compact_interview_log
+from app.utils.prompts import (
+    INTERVIEW_EVALUATION_SYSTEM_PROMPT,
+    INTERVIEW_EVALUATION_USER_PROMPT,
+)
+from app.utils.structured_output import call_openai_structured, json_schema_format
 from app.utils.utils import parse_ai_response, calculate_interview_duration
 
 logger = logging.getLogger("app")
@@ -29,29 +42,87 @@ def format_skipped_question(question):
     }
 
 
-def get_openai_interview_evaluation(
+def build_interview_evaluation_prompt(
+    job_title: str, interview_log: list[dict[str, any]]
+) -> ChatPrompt:
+    return build_prompt(
+        INTERVIEW_EVALUATION_SYSTEM_PROMPT,
+        INTERVIEW_EVALUATION_USER_PROMPT,
+        feature=FEATURE_INTERVIEW_EVAL,
+        sections=[],
+        job_title=job_title,
+        interview_log=compact_interview_log(
+            interview_log, settings.PROMPT_SECTION_BUDGETS["interview_log"]
+        ),
+    )
+
+
+async def get_openai_interview_evaluation(
     job_title: str, interview_log: list[dict[str, any]]
 ):
     """Calls OpenAI once to evaluate all answers and provide interview-level assessment."""
     logger.info(f"📡 Calling OpenAI for interview evaluation for job: {job_title}")
-    prompt = INTERVIEW_EVALUATION_PROMPT.format(
-        job_title=job_title,
-        interview_log=json.dumps(interview_log, indent=2)
+    prompt = build_interview_evaluation_prompt(job_title, interview_log)
+    # Results are emailed, so evaluation yields to interactive requests
+    evaluation = await call_openai_structured(
+        prompt,
+        InterviewEvaluationOutput,
+        feature=FEATURE_INTERVIEW_EVAL,
+        priority=PRIORITY_BACKGROUND,
     )
-    response = call_openai(prompt)
     logger.info("✅ Received evaluation response from OpenAI")
-    return response
+    return evaluation.model_dump_json()
+
+
+def build_batch_custom_id(user_id: str, session_id: str) -> str:
+    return f"{user_id}/{session_id}"
+
+
+def parse_batch_custom_id(custom_id: str) -> tuple[str, str]:
+    user_id, session_id = custom_id.split("/", 1)
+    return user_id, session_id
+
+
+async def queue_interview_evaluation(
+    user_id: str, session_id: str, job_title: str, interview_log: list[dict[str, any]]
+):
+    """Stores the interview log and queues its evaluation prompt for the next batch job."""
+    await upload_mock_interview_data_async(
+        user_id, session_id, MOCK_INTERVIEW_PENDING_LOG_FILE, interview_log
+    )
+    await get_interview_eval_batch().enqueue(
+        build_batch_custom_id(user_id, session_id),
+        build_interview_evaluation_prompt(job_title, interview_log),
+        model=get_model_route(FEATURE_INTERVIEW_EVAL).primary_model,
+        response_format=json_schema_format(InterviewEvaluationOutput),
+    )
+    queue_logger.info(f"📥 Queued batch evaluation for session: {session_id}")
+
+
+def get_question_evaluations(ai_data: dict) -> dict[str, dict]:
+    """Maps question_id to its evaluation; accepts the list (structured) or legacy dict shape."""
+    evaluations = ai_data.get("question_evaluations") or {}
+    if isinstance(evaluations, list):
+        return {
+            item["question_id"]: item
+            for item in evaluations
+            if isinstance(item, dict) and "question_id" in item
+        }
+    return evaluations
 
 
 def process_ai_response(ai_response_json: str, interview_log: list[dict[str, any]]):
     """Parses OpenAI response and maps it to evaluation results."""
     logger.info("🧠 Parsing AI interview evaluation response")
     ai_data = parse_ai_response(ai_response_json)
+    if not ai_data.get("question_evaluations"):
+        logger.warning("⚠️ AI evaluation response has no question evaluations")
+    question_evaluations = get_question_evaluations(ai_data)
 
     evaluation_results = []
     for entry in interview_log:
         question_id = entry["question_id"]
-        eval_data = ai_data["question_evaluations"].get(question_id, {})
+        eval_data = question_evaluations.get(question_id, {})
         evaluation_results.append({
             "question_id": question_id,
             "question": entry["question"],
@@ -1,26 +1,175 @@
 import logging
+from typing import AsyncIterator, Callable, Optional
 
+import httpx
 import openai
 from app.core.config import settings
+from app.utils.llm_limiter import PRIORITY_INTERACTIVE, estimate_tokens, llm_admission
+from app.utils.llm_resilience import run_with_resilience
+from app.utils.llm_routing import get_model_route, run_with_fallback
+from app.utils.llm_telemetry import track_llm_call
+from app.utils.prompt_builder import Prompt, to_messages
 
 logger = logging.getLogger("app")
-openai.api_key = settings.OPENAI_API_KEY  # Set OpenAI API key
 
+_async_client: Optional[openai.AsyncOpenAI] = None
 
-def call_openai(prompt: str):
-    """Sends a request to OpenAI's GPT-4o and retrieves the response."""
-    logger.info("📡 Sending prompt to OpenAI GPT-4o")
-    try:
-        response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "system", "content": prompt}]
+
+def _build_async_client() -> openai.AsyncOpenAI:
+    return openai.AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        timeout=httpx.Timeout(
+            settings.OPENAI_TIMEOUT_SECONDS,
+            connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+        ),
+        max_retries=settings.OPENAI_MAX_RETRIES,
+        http_client=openai.DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            )
+        ),
+    )
+
+
+async def init_openai_client() -> openai.AsyncOpenAI:
+    """Creates the shared AsyncOpenAI client. Called on app / worker startup."""
+    global _async_client
+    if _async_client is None:
+        _async_client = _build_async_client()
+        logger.info(
+            f"[OPENAI_CLIENT] Started async client (max_connections={settings.OPENAI_MAX_CONNECTIONS})"
         )
-        content = response.choices[0].message.content
+    return _async_client
+
+
+async def close_openai_client() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+        logger.info("[OPENAI_CLIENT] Closed async client")
+
+
+def get_async_openai_client() -> openai.AsyncOpenAI:
+    """Returns the shared AsyncOpenAI client, creating it lazily if needed."""
+    global _async_client
+    if _async_client is None:
+        logger.warning("[OPENAI_CLIENT] Async client not initialised; creating lazily")
+        _async_client = _build_async_client()
+    return _async_client
+
+
+async def call_openai_async(
+    prompt: Prompt,
+    feature: str = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    response_format: Optional[dict] = None,
+    on_model: Optional[Callable[[str], None]] = None,
+):
+    """Sends a chat completion request through the shared pooled client and returns its text.
+
+    Calls pass through the admission controller (`priority` picks the lane) and
+    the resilience policy of `feature` (deadline, retries, hedging).
+    `response_format` enables structured outputs (see app.utils.structured_output).
+    A `ChatPrompt` is sent as system prefix + user message so the prefix can be
+    served from the provider's prompt cache.
+    The model comes from the feature's route, falling back per app.utils.llm_routing;
+    `on_model` is told which model served the response.
+    """
+    route = get_model_route(feature)
+    logger.info(f"📡 Sending prompt to OpenAI {route.primary_model} (async), feature: {feature}")
+
+    async def attempt(model: str):
+        async with llm_admission.admit(priority, estimate_tokens(prompt)) as ticket:
+            response = await get_async_openai_client().chat.completions.create(
+                model=model,
+                messages=to_messages(prompt),
+                response_format=response_format or openai.NOT_GIVEN,
+            )
+            if response.usage:
+                ticket.actual_tokens = response.usage.total_tokens
+            return response
+
+    try:
+        with track_llm_call(feature, route.primary_model) as call:
+            response, call.model = await run_with_fallback(
+                feature,
+                lambda model, deadline: run_with_resilience(
+                    feature,
+                    lambda: attempt(model),
+                    can_hedge=llm_admission.has_spare_capacity,
+                    on_retry=lambda attempt_number, error: call.count_retry(),
+                    on_hedge=call.mark_hedged,
+                    on_discard=lambda response: call.add_discarded(
+                        model, response.usage if response else None
+                    ),
+                    deadline=deadline,
+                ),
+            )
+            call.fallback = call.model != route.primary_model
+            call.set_usage(response.usage)
+        if on_model:
+            on_model(call.model)
+        message = response.choices[0].message
+        if getattr(message, "refusal", None):
+            logger.warning(f"⚠️ OpenAI refused the {feature} request: {message.refusal}")
         logger.info("✅ Successfully received response from OpenAI")
-        return content
+        return message.content
     except openai.OpenAIError as e:
         logger.error(f"❌ OpenAI API error: {str(e)}", exc_info=True)
         raise Exception(f"OpenAI API error: {str(e)}")
     except Exception as e:
         logger.error(f"❌ Unexpected error calling OpenAI: {str(e)}", exc_info=True)
         raise Exception(f"Unexpected error calling OpenAI: {str(e)}")
+
+
+async def stream_openai(
+    prompt: Prompt,
+    feature: str = None,
+    priority: int = PRIORITY_INTERACTIVE,
+    response_format: Optional[dict] = None,
+    on_model: Optional[Callable[[str], None]] = None,
+) -> AsyncIterator[str]:
+    """Streams completion text deltas from OpenAI as they arrive.
+
+    Opening the stream is retried (and may fall back to another model) per the
+    feature's policy and route; once tokens flow it is not. `on_model` is told
+    which model serves the stream.
+    """
+    route = get_model_route(feature)
+    logger.info(f"📡 Streaming prompt to OpenAI {route.primary_model}, feature: {feature}")
+    try:
+        with track_llm_call(feature, route.primary_model, streaming=True) as call:
+            async with llm_admission.admit(priority, estimate_tokens(prompt)) as ticket:
+                stream, call.model = await run_with_fallback(
+                    feature,
+                    lambda model, deadline: run_with_resilience(
+                        feature,
+                        lambda: get_async_openai_client().chat.completions.create(
+                            model=model,
+                            messages=to_messages(prompt),
+                            stream=True,
+                            stream_options={"include_usage": True},
+                            response_format=response_format or openai.NOT_GIVEN,
+                        ),
+                        allow_hedge=False,
+                        on_retry=lambda attempt_number, error: call.count_retry(),
+                        deadline=deadline,
+                    ),
+                )
+                call.fallback = call.model != route.primary_model
+                if on_model:
+                    on_model(call.model)
+                async for chunk in stream:
+                    if chunk.usage:
+                        ticket.actual_tokens = chunk.usage.total_tokens
+                        call.set_usage(chunk.usage)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        call.mark_first_token()
+                        yield chunk.choices[0].delta.content
+        logger.info("✅ Finished streaming response from OpenAI")
+    except openai.OpenAIError as e:
+        logger.error(f"❌ OpenAI API error while streaming: {str(e)}", exc_info=True)
+        raise Exception(f"OpenAI API error: {str(e)}")
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+T = TypeVar("T")
+
+
+class ParserError(Exception):
+    """Base for parse pool failures that callers pass through to the API's handlers."""
+
+
+class ParserBusyError(ParserError):
+    """Raised when the parse queue is full; callers should shed the request."""
+
+
+class ParserTimeoutError(ParserError):
+    """Raised when a document takes longer than the parse timeout."""
+
+
+class ParserCrashError(ParserError):
+    """Raised when a document repeatedly kills its worker process."""
+
+
+def _warm_worker() -> None:
+    # Pay the PyMuPDF / python-docx import cost once per worker, not per document
+    import docx  # noqa: F401
+    import fitz  # noqa: F401
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ParsePool:
+    """Process pool for CPU-bound document parsing, kept off the event loop.
+
+    At most `max_workers` documents parse at once and at most `max_queue`
+    wait; beyond that `run` fails fast with ParserBusyError. A document that
+    times out or crashes its worker only takes that pool generation down: the
+    workers are replaced and other in-flight documents are retried once.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        timeout_seconds: float,
+        max_tasks_per_child: Optional[int] = None,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(max_workers)
+        self._pending = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.rejected = 0
+        self.restarts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: never fork a process that has event-loop and boto3 threads running
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor, reason: str) -> None:
+        if executor is not self._executor:
+            return  # Already replaced by another caller
+        logger.warning(f"[PARSE_POOL] Restarting worker processes: {reason}")
+        self._executor = None
+        self.restarts += 1
+        # A hung parse cannot be cancelled, so its worker has to be killed
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> None:
+        """Spawns and warms every worker up front so the first uploads do not pay for it."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pids = await asyncio.gather(
+            *(loop.run_in_executor(executor, _ping) for _ in range(self.max_workers))
+        )
+        logger.info(f"[PARSE_POOL] Started {len(set(pids))} parser processes")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.info("[PARSE_POOL] Shut down parser processes")
+
+    async def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        """Runs the picklable `fn(*args)` in a worker process and returns its result."""
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ParserBusyError("Document parser is at capacity; try again shortly")
+
+        timeout = timeout or self.timeout_seconds
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            async with self._slots:
+                for attempt in (1, 2):
+                    executor = self._get_executor()
+                    try:
+                        result = await asyncio.wait_for(
+                            loop.run_in_executor(executor, fn, *args), timeout
+                        )
+                        self.completed += 1
+                        return result
+                    except asyncio.TimeoutError:
+                        self.timeouts += 1
+                        self._restart(executor, f"{fn.__name__} exceeded {timeout}s")
+                        raise ParserTimeoutError(f"Document parsing exceeded {timeout}s")
+                    except BrokenProcessPool:
+                        self._restart(executor, f"worker died during {fn.__name__}")
+                        if attempt == 2:
+                            self.crashes += 1
+                            raise ParserCrashError("Document parsing crashed the parser process")
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.max_workers,
+            "in_flight": min(self._pending, self.max_workers),
+            "queued": max(self._pending - self.max_workers, 0),
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+        }
+
+
+parse_pool = ParsePool(
+    max_workers=settings.PARSE_POOL_WORKERS,
+    max_queue=settings.PARSE_POOL_MAX_QUEUE,
+    timeout_seconds=settings.PARSE_TIMEOUT_SECONDS,
+    max_tasks_per_child=settings.PARSE_POOL_MAX_TASKS_PER_CHILD,
+)
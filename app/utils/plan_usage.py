@@ -3,16 +3,21 @@ import logging
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.database.plan import increment_feature_usage
+from app.models.auth import User
 
 logger = logging.getLogger("app")
 
 
-def check_feature_access(db: Session, user_id: int, feature_key: str):
+def check_feature_access(db: Session, user: User, feature_key: str):
+    """Enforces plan limits using the plan already loaded on the request's user."""
+    user_id = user.id
     logger.info(
         f"🔍 Checking feature access: user_id={user_id}, feature_key={feature_key}"
     )
 
-    allowed = increment_feature_usage(db, user_id, feature_key)
+    allowed = increment_feature_usage(
+        db, user_id, feature_key, user_plan=user.user_plan
+    )
     if not allowed:
         logger.warning(
             f"⛔ Usage limit reached: user_id={user_id}, feature={feature_key}"
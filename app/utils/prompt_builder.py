@@ -0,0 +1,227 @@
+import json
+import logging
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Union
+
+from app.core.config import settings
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger("app")
+
+PAGE_BREAK = "\f"
+TRUNCATION_MARKER = "\n[...truncated]"
+# Fallback when no local tokenizer is installed (~4 characters per token for English)
+CHARS_PER_TOKEN = 4
+# Lines this long that repeat are treated as pasted boilerplate
+MIN_BOILERPLATE_LINE_LENGTH = 40
+# Number of lines at the top/bottom of each page checked for running headers/footers
+PAGE_EDGE_LINES = 2
+
+_WHITESPACE = re.compile(r"[ \t ]+")
+_DIGITS = re.compile(r"\d+")
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.encoding_for_model(settings.OPENAI_MODEL)
+        except KeyError:
+            _encoding = tiktoken.get_encoding("o200k_base")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken when installed, else estimates from length."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts text to at most `max_tokens`, preferring a line boundary."""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    keep = max(0, max_tokens - count_tokens(TRUNCATION_MARKER))
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:keep])
+    else:
+        cut = text[: keep * CHARS_PER_TOKEN]
+    last_newline = cut.rfind("\n")
+    if last_newline > len(cut) // 2:
+        cut = cut[:last_newline]
+    return cut.rstrip() + TRUNCATION_MARKER
+
+
+def _normalise_line(line: str) -> str:
+    # Page numbers etc. shouldn't stop a running header/footer from matching
+    return _DIGITS.sub("#", line.lower())
+
+
+def compact_text(text: str) -> str:
+    """Collapses whitespace and drops repeated page headers/footers and boilerplate lines."""
+    if not text:
+        return ""
+
+    pages = [
+        [_WHITESPACE.sub(" ", line).strip() for line in page.splitlines()]
+        for page in text.split(PAGE_BREAK)
+    ]
+    pages = [[line for line in page if line] for page in pages]
+
+    # Running headers/footers: edge lines that recur on several pages
+    repeated_edges = set()
+    if len(pages) > 1:
+        edge_counts = Counter()
+        for page in pages:
+            edges = set(page[:PAGE_EDGE_LINES] + page[-PAGE_EDGE_LINES:])
+            edge_counts.update(_normalise_line(line) for line in edges)
+        repeated_edges = {line for line, count in edge_counts.items() if count > 1}
+
+    seen_edges = set()
+    seen_long_lines = set()
+    kept = []
+    for page in pages:
+        for index, line in enumerate(page):
+            normalised = _normalise_line(line)
+            at_edge = index < PAGE_EDGE_LINES or index >= len(page) - PAGE_EDGE_LINES
+            if at_edge and normalised in repeated_edges:
+                # Keep the first copy: running headers often carry the candidate's name
+                if normalised in seen_edges:
+                    continue
+                seen_edges.add(normalised)
+            # Exact match only: bullets differing in dates or figures are distinct content
+            if len(line) >= MIN_BOILERPLATE_LINE_LENGTH:
+                if line in seen_long_lines:
+                    continue
+                seen_long_lines.add(line)
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def compact_json(data) -> str:
+    """Serialises JSON without indentation or padding."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def compact_interview_log(interview_log: list[dict], max_tokens: int) -> str:
+    """Serialises the interview log compactly, trimming transcriptions evenly to fit."""
+    # Storage keys mean nothing to the model
+    entries = [
+        {
+            **{key: value for key, value in entry.items() if key != "audio_storage_key"},
+            "transcription": compact_text(entry.get("transcription", "")),
+        }
+        for entry in interview_log
+    ]
+    serialised = compact_json(entries)
+    if not entries or count_tokens(serialised) <= max_tokens:
+        return serialised
+
+    skeleton = compact_json([{**entry, "transcription": ""} for entry in entries])
+    per_answer = max(0, (max_tokens - count_tokens(skeleton)) // len(entries))
+    for entry in entries:
+        entry["transcription"] = truncate_to_tokens(entry["transcription"], per_answer)
+    return compact_json(entries)
+
+
+@dataclass(frozen=True)
+class ChatPrompt:
+    """A static instruction prefix plus the per-request user message.
+
+    `system` must not contain request data: providers cache identical prompt
+    prefixes, so keeping it byte-identical lets repeat calls reuse it.
+    """
+
+    system: str
+    user: str
+
+    def messages(self) -> list[dict]:
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user},
+        ]
+
+    def __str__(self) -> str:
+        # Used for cache keys and token estimates
+        return f"{self.system}\n\n{self.user}"
+
+
+Prompt = Union[str, ChatPrompt]
+
+
+def to_messages(prompt: Prompt) -> list[dict]:
+    """Chat messages for a prompt; a plain string is sent as a single system message."""
+    if isinstance(prompt, ChatPrompt):
+        return prompt.messages()
+    return [{"role": "system", "content": prompt}]
+
+
+@dataclass
+class PromptSection:
+    """A variable input of a prompt template.
+
+    `priority` orders sections for truncation when the overall budget is
+    exceeded: the highest number is cut first, never below `min_tokens`.
+    """
+
+    name: str
+    text: str
+    max_tokens: int
+    priority: int = 0
+    min_tokens: int = 0
+    compact: bool = True
+
+
+def fit_sections(sections: list[PromptSection], total_budget: int) -> dict[str, str]:
+    """Compacts and truncates sections to their own budgets and the shared total budget."""
+    fitted = {}
+    for section in sections:
+        text = compact_text(section.text) if section.compact else section.text
+        fitted[section.name] = truncate_to_tokens(text, section.max_tokens)
+
+    overflow = sum(count_tokens(text) for text in fitted.values()) - total_budget
+    for section in sorted(sections, key=lambda s: s.priority, reverse=True):
+        if overflow <= 0:
+            break
+        current = count_tokens(fitted[section.name])
+        target = max(section.min_tokens, current - overflow)
+        if target < current:
+            fitted[section.name] = truncate_to_tokens(fitted[section.name], target)
+            overflow -= current - count_tokens(fitted[section.name])
+    return fitted
+
+
+def build_prompt(
+    system_prompt: str,
+    template: str,
+    feature: str,
+    sections: list[PromptSection],
+    total_budget: int = None,
+    **fields,
+) -> ChatPrompt:
+    """Pairs the static `system_prompt` with `template` rendered from budgeted sections and `fields`."""
+    total_budget = total_budget or settings.PROMPT_MAX_INPUT_TOKENS
+    fitted = fit_sections(sections, total_budget)
+    prompt = ChatPrompt(system_prompt, template.format(**fields, **fitted))
+
+    section_tokens = {name: count_tokens(text) for name, text in fitted.items()}
+    logger.info(
+        f"[PROMPT_BUILDER] feature={feature} prefix_tokens={count_tokens(prompt.system)} "
+        f"user_tokens={count_tokens(prompt.user)} sections={section_tokens}"
+    )
+    return prompt
@@ -1,17 +1,13 @@
-JD_TAILORING_PROMPT = """
-    You are an expert resume coach and recruiter with 10+ years of experience. Your task is to **analyze the entire resume file** resume_content given below and **suggest targeted improvements** to help tailor the resume for the job below.
-
-🧾 Job Title: {job_title}
-
-📋 Full Job Description:
-{job_description}
-
-🧠 User-Declared Proficiency / Skills:
-{skills}
+from app.utils.constants import MAX_QUESTIONS_PER_SESSION
 
+# Each prompt is a static *_SYSTEM_PROMPT holding the instructions, rubric and output
+# format, plus a *_USER_PROMPT template for the request data. Nothing is interpolated
+# into the system prompts so they stay byte-identical and hit the provider's prefix cache.
 
-    🎯 **Resume Content:**
-    {resume_content}
+# Bump a version whenever its prompt changes so cached responses are not reused
+JD_TAILORING_PROMPT_VERSION = "v3"
+JD_TAILORING_SYSTEM_PROMPT = """
+You are an expert resume coach and recruiter with 10+ years of experience. Your task is to **analyze the entire resume** given in the user message and **suggest targeted improvements** to help tailor it for the job described there.
 
 🔍 Your Responsibilities:
 1. Thoroughly analyze the resume and compare it against the job description and skills provided.
@@ -28,93 +24,107 @@ JD_TAILORING_PROMPT = """
 
 
     🎯 **Response Format (JSON)**
-    {{
-    "summary": {{
+    {
+    "summary": {
       "current_text": "...",
       "suggested_text": "...",
       "highlight_color": "yellow"
-    }},
+    },
     "experience": [
-  {{
+  {
     "position": "...",
     "company": "...",
     "matched_points": [
-      {{
+      {
         "text": "...",
         "justification": "...",
         "highlight_color": "green"
-      }}
+      }
     ],
     "modified_points": [
-      {{
+      {
         "current_text": "...",
         "suggested_text": "...",
         "highlight_color": "yellow"
-      }}
+      }
     ],
     "missing_points": [
-      {{
+      {
         "expected_topic": "...",
         "suggestion": "...",
         "highlight_color": "blue"
-      }}
+      }
     ]
-  }}
+  }
 ]
 ,
     "user_skills_mapping": [
-  {{
+  {
     "skill": "...",
     "currently_in_resume": true,
     "recommended_section": "...",
     "action": "enhance"
-  }},
-  {{
+  },
+  {
     "skill": "...",
     "currently_in_resume": false,
     "recommended_section": "...",
     "action": "add"
-  }}
+  }
 ],
-"skills": {{
+"skills": {
   "used_well": ["..."],
   "underutilized": ["..."],
   "missing_keywords": ["..."],
   "suggested_action": "..."
-}},
-"jd_alignment_summary": {{
+},
+"jd_alignment_summary": {
     "total_jd_points": <number of skills/points in jd>,
     "matched": <number of matched skills/points>,
     "partially_matched": <number of partially matched skills/points>,
     "missing": <number of missing skills/points>,
     "match_score_percent": <0–100>
-  }},
+  },
     "new_sections": [
-      {{
+      {
         "title": "...",
         "content": "...",
         "highlight_color": "blue"
-      }}
+      }
     ],
     "recommendations": ["..."],
     "final_notes": ["..."],
-    "section_scores": {{
+    "section_scores": {
     "summary": <0–100>,
     "experience": <0–100>,
     "skills": <0–100>,
     "projects": <0–100>,
     "education": <0–100>
-  }}
-  }}
+  }
+  }
     
     Please analyze and return **only the structured JSON response**. Do not include any explanation or extra commentary.
-    """
+"""
 
+JD_TAILORING_USER_PROMPT = """
+🧾 Job Title: {job_title}
 
-RESUME_SCORING_PROMPT = """
-    You are an expert resume evaluator with years of experience in hiring, recruiting, and career coaching.
+📋 Full Job Description:
+{job_description}
 
-Your task is to thoroughly analyze the resume provided and return a structured JSON response based on the criteria listed below.
+🧠 User-Declared Proficiency / Skills:
+{skills}
+
+🎯 **Resume Content:**
+{resume_content}
+"""
+
+
+RESUME_SCORING_PROMPT_VERSION = "v3"
+RESUME_SCORING_SYSTEM_PROMPT = """
+You are an expert resume evaluator with years of experience in hiring, recruiting, and career coaching.
+
+Your task is to thoroughly analyze the resume given in the user message and return a structured JSON response based on the criteria listed below.
 
 You must:
 
@@ -158,154 +168,151 @@ You must:
 
 Return **only** a valid JSON object in the following format:
 
-{{
+{
   "overall_summary": "<Brief 3–5 line summary of the resume’s overall strengths and weaknesses>",
   "overall_score": <0–100>,
   "detailed_evaluation": [
-    {{
+    {
       "criterion": "Layout & Searchability",
       "description": "Checks if the resume is visually clean, well-structured, and easy to navigate.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "ATS Readability",
       "description": "Assesses whether the resume can be effectively parsed by Applicant Tracking Systems (ATS).",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Impact & Effectiveness",
       "description": "Evaluates if the resume focuses on outcomes and achievements rather than just duties.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Quantifiable Achievements",
       "description": "Checks for use of metrics, KPIs, or measurable impact to demonstrate success.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Readability & Clarity",
       "description": "Ensures the resume is clear, simple, and avoids jargon or unnecessary complexity.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Personal Branding",
       "description": "Assesses whether the resume presents a clear, unique value proposition and professional identity.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Grammar & Spelling",
       "description": "Checks for spelling, grammar, punctuation, and other language issues.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Contact Information",
       "description": "Validates that contact info is complete, professional, and properly formatted.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Section Completeness",
       "description": "Checks if the resume contains all essential sections like Experience, Education, Skills, etc.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Visual Appeal",
       "description": "Evaluates fonts, spacing, alignment, and use of white space to ensure professional look.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Cultural Fit",
       "description": "Assesses how well the tone, style, and presentation align with the target industry or company type.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Career Progression",
       "description": "Analyzes if the resume shows logical career growth, promotions, or expanding responsibilities.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Emotional & Persuasive Appeal",
       "description": "Evaluates if the resume feels compelling, confident, and persuasive to the reader.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Conciseness",
       "description": "Checks if the content is focused, avoids unnecessary fluff, and respects space constraints.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Bullet Point Clarity",
       "description": "Assesses whether bullet points are action-driven, results-focused, and easy to read.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Industry-Specific Keywords",
       "description": "Checks for presence of role- and domain-specific keywords for better ATS matching.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Call-to-Action",
       "description": "Evaluates if the resume ends with a closing statement that encourages recruiter action.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }},
-    {{
+    },
+    {
       "criterion": "Overall Cohesion",
       "description": "Assesses consistency in formatting, language, and overall tone across the resume.",
       "score": <number>,
       "status": "green | yellow | red",
       "assessment": "<Short feedback>"
-    }}
+    }
   ]
-}}
-
-    🔹 **Resume to Evaluate**
-    {resume_text}
+}
 
-    Please analyze the entire resume and return **only the structured JSON response**.
-    """
-
-
-INTERVIEW_QUESTION_PROMPT = """
-You are conducting an interview for the role of **{job_title}**.
+Please analyze the entire resume and return **only the structured JSON response**.
+"""
 
-### **Candidate's Resume:**
+RESUME_SCORING_USER_PROMPT = """
+🔹 **Resume to Evaluate**
 {resume_text}
+"""
 
-### **Job Description:**
-{job_description}
+
+# Formatted once: the question count is fixed, so the prefix stays byte-identical
+INTERVIEW_QUESTION_SYSTEM_PROMPT = """
+You are conducting a job interview. The role, the candidate's resume and the job description are given in the user message.
 
 ### **Instructions:**
 Generate exactly **{max_questions} unique questions** for the candidate based on:
@@ -344,13 +351,20 @@ Return the questions in **valid JSON format** only as follows:
     "Question 19..."
   ]
 }}
-"""
+""".format(max_questions=MAX_QUESTIONS_PER_SESSION)
 
-INTERVIEW_EVALUATION_PROMPT = """
-You are an expert interview evaluator. Analyze a candidate’s responses for the role of {job_title}.
+INTERVIEW_QUESTION_USER_PROMPT = """
+### **Role:** {job_title}
 
-### **Candidate Responses**
-{interview_log}
+### **Candidate's Resume:**
+{resume_text}
+
+### **Job Description:**
+{job_description}
+"""
+
+INTERVIEW_EVALUATION_SYSTEM_PROMPT = """
+You are an expert interview evaluator. Analyze the candidate’s responses given in the user message for the role named there.
 
 ### **Evaluation Criteria**
 1️⃣ **Per-Question Analysis**:
@@ -364,19 +378,20 @@ You are an expert interview evaluator. Analyze a candidate’s responses for the
 - Rate their **technical, problem-solving, communication, leadership, adaptability, cultural fit, and confidence** skills.
 
 ### **Response Format (JSON)**
-{{
-    "question_evaluations": {{
-        "<question_id>": {{
+{
+    "question_evaluations": [
+        {
+            "question_id": "<question_id>",
             "score": <numeric_score>,
             "feedback": "<detailed_feedback>",
             "follow_up_question": "<next_question>"
-        }}
-    }},
-    "final_assessment": {{
+        }
+    ],
+    "final_assessment": {
         "overall_score": <numeric_score>,
         "key_strengths": ["Highlight of strong points..."],
         "areas_for_growth": ["Areas that need improvement..."],
-        "skill_assessment": {{
+        "skill_assessment": {
             "technical": <numeric_score>,
             "problem_solving": <numeric_score>,
             "communication": <numeric_score>,
@@ -384,14 +399,25 @@ You are an expert interview evaluator. Analyze a candidate’s responses for the
             "adaptability": <numeric_score>,
             "behavioral_fit": <numeric_score>,
             "confidence": <numeric_score>
-        }}
-    }}
-}}
+        }
+    }
+}
 """
 
-COVER_LETTER_PROMPT = """
-You are a professional career consultant. Generate a formal, well-structured cover letter for the following job:
+INTERVIEW_EVALUATION_USER_PROMPT = """
+### **Role:** {job_title}
 
+### **Candidate Responses**
+{interview_log}
+"""
+
+COVER_LETTER_SYSTEM_PROMPT = """
+You are a professional career consultant. Generate a formal, well-structured cover letter for the job and candidate given in the user message.
+
+Ensure the cover letter is personalized, engaging, and aligned with the job description.
+"""
+
+COVER_LETTER_USER_PROMPT = """
 Job Title: {job_title}
 Company: {company_name}
 
@@ -400,6 +426,20 @@ Job Description:
 
 Candidate Resume:
 {user_resume}
+"""
 
-Ensure the cover letter is personalized, engaging, and aligned with the job description.
+STRUCTURED_OUTPUT_REPAIR_SYSTEM_PROMPT = """
+The user message holds JSON that failed validation against the response schema, together with the validation errors.
+
+Return the corrected JSON only. Keep every valid value unchanged and fix only what the errors point to.
+"""
+
+STRUCTURED_OUTPUT_REPAIR_USER_PROMPT = """
+The JSON below was generated for a **{schema_name}** response.
+
+### Validation Errors
+{errors}
+
+### Invalid JSON
+{invalid_output}
 """
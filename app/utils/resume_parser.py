@@ -1,5 +1,8 @@
+import asyncio
 import io
 import logging
+from dataclasses import asdict, dataclass
+from typing import Optional
 
 import fitz  # PyMuPDF
 import docx
@@ -7,103 +10,281 @@ import docx
 
 from fastapi import UploadFile
 
-from app.utils.aws_utils import download_resume_from_s3_key
+from app.core.config import settings
+from app.utils import extraction_cache
+from app.utils.aws_utils import download_resume_from_s3_key_async
+from app.utils.io_executor import storage_executor
+from app.utils.parse_pool import ParserError, parse_pool
+from app.utils.prompt_builder import PAGE_BREAK
 from app.utils.utils import get_file_extension_from_s3_key
 
 logger = logging.getLogger("app")
 
+# Bump whenever extraction output changes so cached text is not reused
+RESUME_PARSER_VERSION = "2"
 
-def extract_text_from_pdf(
-    file: UploadFile | io.BytesIO,
-    *,
-    filename: str | None = None
-) -> str:
-    """Extracts text from a PDF.  Accepts either an UploadFile or a BytesIO."""
-    name = filename or getattr(file, "filename", "bytes-resume.pdf")
-    logger.info(f"📄 Extracting text from PDF file: {name}")
-    try:
-        # if it's an UploadFile, read from .file; otherwise assume it's BytesIO
-        data = file.file.read() if hasattr(file, "file") else file.read()
-        doc = fitz.open(stream=data, filetype="pdf")
-        pages = [page.get_text("text") for page in doc]
-        return "\n".join(pages)
-    except Exception as e:
-        logger.error(f"❌ Failed to extract text from PDF: {e}", exc_info=True)
-        raise
 
-def extract_text_from_docx(
-    file: UploadFile | io.BytesIO,
-    *,
-    filename: str | None = None
-) -> str:
-    """Extracts text from a DOCX.  Accepts either an UploadFile or a BytesIO."""
-    name = filename or getattr(file, "filename", "bytes-resume.docx")
-    logger.info(f"📄 Extracting text from DOCX file: {name}")
-    try:
-        # wrap BytesIO in a file‐like object accepted by python‐docx
-        stream = file.file if hasattr(file, "file") else file
-        doc = docx.Document(stream)
-        return "\n".join(para.text for para in doc.paragraphs)
-    except Exception as e:
-        logger.error(f"❌ Failed to extract text from DOCX: {e}", exc_info=True)
-        raise
+class ResumeTooLargeError(Exception):
+    """Raised when a resume file exceeds RESUME_MAX_BYTES."""
+
+
+@dataclass
+class ExtractionResult:
+    """Extracted resume text and whether the extraction limits cut it short."""
+
+    text: str
+    pages: int = 0  # Pages in the document (0 for non-paged formats)
+    pages_read: int = 0
+    truncated: bool = False
+    truncation_reason: Optional[str] = None  # "pages" or "chars"
+
+
+def get_cache_version() -> str:
+    # The limits shape the output, so they are part of the cache key
+    return f"{RESUME_PARSER_VERSION}:p{settings.RESUME_MAX_PAGES}:c{settings.RESUME_MAX_CHARS}"
+
+
+def check_resume_size(size: int) -> None:
+    if size > settings.RESUME_MAX_BYTES:
+        raise ResumeTooLargeError(
+            f"Resume is {size} bytes; the limit is {settings.RESUME_MAX_BYTES} bytes"
+        )
+
+
+def _log_truncation(result: ExtractionResult, name: str) -> None:
+    if result.truncated:
+        logger.warning(
+            f"[RESUME_PARSER] {name} truncated by {result.truncation_reason} limit: "
+            f"read {result.pages_read}/{result.pages} pages, {len(result.text)} chars"
+        )
+
+
+def pdf_page_count(data: bytes) -> int:
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def extract_pdf_pages(data: bytes, start: int, end: int, max_chars: int) -> ExtractionResult:
+    """Extracts pages [start, end) one at a time, stopping once `max_chars` is reached.
+
+    Only the current page's text object is alive at a time, and pages past
+    the character budget are never rendered.
+    """
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        end = min(end, doc.page_count)
+        parts = []
+        chars = 0
+        for number in range(start, end):
+            page_text = doc.load_page(number).get_text("text")
+            parts.append(page_text)
+            chars += len(page_text) + len(PAGE_BREAK)
+            if chars >= max_chars:
+                break
+
+        # Form feeds keep page boundaries so running headers/footers can be dropped
+        text = PAGE_BREAK.join(parts)
+        truncated = len(text) > max_chars or start + len(parts) < end
+        return ExtractionResult(
+            text=text[:max_chars],
+            pages=doc.page_count,
+            pages_read=len(parts),
+            truncated=truncated,
+            truncation_reason="chars" if truncated else None,
+        )
+
+
+def extract_pdf(data: bytes) -> ExtractionResult:
+    """Page-streaming PDF extraction within RESUME_MAX_PAGES and RESUME_MAX_CHARS."""
+    result = extract_pdf_pages(data, 0, settings.RESUME_MAX_PAGES, settings.RESUME_MAX_CHARS)
+    if not result.truncated and result.pages > settings.RESUME_MAX_PAGES:
+        result.truncated = True
+        result.truncation_reason = "pages"
+    return result
+
+
+def extract_docx(data: bytes) -> ExtractionResult:
+    """DOCX extraction that stops collecting paragraphs at RESUME_MAX_CHARS."""
+    max_chars = settings.RESUME_MAX_CHARS
+    parts = []
+    chars = 0
+    truncated = False
+    for para in docx.Document(io.BytesIO(data)).paragraphs:
+        if chars >= max_chars:
+            truncated = True
+            break
+        parts.append(para.text)
+        chars += len(para.text) + 1
+    text = "\n".join(parts)
+    truncated = truncated or len(text) > max_chars
+    return ExtractionResult(
+        text=text[:max_chars],
+        truncated=truncated,
+        truncation_reason="chars" if truncated else None,
+    )
+
 
+def get_upload_extension(filename: str) -> str:
+    """Returns the extension of a supported resume upload; raises ValueError otherwise."""
+    for extension in ("pdf", "docx", "txt"):
+        if filename.endswith(f".{extension}"):
+            return extension
+    raise ValueError("Unsupported file format. Only PDF, DOCX, and TXT are allowed.")
 
-def extract_resume_text(file: UploadFile):
-    """Detects file type and extracts text accordingly."""
+
+def parse_document(data: bytes, extension: str) -> ExtractionResult:
+    """Parses raw document bytes. Module-level so the parse pool's workers can run it."""
+    check_resume_size(len(data))
+    if extension == "pdf":
+        return extract_pdf(data)
+    if extension == "docx":
+        return extract_docx(data)
+    if extension in ("txt", "text"):
+        text = data.decode("utf-8")
+        truncated = len(text) > settings.RESUME_MAX_CHARS
+        return ExtractionResult(
+            text=text[: settings.RESUME_MAX_CHARS],
+            truncated=truncated,
+            truncation_reason="chars" if truncated else None,
+        )
+    raise ValueError(f"Unsupported extension: .{extension}")
+
+
+def _get_cached(digest: str) -> Optional[ExtractionResult]:
+    cached = extraction_cache.get_cached(digest, get_cache_version())
+    return ExtractionResult(**cached) if cached is not None else None
+
+
+async def _extract_pdf_sharded(data: bytes) -> ExtractionResult:
+    """Splits long PDFs into page ranges parsed in parallel by the parse pool.
+
+    The first range is parsed on its own: if it already fills the character
+    budget, later pages are never rendered. Otherwise the remaining ranges
+    run in parallel on what is left of the budget and are joined in page
+    order; shards past the point where the budget fills are cancelled.
+    """
+    pages = await parse_pool.run(pdf_page_count, data)
+    pages_to_read = min(pages, settings.RESUME_MAX_PAGES)
+    shard_pages = settings.PDF_SHARD_PAGES
+    if pages_to_read <= shard_pages:
+        return await parse_pool.run(extract_pdf, data)
+
+    max_chars = settings.RESUME_MAX_CHARS
+    first = await parse_pool.run(extract_pdf_pages, data, 0, shard_pages, max_chars)
+    texts = [first.text]
+    chars = len(first.text)
+    pages_read = first.pages_read
+    budget = max_chars - chars - len(PAGE_BREAK)
+    truncated = first.truncated or budget <= 0
+
+    if not truncated:
+        ranges = [
+            (start, min(start + shard_pages, pages_to_read))
+            for start in range(shard_pages, pages_to_read, shard_pages)
+        ]
+        tasks = [
+            asyncio.ensure_future(parse_pool.run(extract_pdf_pages, data, start, end, budget))
+            for start, end in ranges
+        ]
+        try:
+            for index, task in enumerate(tasks):
+                shard = await task
+                texts.append(shard.text)
+                chars += len(PAGE_BREAK) + len(shard.text)
+                pages_read += shard.pages_read
+                if shard.truncated or chars >= max_chars:
+                    truncated = shard.truncated or index < len(tasks) - 1
+                    break
+        finally:
+            # Queued shards past the budget are dropped before they render anything
+            for task in tasks:
+                task.cancel()
+        logger.info(f"[RESUME_PARSER] Parsed {pages_read} pages in up to {len(tasks) + 1} shards")
+
+    text = PAGE_BREAK.join(texts)
+    truncated = truncated or len(text) > max_chars
+    reason = "chars" if truncated else ("pages" if pages > pages_to_read else None)
+    return ExtractionResult(
+        text=text[:max_chars],
+        pages=pages,
+        pages_read=pages_read,
+        truncated=reason is not None,
+        truncation_reason=reason,
+    )
+
+
+async def extract_resume_from_bytes_async(data: bytes, extension: str) -> ExtractionResult:
+    """Cached, bounded extraction of raw bytes; a cache miss is parsed in the parse pool."""
+    check_resume_size(len(data))
+    if extension in ("txt", "text"):
+        return parse_document(data, extension)
+
+    digest = extraction_cache.content_hash(data)
+    result = _get_cached(digest)
+    if result is not None:
+        logger.info("[EXTRACTION_CACHE] Memory hit")
+        return result
+    if extension == "pdf":
+        result = await _extract_pdf_sharded(data)
+    else:
+        result = await parse_pool.run(parse_document, data, extension)
+    extraction_cache.store_cached(digest, get_cache_version(), asdict(result))
+    return result
+
+
+async def extract_resume_async(file: UploadFile) -> ExtractionResult:
+    """Awaitable extraction that keeps PDF/DOCX parsing off the event loop.
+
+    Reads at most RESUME_MAX_BYTES + 1 bytes of the upload. ParserError and
+    ResumeTooLargeError are raised as is so the API can answer 503 / 422 / 413.
+    """
     logger.info(
         f"🔍 Detecting format and extracting resume text for file: {file.filename}"
     )
     try:
-        if file.filename.endswith(".pdf"):
-            return extract_text_from_pdf(file)
-        elif file.filename.endswith(".docx"):
-            return extract_text_from_docx(file)
-        elif file.filename.endswith(".txt"):
-            logger.info("📃 Extracting text from plain text file")
-            return file.file.read().decode("utf-8")
-        else:
-            raise ValueError(
-                "Unsupported file format. Only PDF, DOCX, and TXT are allowed."
-            )
+        extension = get_upload_extension(file.filename)
+        data = await file.read(settings.RESUME_MAX_BYTES + 1)
+        result = await extract_resume_from_bytes_async(data, extension)
+        _log_truncation(result, file.filename)
+        return result
+    except (ParserError, ResumeTooLargeError):
+        raise
     except Exception as e:
         logger.error(f"❌ Failed to extract resume text: {str(e)}", exc_info=True)
         raise Exception(f"Error extracting resume text: {str(e)}")
 
 
-def extract_resume_text_from_bytes(file_bytes: io.BytesIO, extension: str) -> str:
-    """
-    Given a BytesIO and its extension, routes to the appropriate extractor.
-    """
-    logger.info(f"🔍 Extracting resume text from bytes (.{extension})")
-    try:
-        if extension == "pdf":
-            return extract_text_from_pdf(file_bytes, filename=f"resume.{extension}")
-        elif extension == "docx":
-            return extract_text_from_docx(file_bytes, filename=f"resume.{extension}")
-        elif extension in ("txt", "text"):
-            return file_bytes.read().decode("utf-8")
-        else:
-            raise ValueError(f"Unsupported extension: .{extension}")
-    except Exception:
-        logger.error("❌ Failed to extract text from bytes", exc_info=True)
-        raise
+async def extract_resume_for_s3_key_async(s3_key: str, data: bytes) -> ExtractionResult:
+    """Extracts the bytes of the S3 document `s3_key` and caches the result under that key."""
+    result = await extract_resume_from_bytes_async(data, get_file_extension_from_s3_key(s3_key))
+    _log_truncation(result, s3_key)
+    await storage_executor.run(
+        extraction_cache.store_for_s3_key,
+        s3_key,
+        extraction_cache.content_hash(data),
+        get_cache_version(),
+        asdict(result),
+    )
+    return result
 
 
-def get_resume_text_from_s3_key(s3_key: str):
-    """
-    Downloads a resume from S3, extracts its file extension, and retrieves text.
+async def get_resume_from_s3_key_async(s3_key: str) -> ExtractionResult:
+    """Downloads and extracts the resume at `s3_key`, served from the extraction cache when possible.
 
-    :param s3_key: The S3 key of the resume.
-    :return: Extracted text content of the resume.
+    S3 calls run on the storage I/O executor, parsing in the parse pool.
     """
     logger.info(f"📥 Fetching and extracting resume text from S3 key: {s3_key}")
     try:
-        resume_file = download_resume_from_s3_key(s3_key)
-        resume_file_ext = get_file_extension_from_s3_key(s3_key)
-        resume_text = extract_resume_text_from_bytes(resume_file, resume_file_ext)
+        version = get_cache_version()
+        cached = await storage_executor.run(extraction_cache.get_cached_for_s3_key, s3_key, version)
+        if cached is not None:
+            return ExtractionResult(**cached)
+
+        resume_file = await download_resume_from_s3_key_async(s3_key)
+        result = await extract_resume_for_s3_key_async(s3_key, resume_file.getvalue())
         logger.info("✅ Successfully extracted resume text from S3")
-        return resume_text
+        return result
+    except (ParserError, ResumeTooLargeError):
+        raise
     except Exception as e:
         logger.error(f"❌ Error processing resume from S3: {str(e)}", exc_info=True)
         raise Exception(f"Error processing resume from S3: {str(e)}")
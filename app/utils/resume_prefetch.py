@@ -0,0 +1,76 @@
+import asyncio
+import logging
+from typing import Awaitable
+
+from app.core.config import settings
+
+logger = logging.getLogger("app")
+
+
+class ResumePrefetch:
+    """Tracks background pre-processing of staged resumes, keyed by temp key.
+
+    Only in-flight work is tracked here; finished results live in the
+    extraction cache and the sections store, so a consumer that arrives late
+    simply hits those. Failures are logged and left to the consumer's own
+    on-demand path.
+    """
+
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max_in_flight
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.skipped = 0
+        self.failed = 0
+        self.awaited = 0
+
+    def start(self, key: str, work: Awaitable) -> bool:
+        """Runs `work` in the background; returns False if it was not started."""
+        if key in self._tasks or len(self._tasks) >= self.max_in_flight:
+            self.skipped += 1
+            work.close()
+            logger.info(f"[RESUME_PREFETCH] Skipped {key} ({len(self._tasks)} in flight)")
+            return False
+        task = asyncio.ensure_future(work)
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self.started += 1
+        return True
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.failed += 1
+            logger.warning(f"[RESUME_PREFETCH] Failed for {key}: {task.exception()}")
+
+    async def wait(self, key: str, timeout: float) -> None:
+        """Waits (up to `timeout`) for in-flight work on `key`; never raises."""
+        task = self._tasks.get(key)
+        if task is None:
+            return
+        self.awaited += 1
+        logger.info(f"[RESUME_PREFETCH] Waiting for in-flight pre-processing of {key}")
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[RESUME_PREFETCH] Still running after {timeout}s: {key}")
+        except Exception:
+            pass  # Already logged by _forget; the caller falls back to on-demand work
+
+    def cancel_all(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._tasks),
+            "max_in_flight": self.max_in_flight,
+            "started": self.started,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "awaited": self.awaited,
+        }
+
+
+resume_prefetch = ResumePrefetch(max_in_flight=settings.RESUME_PREFETCH_MAX_IN_FLIGHT)
@@ -0,0 +1,247 @@
+import io
+import logging
+import re
+from collections import Counter
+from typing import Iterable, Optional
+
+import docx
+import fitz  # PyMuPDF
+
+from app.core.config import settings
+from app.utils.aws_utils import load_json_from_s3, move_s3_object, upload_json_to_s3
+from app.utils.cache import TTLCache
+from app.utils.io_executor import storage_executor
+from app.utils.parse_pool import parse_pool
+
+logger = logging.getLogger("app")
+
+# Bump whenever segmentation output changes so stored sections are recomputed
+SECTIONS_VERSION = "2"
+SECTIONS_SUFFIX = ".sections.json"
+
+# S3 key of a staged document -> its sections metadata
+_memory = TTLCache(
+    max_size=settings.EXTRACTION_CACHE_MAX_ENTRIES,
+    default_ttl=settings.EXTRACTION_CACHE_TTL_SECONDS,
+)
+
+SECTION_CONTACT = "contact"
+SECTION_SUMMARY = "summary"
+SECTION_SKILLS = "skills"
+SECTION_EXPERIENCE = "experience"
+SECTION_EDUCATION = "education"
+SECTION_PROJECTS = "projects"
+SECTION_OTHER = "other"
+
+SECTION_HEADINGS = {
+    SECTION_SUMMARY: (
+        "summary", "professional summary", "career summary", "profile",
+        "professional profile", "objective", "career objective", "about me", "about",
+    ),
+    SECTION_SKILLS: (
+        "skills", "technical skills", "key skills", "core skills", "core competencies",
+        "competencies", "technologies", "tech stack", "tools and technologies",
+    ),
+    SECTION_EXPERIENCE: (
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history",
+    ),
+    SECTION_EDUCATION: (
+        "education", "academic background", "education and training",
+        "academic qualifications", "qualifications",
+    ),
+    SECTION_PROJECTS: (
+        "projects", "personal projects", "key projects", "selected projects",
+        "academic projects", "side projects",
+    ),
+}
+_HEADING_LOOKUP = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+# Headings are short; longer styled lines are job titles, names, etc.
+MAX_HEADING_WORDS = 4
+# Name, title and contact details fit in a few lines; anything beyond is "other"
+MAX_CONTACT_LINES = 6
+# Above this share of the text, contact detection has swallowed real content
+MAX_CONTACT_SHARE = 0.25
+PDF_BOLD_FLAG = 1 << 4
+
+
+def _normalize(line: str) -> str:
+    line = re.sub(r"[^a-z&\s]", " ", line.lower()).replace("&", " and ")
+    return " ".join(line.split())
+
+
+def _match_heading(line: str) -> tuple[Optional[str], str]:
+    """Returns (section, rest of the line) when the line starts a known section."""
+    heading, sep, rest = line.partition(":")
+    section = _HEADING_LOOKUP.get(_normalize(heading))
+    if section is None:
+        return None, ""
+    return section, rest.strip() if sep else ""
+
+
+def _looks_like_heading(line: str) -> bool:
+    return len(line.split()) <= MAX_HEADING_WORDS and not line.endswith((".", ","))
+
+
+def segment_lines(lines: Iterable[tuple[str, bool]]) -> dict[str, str]:
+    """Splits (line, looks_like_heading) pairs into resume sections.
+
+    Known headings are recognised by name alone. Lines whose layout marks them
+    as headings (bold, larger, all caps) but whose name is unknown start an
+    "other" section, which keeps e.g. "Awards" out of the preceding section.
+    Contact details are the leading lines up to the first heading, at most
+    MAX_CONTACT_LINES of them; the first line (usually the styled name) can't
+    end the contact block.
+    """
+    sections: dict[str, list[str]] = {}
+    current = SECTION_CONTACT
+    chars = 0
+    for line, styled in lines:
+        line = line.strip()
+        if not line:
+            continue
+        chars += len(line) + 1
+        if chars > settings.RESUME_MAX_CHARS:
+            break
+
+        section, rest = _match_heading(line)
+        if section is not None:
+            current = section
+            if rest:
+                sections.setdefault(current, []).append(rest)
+            continue
+        if current == SECTION_CONTACT:
+            contact_lines = len(sections.get(SECTION_CONTACT, []))
+            if contact_lines >= MAX_CONTACT_LINES or (
+                styled and contact_lines and _looks_like_heading(line)
+            ):
+                current = SECTION_OTHER
+        elif styled and _looks_like_heading(line):
+            current = SECTION_OTHER
+        sections.setdefault(current, []).append(line)
+
+    return {name: "\n".join(section_lines) for name, section_lines in sections.items()}
+
+
+def _pdf_lines(data: bytes) -> Iterable[tuple[str, bool]]:
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        pages = [
+            doc.load_page(number).get_text("dict", sort=True)
+            for number in range(min(doc.page_count, settings.RESUME_MAX_PAGES))
+        ]
+
+    lines = []
+    sizes = Counter()
+    for page in pages:
+        for block in page["blocks"]:
+            for line in block.get("lines", []):
+                spans = [span for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+                text = "".join(span["text"] for span in spans)
+                size = max(span["size"] for span in spans)
+                bold = all(span["flags"] & PDF_BOLD_FLAG for span in spans)
+                sizes[round(size, 1)] += len(text)
+                lines.append((text, size, bold))
+
+    body_size = sizes.most_common(1)[0][0] if sizes else 0
+    for text, size, bold in lines:
+        yield text, bold or size > body_size + 0.5 or text.isupper()
+
+
+def _docx_lines(data: bytes) -> Iterable[tuple[str, bool]]:
+    for para in docx.Document(io.BytesIO(data)).paragraphs:
+        runs = [run for run in para.runs if run.text.strip()]
+        styled = (
+            para.style.name.startswith(("Heading", "Title"))
+            or (bool(runs) and all(run.bold for run in runs))
+            or para.text.isupper()
+        )
+        yield para.text, styled
+
+
+def segment_document(data: bytes, extension: str) -> dict[str, str]:
+    """Segments a resume into sections. Module-level so the parse pool's workers can run it."""
+    if extension == "pdf":
+        lines = _pdf_lines(data)
+    elif extension == "docx":
+        lines = _docx_lines(data)
+    elif extension in ("txt", "text"):
+        lines = ((line, line.isupper()) for line in data.decode("utf-8").splitlines())
+    else:
+        raise ValueError(f"Unsupported extension: .{extension}")
+    return segment_lines(lines)
+
+
+async def segment_resume_async(data: bytes, extension: str) -> Optional[dict]:
+    """Segments a resume in the parse pool; returns None rather than failing the upload."""
+    try:
+        if extension in ("txt", "text"):
+            sections = segment_document(data, extension)
+        else:
+            sections = await parse_pool.run(segment_document, data, extension)
+    except Exception as e:
+        logger.warning(f"[RESUME_SECTIONS] Segmentation failed (.{extension}): {e}")
+        return None
+    logger.info(f"[RESUME_SECTIONS] Found sections: {', '.join(sections) or 'none'}")
+    return {"sections_version": SECTIONS_VERSION, "sections": sections}
+
+
+def get_sections(metadata: Optional[dict]) -> Optional[dict[str, str]]:
+    """Returns stored sections if they were produced by the current segmenter."""
+    if not metadata or metadata.get("sections_version") != SECTIONS_VERSION:
+        return None
+    return metadata.get("sections")
+
+
+def select_sections(sections: dict[str, str], names: Iterable[str]) -> str:
+    """Joins the named sections (in the given order) under their headings.
+
+    Returns "" when contact details make up more than MAX_CONTACT_SHARE of the
+    document, i.e. segmentation missed the headings, so callers use the full text.
+    """
+    total = sum(len(text) for text in sections.values())
+    if total and len(sections.get(SECTION_CONTACT, "")) > MAX_CONTACT_SHARE * total:
+        logger.info("[RESUME_SECTIONS] Contact section too large; not selecting sections")
+        return ""
+    return "\n\n".join(
+        f"{name.upper()}\n{sections[name]}" for name in names if sections.get(name)
+    )
+
+
+def get_sections_key(s3_key: str) -> str:
+    return f"{s3_key}{SECTIONS_SUFFIX}"
+
+
+def store_sections_for_s3_key(s3_key: str, metadata: dict) -> None:
+    """Stores sections next to a staged document (best effort)."""
+    _memory.set(s3_key, metadata)
+    try:
+        upload_json_to_s3(get_sections_key(s3_key), metadata)
+    except Exception as e:
+        logger.warning(f"[RESUME_SECTIONS] Could not store sections for {s3_key}: {e}")
+
+
+def load_sections_for_s3_key(s3_key: str) -> Optional[dict[str, str]]:
+    metadata = _memory.get(s3_key)
+    if metadata is not None:
+        return get_sections(metadata)
+    try:
+        return get_sections(load_json_from_s3(get_sections_key(s3_key)))
+    except Exception as e:
+        logger.warning(f"[RESUME_SECTIONS] Could not load sections for {s3_key}: {e}")
+        return None
+
+
+async def load_sections_for_s3_key_async(s3_key: str) -> Optional[dict[str, str]]:
+    return await storage_executor.run(load_sections_for_s3_key, s3_key)
+
+
+def move_sections(src_key: str, dst_key: str) -> None:
+    """Moves a document's sections along with it (best effort)."""
+    try:
+        move_s3_object(get_sections_key(src_key), get_sections_key(dst_key))
+    except Exception as e:
+        logger.warning(f"[RESUME_SECTIONS] Could not move sections {src_key} → {dst_key}: {e}")
@@ -0,0 +1,168 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import settings
+from app.utils.llm_cache import cached_call_openai, store_cached_response
+from app.utils.llm_limiter import PRIORITY_INTERACTIVE
+from app.utils.openai_client import call_openai_async
+from app.utils.prompt_builder import ChatPrompt, Prompt
+from app.utils.prompts import (
+    STRUCTURED_OUTPUT_REPAIR_SYSTEM_PROMPT,
+    STRUCTURED_OUTPUT_REPAIR_USER_PROMPT,
+)
+
+logger = logging.getLogger("app")
+
+M = TypeVar("M", bound=BaseModel)
+
+# Cap on how much of the validation error report is sent back for repair
+MAX_REPAIR_ERRORS = 20
+
+
+class StructuredOutputError(Exception):
+    """Raised when a completion still fails schema validation after repair."""
+
+
+def _make_strict(node) -> None:
+    # Strict mode: every property required, no undeclared properties
+    if isinstance(node, dict):
+        if node.get("type") == "object" and "properties" in node:
+            node["additionalProperties"] = False
+            node["required"] = list(node["properties"])
+        for value in node.values():
+            _make_strict(value)
+    elif isinstance(node, list):
+        for item in node:
+            _make_strict(item)
+
+
+@lru_cache(maxsize=None)
+def json_schema_format(model: Type[BaseModel]) -> dict:
+    """Builds the strict `response_format` for a Pydantic model."""
+    schema = model.model_json_schema()
+    _make_strict(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model.__name__, "schema": schema, "strict": True},
+    }
+
+
+def validate_output(model: Type[M], content: Optional[str]) -> M:
+    """Parses a completion into `model`; raises ValidationError (or ValueError if empty)."""
+    if not content or not content.strip():
+        raise ValueError("Empty completion")
+    # Tolerate markdown fences from non-structured (e.g. cached or mock) responses
+    return model.model_validate_json(re.sub(r"```json|```", "", content).strip())
+
+
+def is_valid_output(model: Type[BaseModel], content: Optional[str]) -> bool:
+    try:
+        validate_output(model, content)
+        return True
+    except ValueError:
+        return False
+
+
+def _format_errors(error: ValidationError) -> str:
+    lines = [
+        f"- {'.'.join(str(part) for part in item['loc']) or '<root>'}: {item['msg']}"
+        for item in error.errors()[:MAX_REPAIR_ERRORS]
+    ]
+    return "\n".join(lines)
+
+
+async def repair_structured_output(
+    content: Optional[str],
+    model: Type[M],
+    feature: str,
+    priority: int = PRIORITY_INTERACTIVE,
+    on_model: Optional[Callable[[str], None]] = None,
+) -> M:
+    """Validates `content`, asking the model to fix it a bounded number of times.
+
+    `on_model` is told which model served each repair call.
+    """
+    attempts = 0
+    while True:
+        try:
+            return validate_output(model, content)
+        except ValueError as e:
+            # ValidationError subclasses ValueError; a bare ValueError means nothing came back
+            exhausted = attempts >= settings.LLM_STRUCTURED_OUTPUT_REPAIR_ATTEMPTS
+            if not isinstance(e, ValidationError) or exhausted:
+                logger.error(
+                    f"[STRUCTURED_OUTPUT] {model.__name__} for {feature} invalid after {attempts} repair(s): {str(e)}"
+                )
+                raise StructuredOutputError(
+                    f"{feature} response does not match {model.__name__}"
+                ) from e
+            attempts += 1
+            logger.warning(
+                f"[STRUCTURED_OUTPUT] {model.__name__} for {feature} failed validation "
+                f"({e.error_count()} errors); repair attempt {attempts}"
+            )
+            prompt = ChatPrompt(
+                STRUCTURED_OUTPUT_REPAIR_SYSTEM_PROMPT,
+                STRUCTURED_OUTPUT_REPAIR_USER_PROMPT.format(
+                    schema_name=model.__name__,
+                    errors=_format_errors(e),
+                    invalid_output=content,
+                ),
+            )
+            content = await call_openai_async(
+                prompt,
+                feature=feature,
+                priority=priority,
+                response_format=json_schema_format(model),
+                on_model=on_model,
+            )
+
+
+async def call_openai_structured(
+    prompt: Prompt,
+    model: Type[M],
+    feature: str,
+    priority: int = PRIORITY_INTERACTIVE,
+    template_version: Optional[str] = None,
+    bypass_cache: bool = False,
+) -> M:
+    """Requests a completion constrained to `model`'s JSON schema and returns it validated.
+
+    Passing `template_version` routes the call through the LLM cache; only
+    outputs that validate (directly or after repair) are cached.
+    """
+    response_format = json_schema_format(model)
+    served_models = []
+    if template_version:
+        content = await cached_call_openai(
+            prompt,
+            feature=feature,
+            template_version=template_version,
+            bypass_cache=bypass_cache,
+            is_cacheable=lambda response: is_valid_output(model, response),
+            response_format=response_format,
+            on_model=served_models.append,
+        )
+    else:
+        content = await call_openai_async(
+            prompt, feature=feature, priority=priority, response_format=response_format
+        )
+
+    try:
+        return validate_output(model, content)
+    except ValueError:
+        pass
+
+    result = await repair_structured_output(
+        content, model, feature, priority, on_model=served_models.append
+    )
+    # Only cache a repaired output if one model produced all of it
+    if template_version and len(set(served_models)) == 1:
+        await store_cached_response(
+            prompt, feature, template_version, result.model_dump_json(), served_models[0]
+        )
+    return result
@@ -0,0 +1,251 @@
+"""Local OpenAI-compatible stub for load testing the real LLM code paths offline.
+
+Serves `/v1/chat/completions` (plain and streaming) from the fixtures in
+app.utils.mock_data, with sampled latency, token usage (including simulated
+prefix-cache hits) and injected 429/5xx errors. Run it and point the app at it:
+
+    poetry run python openai_stub.py
+    OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub MOCK_DATA=False ...
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.utils.constants import (
+    FEATURE_COVER_LETTER,
+    FEATURE_INTERVIEW_EVAL,
+    FEATURE_MOCK_INTERVIEW,
+    FEATURE_RESUME_EVAL,
+    FEATURE_RESUME_TAILOR,
+)
+from app.utils.mock_data import (
+    MOCK_COVER_LETTER_RESPONSE,
+    MOCK_INTERVIEW_EVALUATION_RESPONSE,
+    MOCK_INTERVIEW_QUESTIONS_RESPONSE,
+    MOCK_SCORE,
+    MOCK_TAILOR_RESPONSE,
+)
+from app.utils.prompt_builder import count_tokens
+
+setup_logging()
+logger = logging.getLogger("app")
+
+# response_format schema name -> feature whose fixture and latency apply
+SCHEMA_FEATURES = {
+    "TailoringSuggestions": FEATURE_RESUME_TAILOR,
+    "ResumeScoringResponse": FEATURE_RESUME_EVAL,
+    "InterviewQuestionsOutput": FEATURE_MOCK_INTERVIEW,
+    "InterviewEvaluationOutput": FEATURE_INTERVIEW_EVAL,
+}
+# Provider prefix caching: prompts of at least 1024 tokens, cached in 128-token steps
+CACHE_MIN_PREFIX_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+STREAM_CHUNK_CHARS = 16
+
+app = FastAPI(title="OpenAI stub")
+_seen_prefixes: set[str] = set()
+
+
+def _strip_fences(text: str) -> str:
+    return re.sub(r"```json|```", "", text).strip()
+
+
+def _interview_evaluation(user_message: str) -> str:
+    """Evaluation fixture re-keyed to the question ids present in the interview log."""
+    fixture = json.loads(MOCK_INTERVIEW_EVALUATION_RESPONSE)
+    templates = list(fixture["question_evaluations"].values())
+    question_ids = re.findall(r'"question_id":\s*"([^"]+)"', user_message)
+    fixture["question_evaluations"] = [
+        {"question_id": question_id, **templates[index % len(templates)]}
+        for index, question_id in enumerate(question_ids)
+    ]
+    return json.dumps(fixture)
+
+
+def get_fixture(feature: str, messages: list[dict]) -> str:
+    if feature == FEATURE_INTERVIEW_EVAL:
+        return _interview_evaluation(messages[-1].get("content") or "")
+    fixtures = {
+        FEATURE_RESUME_TAILOR: MOCK_TAILOR_RESPONSE,
+        FEATURE_RESUME_EVAL: MOCK_SCORE,
+        FEATURE_MOCK_INTERVIEW: MOCK_INTERVIEW_QUESTIONS_RESPONSE,
+    }
+    if feature in fixtures:
+        return _strip_fences(fixtures[feature])
+    return MOCK_COVER_LETTER_RESPONSE
+
+
+def get_feature(body: dict) -> str:
+    response_format = body.get("response_format") or {}
+    schema_name = (response_format.get("json_schema") or {}).get("name")
+    return SCHEMA_FEATURES.get(schema_name, FEATURE_COVER_LETTER)
+
+
+def sample_latency(feature: str) -> float:
+    """Seconds until the first token, drawn from the feature's (or the default) spec."""
+    specs = settings.OPENAI_STUB_LATENCY
+    spec = specs.get(feature) or specs.get("default") or {}
+    distribution = spec.get("distribution", "fixed")
+    if distribution == "lognormal":
+        return random.lognormvariate(0, spec.get("sigma", 0.5)) * spec["median_seconds"]
+    if distribution == "uniform":
+        return random.uniform(spec["min_seconds"], spec["max_seconds"])
+    return spec.get("seconds", 0.0)
+
+
+def build_usage(messages: list[dict], content: str) -> dict:
+    prompt_tokens = sum(count_tokens(message.get("content") or "") for message in messages)
+    completion_tokens = count_tokens(content)
+
+    # Like the provider, a repeated system prefix is (partly) served from cache
+    cached_tokens = 0
+    if messages and messages[0].get("role") == "system":
+        prefix = messages[0].get("content") or ""
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        prefix_tokens = count_tokens(prefix)
+        if digest in _seen_prefixes and prefix_tokens >= CACHE_MIN_PREFIX_TOKENS:
+            cached_tokens = prefix_tokens // CACHE_BLOCK_TOKENS * CACHE_BLOCK_TOKENS
+        _seen_prefixes.add(digest)
+
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": cached_tokens},
+    }
+
+
+def injected_error() -> JSONResponse | None:
+    roll = random.random()
+    if roll < settings.OPENAI_STUB_RATE_LIMIT_RATE:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after": str(settings.OPENAI_STUB_RETRY_AFTER_SECONDS)},
+            content={
+                "error": {
+                    "message": "Rate limit reached (injected by stub)",
+                    "type": "requests",
+                    "param": None,
+                    "code": "rate_limit_exceeded",
+                }
+            },
+        )
+    if roll < settings.OPENAI_STUB_RATE_LIMIT_RATE + settings.OPENAI_STUB_SERVER_ERROR_RATE:
+        return JSONResponse(
+            status_code=random.choice((500, 502, 503)),
+            content={
+                "error": {
+                    "message": "The server had an error (injected by stub)",
+                    "type": "server_error",
+                    "param": None,
+                    "code": None,
+                }
+            },
+        )
+    return None
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None, usage=None) -> str:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": (
+            [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            if usage is None
+            else []
+        ),
+        "usage": usage,
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def stream_completion(
+    completion_id: str, model: str, content: str, usage: dict, include_usage: bool
+):
+    chunk_tokens = count_tokens(content[:STREAM_CHUNK_CHARS])
+    seconds_per_chunk = chunk_tokens / settings.OPENAI_STUB_TOKENS_PER_SECOND
+    yield _chunk(completion_id, model, {"role": "assistant", "content": ""})
+    for start in range(0, len(content), STREAM_CHUNK_CHARS):
+        await asyncio.sleep(seconds_per_chunk)
+        yield _chunk(
+            completion_id, model, {"content": content[start : start + STREAM_CHUNK_CHARS]}
+        )
+    yield _chunk(completion_id, model, {}, finish_reason="stop")
+    if include_usage:
+        yield _chunk(completion_id, model, {}, usage=usage)
+    yield "data: [DONE]\n\n"
+
+
+@app.get("/v1/models")
+async def list_models():
+    models = {settings.OPENAI_MODEL, settings.OPENAI_FALLBACK_MODEL}
+    return {
+        "object": "list",
+        "data": [{"id": model, "object": "model", "owned_by": "stub"} for model in sorted(models)],
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    model = body.get("model", settings.OPENAI_MODEL)
+    messages = body.get("messages") or []
+    feature = get_feature(body)
+
+    latency = sample_latency(feature)
+    await asyncio.sleep(latency)
+    error = injected_error()
+    if error is not None:
+        logger.info(f"[OPENAI_STUB] {feature} -> {error.status_code} after {latency:.2f}s")
+        return error
+
+    content = get_fixture(feature, messages)
+    usage = build_usage(messages, content)
+    completion_id = f"chatcmpl-stub-{uuid.uuid4().hex}"
+    logger.info(
+        f"[OPENAI_STUB] {feature} model={model} ttft={latency:.2f}s stream={bool(body.get('stream'))} "
+        f"prompt_tokens={usage['prompt_tokens']} cached_tokens={usage['prompt_tokens_details']['cached_tokens']}"
+    )
+
+    if body.get("stream"):
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        return StreamingResponse(
+            stream_completion(completion_id, model, content, usage, include_usage),
+            media_type="text/event-stream",
+        )
+
+    # Non-streaming responses arrive once the whole completion is generated
+    await asyncio.sleep(usage["completion_tokens"] / settings.OPENAI_STUB_TOKENS_PER_SECOND)
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content, "refusal": None},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }
+        ],
+        "usage": usage,
+    }
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=settings.OPENAI_STUB_PORT)
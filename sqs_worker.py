@@ -5,9 +5,15 @@ import boto3
 import json
 
 from app.core.logging import setup_logging
-from app.services.mock_interview_service import process_mock_interview_worker
+from app.services.mock_interview_service import (
+    complete_batched_interview_evaluation,
+    process_mock_interview_worker,
+)
 from app.database.connection import SessionLocal  # or your actual db init
 from app.core.config import settings
+from app.utils.io_executor import storage_executor
+from app.utils.llm_batch import get_interview_eval_batch
+from app.utils.openai_client import init_openai_client, close_openai_client
 
 setup_logging()
 
@@ -23,12 +29,27 @@ sqs = boto3.client(
 queue_logger = logging.getLogger("sqs")  # This logger writes to logs/sqs.log
 
 
-def poll_sqs():
+async def poll_sqs():
     queue_logger.info("🔁 Worker started. Polling SQS for messages...")
+    # One event loop for the worker's lifetime so the pooled OpenAI client is reused
+    await init_openai_client()
+
+    try:
+        if settings.INTERVIEW_EVAL_BATCH_MODE:
+            queue_logger.info("📦 Batch evaluation mode enabled.")
+            await asyncio.gather(poll_sqs_forever(), poll_evaluation_batches_forever())
+        else:
+            await poll_sqs_forever()
+    finally:
+        await close_openai_client()
+        storage_executor.shutdown()
+
 
+async def poll_sqs_forever():
     while True:
         try:
-            response = sqs.receive_message(
+            response = await storage_executor.run(
+                sqs.receive_message,
                 QueueUrl=settings.SQS_MOCK_INTERVIEW_QUEUE_URL,
                 MaxNumberOfMessages=1,
                 WaitTimeSeconds=10,
@@ -48,17 +69,16 @@ def poll_sqs():
                     db = SessionLocal()
 
                     queue_logger.info("⚙️ Starting mock interview processing...")
-                    asyncio.run(
-                        process_mock_interview_worker(
-                            db=db,
-                            user_id=body["user_id"],
-                            session_id=body["session_id"],
-                        )
+                    await process_mock_interview_worker(
+                        db=db,
+                        user_id=body["user_id"],
+                        session_id=body["session_id"],
                     )
                     queue_logger.info("✅ Finished processing mock interview.")
 
                     # Delete message from SQS
-                    sqs.delete_message(
+                    await storage_executor.run(
+                        sqs.delete_message,
                         QueueUrl=settings.SQS_MOCK_INTERVIEW_QUEUE_URL,
                         ReceiptHandle=message["ReceiptHandle"],
                     )
@@ -71,5 +91,27 @@ def poll_sqs():
             queue_logger.exception(f"🔥 Worker polling loop failed: {e}")
 
 
+async def handle_batch_result(result):
+    db = SessionLocal()
+    try:
+        await complete_batched_interview_evaluation(db, result)
+    finally:
+        db.close()
+
+
+async def poll_evaluation_batches_forever():
+    """Submits queued interview evaluations as batch jobs and completes finished ones."""
+    batch_queue = get_interview_eval_batch()
+    while True:
+        try:
+            await batch_queue.flush()
+            handled = await batch_queue.poll(handle_batch_result)
+            if handled:
+                queue_logger.info(f"✅ Completed {handled} batched evaluations.")
+        except Exception as e:
+            queue_logger.exception(f"🔥 Batch polling loop failed: {e}")
+        await asyncio.sleep(settings.LLM_BATCH_POLL_SECONDS)
+
+
 if __name__ == "__main__":
-    poll_sqs()
+    asyncio.run(poll_sqs())
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jwt.algorithms import RSAAlgorithm
+
+from app.utils.google_jwks import GoogleJWKSVerifier
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+ISSUER = "https://accounts.google.com"
+
+
+def generate_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def to_jwk(private_key, kid):
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    jwk.update(kid=kid, alg="RS256", use="sig")
+    return jwk
+
+
+def sign(private_key, kid, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": ISSUER,
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "user@example.com",
+        "iat": now,
+        "exp": now + 300,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    return generate_key()
+
+
+@pytest.fixture
+def verifier(signing_key):
+    # The URL is never fetched: keys are seeded and considered fresh
+    verifier = GoogleJWKSVerifier(
+        jwks_url="http://jwks.invalid/certs", audiences=[CLIENT_ID], issuers=[ISSUER]
+    )
+    verifier.load_jwks({"keys": [to_jwk(signing_key, "key-1")]})
+    return verifier
+
+
+def verify(verifier, token):
+    return asyncio.run(verifier.verify(token))
+
+
+def test_valid_token_returns_claims(verifier, signing_key):
+    claims = verify(verifier, sign(signing_key, "key-1"))
+
+    assert claims["email"] == "user@example.com"
+    assert claims["aud"] == CLIENT_ID
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "someone-else"},
+        {"iss": "https://evil.example.com"},
+        {"exp": int(time.time()) - 60},
+    ],
+    ids=["audience", "issuer", "expired"],
+)
+def test_rejects_bad_claims(verifier, signing_key, overrides):
+    with pytest.raises(HTTPException) as error:
+        verify(verifier, sign(signing_key, "key-1", **overrides))
+    assert error.value.status_code == 403
+
+
+def test_rejects_signature_from_another_key(verifier):
+    with pytest.raises(HTTPException) as error:
+        verify(verifier, sign(generate_key(), "key-1"))
+    assert error.value.status_code == 403
+
+
+def test_unknown_kid_is_rejected_without_refetching(verifier, signing_key):
+    # A forced refresh right after loading is throttled, so no request is made
+    with pytest.raises(HTTPException) as error:
+        verify(verifier, sign(signing_key, "key-2"))
+    assert error.value.status_code == 403
+
+
+def test_malformed_token_is_rejected(verifier):
+    with pytest.raises(HTTPException) as error:
+        verify(verifier, "not-a-jwt")
+    assert error.value.status_code == 403
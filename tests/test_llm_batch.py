@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import llm_batch
+from app.utils.llm_batch import LLMBatchQueue, LocalBatchBackend
+
+
+class EchoCompletion:
+    def __init__(self, content):
+        self.content = content
+
+    def model_dump(self):
+        return {"choices": [{"message": {"role": "assistant", "content": self.content}}]}
+
+
+async def echo_create(**body):
+    content = body["messages"][-1]["content"]
+    if content == "fail":
+        raise RuntimeError("upstream error")
+    return EchoCompletion(f"echo: {content}")
+
+
+@pytest.fixture(autouse=True)
+def echo_client(monkeypatch):
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=echo_create)))
+    monkeypatch.setattr(llm_batch, "get_async_openai_client", lambda: client)
+
+
+def make_queue(directory, delay_seconds=0):
+    return LLMBatchQueue(
+        LocalBatchBackend(str(directory / "local"), delay_seconds),
+        str(directory / "state.json"),
+        max_requests=10,
+        flush_seconds=3600,
+    )
+
+
+def test_round_trip_through_local_backend(tmp_path):
+    async def main():
+        queue = make_queue(tmp_path)
+        await queue.enqueue("user/session-1", "first", model="test-model")
+        await queue.enqueue("user/session-2", "fail", model="test-model")
+        assert await queue.flush() is None  # neither full nor old enough
+        assert await queue.flush(force=True) is not None
+
+        results = []
+
+        async def handler(result):
+            results.append(result)
+
+        handled = await queue.poll(handler)
+        return handled, results, queue.stats()
+
+    handled, results, stats = asyncio.run(main())
+
+    assert handled == 2
+    by_id = {result.custom_id: result for result in results}
+    assert by_id["user/session-1"].content == "echo: first"
+    assert by_id["user/session-1"].error is None
+    assert by_id["user/session-2"].content is None
+    assert "upstream error" in by_id["user/session-2"].error
+    assert stats == {"pending": 0, "submitted_batches": 0}
+
+
+def test_state_survives_restart(tmp_path):
+    async def enqueue_and_submit():
+        queue = make_queue(tmp_path, delay_seconds=3600)
+        await queue.enqueue("user/session-1", "first", model="test-model")
+        await queue.flush(force=True)
+        await queue.enqueue("user/session-2", "second", model="test-model")
+        return await queue.poll(pytest.fail)
+
+    assert asyncio.run(enqueue_and_submit()) == 0  # batch not due yet
+
+    restarted = make_queue(tmp_path)
+    assert restarted.stats() == {"pending": 1, "submitted_batches": 1}
+
+    async def resume():
+        results = []
+
+        async def handler(result):
+            results.append(result.content)
+
+        await restarted.flush(force=True)
+        await restarted.poll(handler)
+        return results
+
+    assert sorted(asyncio.run(resume())) == ["echo: first", "echo: second"]
+    assert make_queue(tmp_path).stats() == {"pending": 0, "submitted_batches": 0}
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from app.utils.llm_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    LLMAdmissionController,
+)
+
+
+def make_controller(max_concurrency=1):
+    return LLMAdmissionController(
+        max_concurrency=max_concurrency,
+        requests_per_minute=10_000,
+        tokens_per_minute=1_000_000,
+    )
+
+
+def test_waiters_are_served_by_lane_then_arrival():
+    async def main():
+        controller = make_controller()
+        order = []
+
+        async def call(name, priority):
+            async with controller.admit(priority=priority):
+                order.append(name)
+
+        async with controller.admit():
+            waiters = [
+                asyncio.create_task(call("background-1", PRIORITY_BACKGROUND)),
+                asyncio.create_task(call("interactive-1", PRIORITY_INTERACTIVE)),
+                asyncio.create_task(call("background-2", PRIORITY_BACKGROUND)),
+                asyncio.create_task(call("interactive-2", PRIORITY_INTERACTIVE)),
+            ]
+            await asyncio.sleep(0)
+            assert controller.stats()["lanes"]["background"]["queued"] == 2
+            assert controller.stats()["lanes"]["interactive"]["queued"] == 2
+        await asyncio.gather(*waiters)
+        return order, controller
+
+    order, controller = asyncio.run(main())
+
+    assert order == ["interactive-1", "interactive-2", "background-1", "background-2"]
+    assert controller.stats()["in_flight"] == 0
+
+
+def test_timed_out_waiter_leaves_queue_and_frees_nothing():
+    async def main():
+        controller = make_controller()
+
+        async def wait_for_slot():
+            async with controller.admit():
+                pass
+
+        async with controller.admit():
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(wait_for_slot(), timeout=0.05)
+            assert controller.stats()["in_flight"] == 1
+            assert not controller.has_spare_capacity()
+
+        assert controller.has_spare_capacity()
+        await asyncio.wait_for(wait_for_slot(), timeout=0.05)
+        return controller.stats()
+
+    stats = asyncio.run(main())
+
+    assert stats["in_flight"] == 0
+    assert stats["lanes"]["interactive"]["queued"] == 0
+    assert stats["lanes"]["interactive"]["admitted"] == 2
+
+
+def test_token_budget_holds_back_queue_head():
+    async def main():
+        controller = LLMAdmissionController(
+            max_concurrency=4, requests_per_minute=10_000, tokens_per_minute=600
+        )
+        async with controller.admit(estimated_tokens=600):
+            pass
+        # The bucket refills at 10 tokens/s, so 5 tokens take ~0.5s
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                controller.admit(estimated_tokens=5).__aenter__(), timeout=0.05
+            )
+
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.utils.llm_resilience import LLMDeadlineExceeded, run_with_resilience
+
+FEATURE = "test_hedged_feature"
+
+
+@pytest.fixture(autouse=True)
+def hedged_policy(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "LLM_CALL_POLICIES",
+        {FEATURE: {"hedge": True, "hedge_min_delay_seconds": 0.05, "max_retries": 0}},
+    )
+
+
+def make_attempts(*behaviours):
+    """attempt_fn whose n-th call sleeps, then returns or raises behaviours[n]."""
+    calls = iter(behaviours)
+
+    async def attempt():
+        delay, outcome = next(calls)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return attempt
+
+
+def run(attempt_fn, **kwargs):
+    events = {"hedges": 0, "discards": []}
+
+    def on_hedge():
+        events["hedges"] += 1
+
+    async def main():
+        return await run_with_resilience(
+            FEATURE,
+            attempt_fn,
+            on_hedge=on_hedge,
+            on_discard=events["discards"].append,
+            **kwargs,
+        )
+
+    return asyncio.run(main()), events
+
+
+def test_fast_primary_does_not_hedge():
+    result, events = run(make_attempts((0, "primary")))
+
+    assert result == "primary"
+    assert events == {"hedges": 0, "discards": []}
+
+
+def test_hedge_wins_and_slow_primary_is_discarded():
+    result, events = run(make_attempts((1.0, "primary"), (0, "hedge")))
+
+    assert result == "hedge"
+    assert events == {"hedges": 1, "discards": [None]}
+
+
+def test_primary_wins_after_hedge_fired():
+    result, events = run(make_attempts((0.1, "primary"), (1.0, "hedge")))
+
+    assert result == "primary"
+    assert events == {"hedges": 1, "discards": [None]}
+
+
+def test_hedge_skipped_when_not_allowed():
+    result, events = run(make_attempts((0.1, "primary")), can_hedge=lambda: False)
+
+    assert result == "primary"
+    assert events == {"hedges": 0, "discards": []}
+
+
+def test_both_attempts_failing_raises_without_discards():
+    attempts = make_attempts((0.1, ValueError("primary")), (0.1, ValueError("hedge")))
+
+    with pytest.raises(ValueError):
+        run(attempts)
+
+
+def test_deadline_cancel_is_not_counted_as_discard():
+    events = {"hedges": 0, "discards": []}
+
+    def on_hedge():
+        events["hedges"] += 1
+
+    async def main():
+        await run_with_resilience(
+            FEATURE,
+            make_attempts((1.0, "primary"), (1.0, "hedge")),
+            on_hedge=on_hedge,
+            on_discard=events["discards"].append,
+            deadline=time.monotonic() + 0.2,
+        )
+
+    with pytest.raises(LLMDeadlineExceeded):
+        asyncio.run(main())
+    assert events == {"hedges": 1, "discards": []}
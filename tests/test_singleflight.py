@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"user": "u1"}
+
+        results = await asyncio.gather(*(flight.do("token", load) for _ in range(5)))
+        return results, calls, flight
+
+    results, calls, flight = asyncio.run(main())
+
+    assert calls == 1
+    assert results == [{"user": "u1"}] * 5
+    assert flight.shared_calls == 4
+    assert len(flight) == 0
+
+
+def test_error_reaches_every_waiter_and_is_not_cached():
+    async def main():
+        flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ValueError(f"failed call {calls}")
+
+        results = await asyncio.gather(
+            *(flight.do("token", load) for _ in range(3)), return_exceptions=True
+        )
+        with pytest.raises(ValueError, match="failed call 2"):
+            await flight.do("token", load)
+        return results, flight
+
+    results, flight = asyncio.run(main())
+
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert len({id(result) for result in results}) == 1
+    assert len(flight) == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_call():
+    async def main():
+        flight = SingleFlight()
+
+        async def load():
+            await asyncio.sleep(0.05)
+            return "loaded"
+
+        leader = asyncio.create_task(flight.do("token", load))
+        follower = asyncio.create_task(flight.do("token", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower, leader
+
+    result, leader = asyncio.run(main())
+
+    assert result == "loaded"
+    assert leader.cancelled()